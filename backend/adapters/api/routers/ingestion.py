@@ -15,6 +15,12 @@ class IngestRequest(BaseModel):
     mode: str = "default" # default, explorer, consolidator
     space_id: str | None = None # UUID string
 
+class IngestBatchRequest(BaseModel):
+    texts: List[str]
+    source: str | None = None
+    mode: str = "default"
+    space_id: str | None = None
+
 @router.post("/", response_model=Dict[str, Any])
 async def ingest_fragment(
     request: IngestRequest,
@@ -41,8 +47,7 @@ async def ingest_fragment(
         }
     except Exception as e:
         import traceback
-        err_str = str(e)
-        if "duplicate key" in err_str.lower() or "unique constraint" in err_str.lower():
+        if CognitivePipeline.is_duplicate_fragment(e):
              return {
                 "status": "skipped",
                 "decision": "duplicate",
@@ -58,11 +63,46 @@ async def ingest_fragment(
 
 @router.post("/batch", response_model=Dict[str, Any])
 async def ingest_batch(
-    request: IngestRequest, # Reuse model but treat text as potentially containing delimiters? Or different model? 
-    # NOTE: The frontend sends { texts: [], ... } for batch. We need a different model!
+    request: IngestBatchRequest,
     pipeline: CognitivePipeline = Depends(get_pipeline),
     accept_language: str = Header(default="en", alias="Accept-Language")
 ):
-    # This is a placeholder as the original file didn't have batch. 
-    # Assumed implementation based on Frontend call
-    pass 
+    """
+    Ingesta masiva: procesa muchos textos en lotes (embedding por lote, una transacción por lote).
+    Reporta un resultado por cada texto.
+    """
+    lang_code = get_language_from_header(accept_language)
+    
+    # Blank entries stay in: they get a failed result at their own index
+    texts = request.texts
+    if not any(text.strip() for text in texts):
+        from adapters.api.errors import APIError
+        raise APIError(status_code=422, message="Texts cannot be empty", code="TEXT_REQUIRED")
+    
+    try:
+        results = await pipeline.process_batch(texts, request.source, mode=request.mode, space_id=request.space_id, language=lang_code)
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        error_detail = f"{t('ingest_error', lang_code)}: {str(e)}"
+        raise HTTPException(status_code=500, detail=error_detail)
+    
+    return {
+        "status": "processed",
+        "total": len(results),
+        "processed": sum(1 for r in results if r.status == "processed"),
+        "skipped": sum(1 for r in results if r.status == "skipped"),
+        "failed": sum(1 for r in results if r.status == "failed"),
+        "results": [
+            {
+                "index": r.index,
+                "fragment_id": str(r.fragment_id),
+                "status": r.status,
+                "decision": r.decision.action if r.decision else None,
+                "target_idea": str(r.decision.target_idea_id) if r.decision and r.decision.target_idea_id else None,
+                "error": r.error
+            }
+            for r in results
+        ],
+        "message": t("ingest_batch_success", lang_code)
+    }
@@ -0,0 +1,53 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from pydantic import BaseModel, Field
+from typing import Any, Dict
+from uuid import UUID
+from infrastructure.dependencies import get_job_queue
+from ports.job_queue import JobQueuePort
+from domain.models import Job
+from domain.services.job_handlers import JOB_HANDLERS
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+class JobCreateRequest(BaseModel):
+    kind: str  # generate_blueprint, generate_section_draft, draft_product, ingest_batch, backfill_idea_fragments, recount_idea_counters, rebuild_idea_edges
+    payload: Dict[str, Any] = {}
+    max_attempts: int = Field(default=3, ge=1, le=10)
+
+@router.post("/", response_model=Job, status_code=status.HTTP_202_ACCEPTED)
+def enqueue_job(request: JobCreateRequest, queue: JobQueuePort = Depends(get_job_queue)):
+    """
+    Queues long-running LLM work for the worker process (`python -m worker`).
+    The payload is the same body the matching inline endpoint takes, plus
+    product_id and language where the endpoint reads them from the path or headers.
+    """
+    if request.kind not in JOB_HANDLERS:
+        raise HTTPException(status_code=422, detail=f"Unknown job kind '{request.kind}'. Expected one of: {', '.join(JOB_HANDLERS)}")
+    return queue.enqueue(request.kind, request.payload, max_attempts=request.max_attempts)
+
+@router.get("/{job_id}", response_model=Job)
+def get_job(job_id: UUID, queue: JobQueuePort = Depends(get_job_queue)):
+    job = queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.get("/{job_id}/result", response_model=Dict[str, Any])
+def get_job_result(job_id: UUID, queue: JobQueuePort = Depends(get_job_queue)):
+    """The handler's result once the job succeeded; 409 while it is pending, 422 if it failed or was cancelled."""
+    job = queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status in ("queued", "running"):
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    if job.status != "succeeded":
+        raise HTTPException(status_code=422, detail=f"Job {job.status}: {job.error or 'no result'}")
+    return job.result or {}
+
+@router.post("/{job_id}/cancel", response_model=Job)
+def cancel_job(job_id: UUID, queue: JobQueuePort = Depends(get_job_queue)):
+    """Queued jobs are cancelled immediately; running jobs stop at their worker's next heartbeat."""
+    job = queue.cancel(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
@@ -1,10 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Header
+from fastapi.responses import StreamingResponse
 from typing import List, Dict, Any, Optional
+import json
 from uuid import UUID
 from infrastructure.dependencies import get_repository, get_pipeline
 from ports.repository import RepositoryPort
 from domain.services.pipeline import CognitivePipeline
-from domain.models import Product
+from domain.models import Product, DraftJob
+from infrastructure.draft_jobs import get_draft_jobs
 from pydantic import BaseModel
 from i18n import t, get_language_from_header
 import uuid
@@ -94,6 +97,9 @@ async def generate_blueprint(
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Error generating blueprint: {str(e)}")
 
+def sse_event(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
 @router.post("/{product_id}/sections/{section_index}/draft", response_model=Dict[str, Any])
 async def generate_section_draft(
     product_id: UUID,
@@ -101,7 +107,8 @@ async def generate_section_draft(
     request: dict,  # Contains: section_title, source_idea_ids
     pipeline: CognitivePipeline = Depends(get_pipeline),
     repo: RepositoryPort = Depends(get_repository),
-    accept_language: str = Header(default="en", alias="Accept-Language")
+    accept_language: str = Header(default="en", alias="Accept-Language"),
+    accept: str = Header(default="application/json")
 ):
     """
     Generate a draft for a specific section of the product blueprint.
@@ -109,8 +116,15 @@ async def generate_section_draft(
     Request body:
     {
         "section_title": "Introduction to X",
-        "source_idea_ids": ["uuid1", "uuid2"]
+        "source_idea_ids": ["uuid1", "uuid2"],
+        "section_id": "uuid",   # optional: save the final draft to this section
+        "stream": true          # optional: same as Accept: text/event-stream
     }
+
+    When streaming, the response is Server-Sent Events: "token" events with
+    {"text": chunk} as the draft is generated, then a "done" event carrying the
+    same payload as the JSON response (including the full content), or an
+    "error" event with {"message": ...}.
     """
     lang = get_language_from_header(accept_language)
     product = repo.get_product(product_id)
@@ -119,11 +133,52 @@ async def generate_section_draft(
     
     section_title = request.get("section_title", f"Section {section_index}")
     source_idea_ids = request.get("source_idea_ids", [])
+    section_id = request.get("section_id")
     
     if not source_idea_ids:
         raise HTTPException(status_code=400, detail="source_idea_ids is required")
+
+    def save_draft(content: str):
+        if section_id:
+            repo.update_section_content(UUID(section_id), content, 0)
+
+    def draft_payload(content: str) -> Dict[str, Any]:
+        return {
+            "status": "draft_generated",
+            "section_title": section_title,
+            "content": content,
+            "language": lang
+        }
     
     try:
+        if request.get("stream") or "text/event-stream" in accept:
+            # Loading the sources before the stream starts keeps their errors plain HTTP errors
+            prompt = await pipeline.build_section_draft_prompt(
+                section_title=section_title,
+                source_idea_ids=source_idea_ids,
+                product=product,
+                language=lang
+            )
+
+            async def events():
+                chunks = []
+                try:
+                    async for chunk in pipeline.stream_section_draft(prompt, language=lang):
+                        chunks.append(chunk)
+                        yield sse_event("token", {"text": chunk})
+                    draft_content = "".join(chunks).strip()
+                    save_draft(draft_content)
+                    yield sse_event("done", draft_payload(draft_content))
+                except Exception as e:
+                    print(f"Draft streaming error: {e}")
+                    yield sse_event("error", {"message": f"Error generating draft: {str(e)}"})
+
+            return StreamingResponse(
+                events(),
+                media_type="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+            )
+
         # Generate draft using pipeline
         draft_content = await pipeline.generate_section_draft(
             section_title=section_title,
@@ -131,19 +186,52 @@ async def generate_section_draft(
             product=product,
             language=lang
         )
+        save_draft(draft_content)
         
-        return {
-            "status": "draft_generated",
-            "section_title": section_title,
-            "content": draft_content,
-            "language": lang
-        }
+        return draft_payload(draft_content)
     except Exception as e:
         print(f"Draft generation error: {e}")
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Error generating draft: {str(e)}")
 
+class DraftAllRequest(BaseModel):
+    sources: Dict[UUID, List[UUID]] = {}  # section_id -> source idea ids
+    overwrite: bool = False
+    concurrency: Optional[int] = None
+
+@router.post("/{product_id}/draft-all", response_model=DraftJob, status_code=status.HTTP_202_ACCEPTED)
+async def draft_all_sections(
+    product_id: UUID,
+    request: DraftAllRequest = DraftAllRequest(),
+    repo: RepositoryPort = Depends(get_repository),
+    accept_language: str = Header(default="en", alias="Accept-Language")
+):
+    """
+    Starts a background job that drafts every leaf section of the product and saves
+    each draft to its section. Sections that already have content are skipped unless
+    overwrite is set. Sections missing from sources draw on the ideas closest to their
+    title. Poll GET /products/{product_id}/draft-all/{job_id} for progress.
+    """
+    lang = get_language_from_header(accept_language)
+    product = repo.get_product(product_id)
+    if not product:
+        raise HTTPException(status_code=404, detail=t("product_not_found", lang))
+    return get_draft_jobs().start(
+        product,
+        sources=request.sources,
+        overwrite=request.overwrite,
+        language=lang,
+        concurrency=request.concurrency
+    )
+
+@router.get("/{product_id}/draft-all/{job_id}", response_model=DraftJob)
+def get_draft_all_job(product_id: UUID, job_id: UUID):
+    job = get_draft_jobs().get(job_id)
+    if not job or job.product_id != product_id:
+        raise HTTPException(status_code=404, detail="Draft job not found")
+    return job
+
 @router.get("/{product_id}/export")
 def export_product(
     product_id: UUID,
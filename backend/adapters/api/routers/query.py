@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, Header
+import math
+from fastapi import APIRouter, Depends, HTTPException, Header, Query
 from typing import List, Dict, Any, Optional
 from uuid import UUID
 from datetime import datetime
 
 from infrastructure.dependencies import get_repository, get_ai_provider
+from adapters.postgres_repository import IDEA_EDGES_K
 from ports.repository import RepositoryPort
 from domain.models import Idea, IdeaVersion, Fragment
 from i18n import t, get_language_from_header
@@ -53,12 +55,11 @@ async def get_idea_detail(
         lang = get_language_from_header(accept_language)
         raise HTTPException(status_code=404, detail=t("product_not_found", lang).replace("Producto", "Idea").replace("Product", "Idea"))
     
-    # Get related data for maturity calculation
-    fragments = await repo.list_fragments_by_idea(idea_id)
-    versions = await repo.list_idea_versions(idea_id)
+    # Counts come from the idea's counters; only the fragments shown are loaded
+    fragments = await repo.list_fragments_by_idea(idea_id, limit=10)
     
     # Calculate maturity
-    maturity_score = MaturityCalculator.calculate(idea, fragments, len(versions))
+    maturity_score = MaturityCalculator.calculate(idea)
     maturity_status = MaturityCalculator.get_status_label(maturity_score)
     maturity_emoji = MaturityCalculator.get_emoji(maturity_score)
     ready_for_product = MaturityCalculator.is_ready_for_product(maturity_score)
@@ -75,11 +76,11 @@ async def get_idea_detail(
             "ready_for_product": ready_for_product
         },
         "metrics": {
-            "fragment_count": len(fragments),
-            "version_count": len(versions),
+            "fragment_count": idea.fragment_count,
+            "version_count": idea.version_count,
             "age_days": (datetime.utcnow() - idea.created_at).days if hasattr(idea, 'created_at') else 0
         },
-        "fragments": [f.dict() if hasattr(f, 'dict') else f.__dict__ for f in fragments[:10]]  # Limit to 10 for performance
+        "fragments": [f.dict() if hasattr(f, 'dict') else f.__dict__ for f in fragments]
     }
 
 @router.get("/idea/{idea_id}/history", response_model=List[IdeaVersion])
@@ -114,11 +115,60 @@ async def get_idea_fragments(
 @router.get("/knowledge-graph", response_model=Dict[str, Any])
 async def get_knowledge_graph(
     space_id: UUID = None,
+    mode: str = "knn",
+    k: int = Query(5, ge=1, le=IDEA_EDGES_K),
+    min_similarity: float = Query(0.3, ge=-1.0, le=1.0),
+    limit: int = Query(500, ge=1, le=2000),
+    offset: int = Query(0, ge=0),
     repo: RepositoryPort = Depends(get_repository)
 ):
     """
     Knowledge Graph view with nodes and edges.
+    
+    mode=knn (default) pages through nodes (limit/offset) and serves each idea's k nearest
+    neighbours from the materialized idea_edges table (1 <= k <= IDEA_EDGES_K = 10); edges may point to nodes of other pages.
+    mode=threshold / mode=top_k compute all edges in-process with the NumPy engine (not paged).
     """
+    if mode not in ("knn", "threshold", "top_k"):
+        raise HTTPException(status_code=400, detail="Invalid mode. Use 'knn', 'threshold' or 'top_k'.")
+    
+    if mode == "knn":
+        page = await repo.list_graph_nodes(space_id=space_id, limit=limit, offset=offset)
+        nodes = [
+            {
+                "id": str(node.id),
+                "label": node.title_provisional,
+                "status": node.status,
+                "weight": node.fragment_count,
+                "domain": node.domain
+            }
+            for node in page
+        ]
+        
+        edges = []
+        seen = set()
+        for source, target, sim in await repo.list_graph_edges([node.id for node in page], k=k, min_similarity=min_similarity):
+            pair = (source, target) if str(source) < str(target) else (target, source)
+            if pair in seen:
+                continue
+            seen.add(pair)
+            edges.append({"source": str(source), "target": str(target), "similarity": round(sim, 3)})
+        
+        return {
+            "nodes": nodes,
+            "edges": edges,
+            "metadata": {
+                "total_nodes": len(nodes),
+                "total_edges": len(edges),
+                "space_id": str(space_id) if space_id else None,
+                "mode": mode,
+                "offset": offset,
+                "next_offset": offset + limit if len(page) == limit else None
+            }
+        }
+    
+    from domain.services.similarity_engine import SimilarityEngine
+    
     ideas = await repo.list_ideas(space_id=space_id)
     
     nodes = []
@@ -127,43 +177,25 @@ async def get_knowledge_graph(
             "id": str(idea.id),
             "label": idea.title_provisional,
             "status": idea.status,
-            "weight": idea.semantic_profile.fragment_count if idea.semantic_profile else 0,
+            "weight": idea.fragment_count,
             "domain": idea.domain
         }
         nodes.append(node)
     
-    edges = []
-    similarity_threshold = 0.3
+    similarity = SimilarityEngine(
+        ids=[str(idea.id) for idea in ideas],
+        vectors=[idea.semantic_profile.centroid if idea.semantic_profile else None for idea in ideas]
+    )
     
-    for i, idea1 in enumerate(ideas):
-        if not idea1.semantic_profile or not idea1.semantic_profile.centroid:
-            continue
-            
-        for j, idea2 in enumerate(ideas):
-            if i >= j:
-                continue
-                
-            if not idea2.semantic_profile or not idea2.semantic_profile.centroid:
-                continue
-            
-            vec1 = idea1.semantic_profile.centroid
-            vec2 = idea2.semantic_profile.centroid
-            
-            import math
-            dot_product = sum(a * b for a, b in zip(vec1, vec2))
-            magnitude1 = math.sqrt(sum(a * a for a in vec1))
-            magnitude2 = math.sqrt(sum(a * a for a in vec2))
-            
-            if magnitude1 > 0 and magnitude2 > 0:
-                similarity = dot_product / (magnitude1 * magnitude2)
-                
-                if similarity >= similarity_threshold:
-                    edge = {
-                        "source": str(idea1.id),
-                        "target": str(idea2.id),
-                        "similarity": round(similarity, 3)
-                    }
-                    edges.append(edge)
+    if mode == "top_k":
+        edge_iter = similarity.iter_top_k_edges(k, min_similarity=min_similarity)
+    else:
+        edge_iter = similarity.iter_threshold_edges(min_similarity)
+    
+    edges = [
+        {"source": source, "target": target, "similarity": round(sim, 3)}
+        for source, target, sim in edge_iter
+    ]
     
     return {
         "nodes": nodes,
@@ -171,7 +203,8 @@ async def get_knowledge_graph(
         "metadata": {
             "total_nodes": len(nodes),
             "total_edges": len(edges),
-            "space_id": str(space_id) if space_id else None
+            "space_id": str(space_id) if space_id else None,
+            "mode": mode
         }
     }
 
@@ -184,6 +217,8 @@ async def search_knowledge(
 ):
     """
     Semantic Search: Finds ideas and fragments semantically similar to the query.
+    Fragments use hybrid retrieval (full-text + vector, fused by rank); the optional
+    lexical_weight / semantic_weight (default 1.0) tune each side.
     """
     lang = get_language_from_header(accept_language)
     query_text = payload.get("query")
@@ -194,6 +229,16 @@ async def search_knowledge(
     limit = payload.get("limit", 5)
     search_type = payload.get("type", "all")
     
+    # RRF weights: a negative one would invert that side's ranking
+    weights = {}
+    for name in ("lexical_weight", "semantic_weight"):
+        try:
+            weights[name] = float(payload.get(name, 1.0))
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail=f"{name} must be a number >= 0")
+        if not (math.isfinite(weights[name]) and weights[name] >= 0):
+            raise HTTPException(status_code=400, detail=f"{name} must be a number >= 0")
+    
     try:
         # 1. Generate Embedding
         vector = await ai_provider.generate_embedding(query_text)
@@ -226,32 +271,36 @@ async def search_knowledge(
         
         if search_type in ["all", "fragments"]:
             fragment_limit = limit if search_type == "fragments" else max(2, limit // 2)
-            fragments = await repo.list_fragments(limit=fragment_limit * 2)
+            hits = await repo.hybrid_search(
+                query_text,
+                vector,
+                limit=fragment_limit,
+                space_id=UUID(space_id) if space_id else None,
+                lexical_weight=weights["lexical_weight"],
+                semantic_weight=weights["semantic_weight"]
+            )
             
-            fragment_results = []
-            for fragment in fragments:
-                if space_id and str(fragment.space_id) != space_id:
-                    continue
-                
-                score = 0.5 
-                
+            # Hits arrive in fused (RRF) order
+            for hit in hits:
+                fragment = hit.fragment
                 snippet = fragment.raw_text if fragment.raw_text else "Sin contenido"
                 if len(snippet) > 150:
                     snippet = snippet[:147] + "..."
                 
-                fragment_results.append({
+                results.append({
                     "type": "fragment",
                     "id": str(fragment.id),
                     "title": f"Fragment de {fragment.source or 'fuente desconocida'}",
-                    "similarity": score,
+                    "similarity": round(hit.similarity, 4),
+                    "score": round(hit.score, 6),
+                    "lexical_rank": hit.lexical_rank,
+                    "semantic_rank": hit.semantic_rank,
                     "snippet": snippet,
                     "source": fragment.source
                 })
-            
-            fragment_results.sort(key=lambda x: x["similarity"], reverse=True)
-            results.extend(fragment_results[:fragment_limit])
         
-        results.sort(key=lambda x: x["similarity"], reverse=True)
+        if search_type == "all":
+            results.sort(key=lambda x: x["similarity"], reverse=True)
         results = results[:limit]
         
         if not results:
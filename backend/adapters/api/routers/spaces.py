@@ -107,18 +107,16 @@ async def get_space_analytics(
     if not space:
         raise HTTPException(status_code=404, detail=t("space_not_found", lang))
     
-    # Get all ideas in space
-    ideas = await repo.list_ideas(space_id=space_id)
-    fragments = await repo.list_fragments(space_id=space_id)
+    # One grouped query for every idea's counts, one count for fragments
+    stats = await repo.list_idea_maturity_stats(space_id=space_id)
+    total_fragments = await repo.count_fragments(space_id=space_id)
+    scores = MaturityCalculator.calculate_bulk(stats)
     
     # Calculate maturity distribution
     maturity_distribution = {"germinal": 0, "growing": 0, "mature": 0}
     idea_details = []
     
-    for idea in ideas:
-        idea_fragments = await repo.list_fragments_by_idea(idea.id)
-        versions = await repo.list_idea_versions(idea.id)
-        score = MaturityCalculator.calculate(idea, idea_fragments, len(versions))
+    for idea, score in zip(stats, scores):
         status = MaturityCalculator.get_status_label(score)
         
         maturity_distribution[status] += 1
@@ -127,7 +125,7 @@ async def get_space_analytics(
             "title": idea.title_provisional,
             "maturity_score": score,
             "maturity_status": status,
-            "fragment_count": len(idea_fragments)
+            "fragment_count": idea.fragment_count
         })
     
     # Sort ideas by maturity score descending
@@ -136,8 +134,8 @@ async def get_space_analytics(
     return {
         "space_id": str(space_id),
         "space_name": space.name,
-        "total_fragments": len(fragments),
-        "total_ideas": len(ideas),
+        "total_fragments": total_fragments,
+        "total_ideas": len(stats),
         "maturity_distribution": maturity_distribution,
         "top_ideas": idea_details[:10],  # Top 10 most mature ideas
         "ready_for_product": sum(1 for i in idea_details if i["maturity_score"] >= 60)
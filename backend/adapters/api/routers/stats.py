@@ -3,6 +3,9 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func
 from infrastructure.database import get_db
 from adapters.orm import FragmentModel, SpaceModel, ProductModel, IdeaModel, DecisionLogModel
+from adapters.llm.embedding_cache import get_embedding_cache
+from adapters.llm.single_flight import get_single_flight
+from adapters.buffered_ledger import get_decision_log_buffer
 
 router = APIRouter(
     prefix="/stats",
@@ -73,3 +76,25 @@ async def get_system_counts(db: Session = Depends(get_db)):
         "fragments": db.query(FragmentModel).count(),
         "decisions_logged": db.query(DecisionLogModel).count()
     }
+
+@router.get("/embedding-cache")
+async def get_embedding_cache_stats():
+    """
+    Hit/miss and eviction counters of this worker's embedding cache.
+    """
+    return get_embedding_cache().stats()
+
+@router.get("/decision-ledger")
+async def get_decision_ledger_stats():
+    """
+    Queue depth and flush counters of this worker's decision ledger buffer
+    (DECISION_LEDGER_MODE=buffered/strict).
+    """
+    return get_decision_log_buffer().stats()
+
+@router.get("/single-flight")
+async def get_single_flight_stats():
+    """
+    How many embedding/synthesis calls were coalesced into an identical in-flight call.
+    """
+    return get_single_flight().stats()
@@ -0,0 +1,51 @@
+from uuid import UUID
+from typing import List
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from domain.events import DecisionResult
+from ports.decision_ledger import DecisionLedgerPort
+from infrastructure.database import async_commit_or_flush
+from adapters.orm import DecisionLogModel
+from adapters.postgres_ledger import decision_log_values
+
+class AsyncPostgresDecisionLedger(DecisionLedgerPort):
+    """DecisionLedgerPort on an AsyncSession (DB_DRIVER=async)."""
+    def __init__(self, async_db: AsyncSession):
+        self.db = async_db
+
+    async def record_decision(self, fragment, decision: DecisionResult):
+        self.db.add(DecisionLogModel(**decision_log_values(fragment, decision)))
+        await async_commit_or_flush(self.db)
+
+    async def get_decision_history(self, fragment_id: UUID) -> List[dict]:
+        stmt = select(DecisionLogModel).where(DecisionLogModel.fragment_id == fragment_id)
+        logs = (await self.db.execute(stmt)).scalars().all()
+
+        return [
+            {
+                "timestamp": log.timestamp.isoformat(),
+                "action": log.action,
+                "target_idea_id": str(log.target_idea_id) if log.target_idea_id else None,
+                "confidence": log.confidence,
+                "reasoning": log.reasoning,
+                "meta": log.meta_data
+            }
+            for log in logs
+        ]
+
+    async def get_recent_logs(self, limit: int = 50) -> List[dict]:
+        stmt = select(DecisionLogModel).order_by(DecisionLogModel.timestamp.desc()).limit(limit)
+        logs = (await self.db.execute(stmt)).scalars().all()
+
+        return [
+            {
+                "id": str(log.id),
+                "timestamp": log.timestamp.isoformat(),
+                "fragment_id": str(log.fragment_id) if log.fragment_id else None,
+                "action": log.action,
+                "target": str(log.target_idea_id) if log.target_idea_id else None,
+                "reasoning": log.reasoning,
+                "confidence": log.confidence
+            }
+            for log in logs
+        ]
@@ -0,0 +1,299 @@
+from typing import List, Optional, Tuple, Any, AsyncIterator
+from uuid import UUID
+from contextlib import asynccontextmanager
+from datetime import datetime
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update
+from domain.models import Fragment, Idea, IdeaVersion, IdeaGraphNode, IdeaMaturityStats, IdeaSourceContent, RetrievalHit
+from infrastructure.database import async_commit_or_flush, async_unit_of_work
+from adapters.postgres_repository import (
+    PostgresRepository, IDEA_EDGES_K, idea_from_model, idea_profile_values,
+    graph_nodes_stmt, graph_edges_stmt, stored_graph_edges_stmt, idea_edges_exist_stmt,
+    refresh_idea_edges_stmts, idea_edge_neighbours_stmt, search_fragments_stmt, hnsw_ef_search_stmt,
+    search_knowledge_stmt, hybrid_search_stmt, hybrid_pool, retrieval_hit, idea_maturity_stats_stmt, count_fragments_stmt,
+    idea_sources_stmt, idea_sources_in_order, link_fragment_stmt, fragments_by_idea_stmt, backfill_idea_fragments_stmt,
+    save_idea_version_stmt, append_idea_version_stmt, latest_version_stmt, set_fragments_deleted_stmt, changed_fragment_ids, shift_fragment_counts_stmt,
+    recount_idea_counters_stmt, lock_idea_stmt, idea_profile_update_stmt
+)
+from adapters.orm import FragmentModel, IdeaModel, IdeaVersionModel
+
+class AsyncPostgresRepository(PostgresRepository):
+    """
+    Repository for DB_DRIVER=async.
+    Every coroutine of the port runs on an AsyncSession (asyncpg), so awaiting a slow
+    vector query yields the event loop instead of blocking the worker.
+    The synchronous space/product CRUD is inherited and keeps using the sync Session;
+    FastAPI already runs those routes in its threadpool.
+    """
+    def __init__(self, db: Session, async_db: AsyncSession):
+        super().__init__(db)
+        self.async_db = async_db
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[None]:
+        async with async_unit_of_work(self.async_db):
+            yield
+
+    async def save_fragment(self, fragment: Fragment) -> Fragment:
+        db_fragment = FragmentModel(
+            id=fragment.id,
+            raw_text=fragment.raw_text,
+            source=fragment.source,
+            created_at=fragment.created_at,
+            embedding=fragment.embedding,
+            space_id=fragment.space_id
+        )
+        self.async_db.add(db_fragment)
+        await async_commit_or_flush(self.async_db)
+        return fragment
+
+    async def search_knowledge(self, query: str, space_id: UUID = None, limit: int = 10) -> List[Any]:
+        results = (await self.async_db.execute(search_knowledge_stmt(query, space_id, limit))).scalars().all()
+        return [Fragment.model_validate(r) for r in results]
+
+    async def get_fragment(self, fragment_id: UUID) -> Optional[Fragment]:
+        stmt = select(FragmentModel).where(FragmentModel.id == fragment_id, FragmentModel.is_deleted == False)
+        result = (await self.async_db.execute(stmt)).scalar_one_or_none()
+        if result:
+            return Fragment.model_validate(result)
+        return None
+
+    async def list_fragments(self, limit: int = 50, offset: int = 0, space_id: Optional[UUID] = None) -> List[Fragment]:
+        stmt = select(FragmentModel).where(FragmentModel.is_deleted == False)
+        if space_id:
+            stmt = stmt.where(FragmentModel.space_id == space_id)
+        stmt = stmt.order_by(FragmentModel.created_at.desc()).limit(limit).offset(offset)
+        results = (await self.async_db.execute(stmt)).scalars().all()
+        return [Fragment.model_validate(r) for r in results]
+
+    async def count_fragments(self, space_id: Optional[UUID] = None) -> int:
+        return (await self.async_db.execute(count_fragments_stmt(space_id))).scalar_one()
+
+    async def list_idea_maturity_stats(self, space_id: Optional[UUID] = None, min_score: Optional[int] = None) -> List[IdeaMaturityStats]:
+        rows = (await self.async_db.execute(idea_maturity_stats_stmt(space_id, min_score))).all()
+        return [IdeaMaturityStats.model_validate(row._mapping) for row in rows]
+
+    async def list_idea_sources(self, idea_ids: List[UUID]) -> List[IdeaSourceContent]:
+        if not idea_ids:
+            return []
+        rows = (await self.async_db.execute(idea_sources_stmt(idea_ids))).all()
+        return idea_sources_in_order(idea_ids, rows)
+
+    async def list_fragments_by_idea(self, idea_id: UUID, limit: Optional[int] = None) -> List[Fragment]:
+        results = (await self.async_db.execute(fragments_by_idea_stmt(idea_id, limit))).scalars().all()
+        return [Fragment.model_validate(r) for r in results]
+
+    async def link_fragment(self, idea_id: UUID, fragment_id: UUID) -> None:
+        await self.async_db.execute(link_fragment_stmt(idea_id, fragment_id))
+        await async_commit_or_flush(self.async_db)
+
+    async def backfill_idea_fragments(self) -> int:
+        result = await self.async_db.execute(backfill_idea_fragments_stmt())
+        await async_commit_or_flush(self.async_db)
+        return result.rowcount
+
+    async def recount_idea_counters(self) -> int:
+        result = await self.async_db.execute(recount_idea_counters_stmt())
+        await async_commit_or_flush(self.async_db)
+        return result.rowcount
+
+    async def save_idea(self, idea: Idea) -> Idea:
+        stmt = select(IdeaModel).where(IdeaModel.id == idea.id)
+        existing = (await self.async_db.execute(stmt)).scalar_one_or_none()
+
+        profile = idea_profile_values(idea)
+
+        if existing:
+            existing.title_provisional = idea.title_provisional
+            existing.domain = idea.domain
+            existing.status = idea.status
+            existing.updated_at = idea.updated_at
+            existing.semantic_profile = profile["semantic_profile"]
+            existing.embedding = profile["embedding"]
+
+            await async_commit_or_flush(self.async_db)
+            await self.async_db.refresh(existing)
+            return idea_from_model(existing)
+        else:
+            db_idea = IdeaModel(
+                id=idea.id,
+                title_provisional=idea.title_provisional,
+                domain=idea.domain,
+                status=idea.status,
+                created_at=idea.created_at,
+                updated_at=idea.updated_at,
+                semantic_profile=profile["semantic_profile"],
+                embedding=profile["embedding"],
+                space_id=idea.space_id
+            )
+            self.async_db.add(db_idea)
+            await async_commit_or_flush(self.async_db)
+            return idea
+
+    async def get_idea(self, idea_id: UUID) -> Optional[Idea]:
+        stmt = select(IdeaModel).where(IdeaModel.id == idea_id, IdeaModel.is_deleted == False)
+        result = (await self.async_db.execute(stmt)).scalar_one_or_none()
+        if result:
+            return idea_from_model(result)
+        return None
+
+    async def update_idea_profile(self, idea_id: UUID, vector: List[float]) -> Optional[Idea]:
+        async with self.transaction():
+            model = (await self.async_db.execute(lock_idea_stmt(idea_id))).scalar_one_or_none()
+            if model is None:
+                return None
+            idea = idea_from_model(model)
+            if idea.semantic_profile is None:
+                return idea
+            idea.semantic_profile = idea.semantic_profile.update(vector)
+            await self.async_db.execute(idea_profile_update_stmt(idea))
+        return idea
+
+    async def update_idea_status(self, idea_id: UUID, status: str) -> bool:
+        stmt = update(IdeaModel).where(IdeaModel.id == idea_id).values(status=status, updated_at=datetime.utcnow())
+        result = await self.async_db.execute(stmt)
+        await async_commit_or_flush(self.async_db)
+        return result.rowcount > 0
+
+    async def save_idea_version(self, version: IdeaVersion) -> IdeaVersion:
+        await self.async_db.execute(save_idea_version_stmt(version))
+        await async_commit_or_flush(self.async_db)
+        return version
+
+    async def append_idea_version(self, version: IdeaVersion) -> Optional[IdeaVersion]:
+        number = (await self.async_db.execute(append_idea_version_stmt(version))).scalar_one_or_none()
+        if number is None:
+            return None
+        await async_commit_or_flush(self.async_db)
+        return version.model_copy(update={"version_number": number})
+
+    async def list_ideas(self, status: Optional[str] = None, space_id: Optional[UUID] = None) -> List[Idea]:
+        stmt = select(IdeaModel).where(IdeaModel.is_deleted == False)
+        if status:
+            stmt = stmt.where(IdeaModel.status == status)
+        if space_id:
+            stmt = stmt.where(IdeaModel.space_id == space_id)
+
+        results = (await self.async_db.execute(stmt)).scalars().all()
+        return [idea_from_model(r) for r in results]
+
+    async def get_latest_version(self, idea_id: UUID) -> Optional[IdeaVersion]:
+        result = (await self.async_db.execute(latest_version_stmt(idea_id))).scalar_one_or_none()
+        if result:
+            return IdeaVersion.model_validate(result)
+        return None
+
+    async def list_idea_versions(self, idea_id: UUID) -> List[IdeaVersion]:
+        stmt = select(IdeaVersionModel)\
+               .where(IdeaVersionModel.idea_id == idea_id)\
+               .order_by(IdeaVersionModel.version_number.asc())
+        results = (await self.async_db.execute(stmt)).scalars().all()
+        return [IdeaVersion.model_validate(r) for r in results]
+
+    async def search_candidates(self, vector: List[float], limit: int = 5, space_id: Optional[UUID] = None) -> List[Tuple[Idea, float]]:
+        distance_expr = IdeaModel.embedding.cosine_distance(vector).label("distance")
+        stmt = select(IdeaModel, distance_expr)\
+               .where(IdeaModel.is_deleted == False)
+
+        if space_id:
+            stmt = stmt.where(IdeaModel.space_id == space_id)
+
+        stmt = stmt.order_by(distance_expr).limit(limit)
+
+        results = (await self.async_db.execute(stmt)).all()
+        return [(idea_from_model(row[0]), 1.0 - row[1]) for row in results]
+
+    async def list_graph_nodes(self, space_id: Optional[UUID] = None, limit: int = 500, offset: int = 0) -> List[IdeaGraphNode]:
+        rows = (await self.async_db.execute(graph_nodes_stmt(space_id, limit, offset))).all()
+        return [
+            IdeaGraphNode(
+                id=row.id,
+                title_provisional=row.title_provisional,
+                status=row.status or "germinal",
+                domain=row.domain,
+                fragment_count=row.fragment_count or 0
+            )
+            for row in rows
+        ]
+
+    async def list_graph_edges(self, idea_ids: List[UUID], k: int = 5, min_similarity: float = 0.3) -> List[Tuple[UUID, UUID, float]]:
+        if not idea_ids or k <= 0:
+            return []
+        rows = (await self.async_db.execute(stored_graph_edges_stmt(idea_ids, k, min_similarity))).all()
+        if not rows and not (await self.async_db.execute(idea_edges_exist_stmt())).scalar():
+            # idea_edges not populated yet (upgraded database awaiting rebuild_idea_edges)
+            return await self.compute_graph_edges(idea_ids, k, min_similarity)
+        return [(row[0], row[1], float(row[2])) for row in rows]
+
+    async def compute_graph_edges(self, idea_ids: List[UUID], k: int = 5, min_similarity: float = 0.3, space_id: Optional[UUID] = None) -> List[Tuple[UUID, UUID, float]]:
+        if not idea_ids or k <= 0:
+            return []
+        await self.async_db.execute(hnsw_ef_search_stmt(k))
+        rows = (await self.async_db.execute(graph_edges_stmt(idea_ids, k, min_similarity, space_id))).all()
+        return [(row[0], row[1], float(row[2])) for row in rows]
+
+    async def refresh_idea_edges(self, idea_ids: List[UUID]) -> int:
+        if not idea_ids:
+            return 0
+        delete_stmt, insert_stmt = refresh_idea_edges_stmts(idea_ids)
+        await self.async_db.execute(hnsw_ef_search_stmt(IDEA_EDGES_K))
+        await self.async_db.execute(delete_stmt)
+        result = await self.async_db.execute(insert_stmt)
+        await async_commit_or_flush(self.async_db)
+        return result.rowcount
+
+    async def update_idea_edges(self, idea_id: UUID) -> int:
+        async with async_unit_of_work(self.async_db):
+            previous = set((await self.async_db.execute(idea_edge_neighbours_stmt(idea_id))).scalars().all())
+            count = await self.refresh_idea_edges([idea_id])
+            current = set((await self.async_db.execute(idea_edge_neighbours_stmt(idea_id))).scalars().all())
+            neighbourhood = list((previous | current) - {idea_id})
+            return count + await self.refresh_idea_edges(neighbourhood)
+
+    async def search_fragments(self, vector: List[float], limit: int = 5, space_id: Optional[UUID] = None) -> List[Tuple[Fragment, float]]:
+        await self.async_db.execute(hnsw_ef_search_stmt(limit))
+        results = (await self.async_db.execute(search_fragments_stmt(vector, limit, space_id))).all()
+        return [(Fragment.model_validate(row[0]), 1.0 - row[1]) for row in results]
+
+    async def hybrid_search(self, query: str, vector: List[float], limit: int = 10, space_id: Optional[UUID] = None,
+                            lexical_weight: float = 1.0, semantic_weight: float = 1.0) -> List[RetrievalHit]:
+        pool = hybrid_pool(limit)
+        await self.async_db.execute(hnsw_ef_search_stmt(pool))
+        stmt = hybrid_search_stmt(query, vector, limit, space_id, lexical_weight, semantic_weight, pool)
+        return [retrieval_hit(row) for row in (await self.async_db.execute(stmt)).all()]
+
+    # --- TRASH MANAGEMENT ---
+
+    async def soft_delete_fragment(self, fragment_id: UUID) -> bool:
+        return await self._set_fragments_deleted([fragment_id], True) > 0
+
+    async def restore_fragment(self, fragment_id: UUID) -> bool:
+        return await self._set_fragments_deleted([fragment_id], False) > 0
+
+    async def _set_fragments_deleted(self, fragment_ids: List[UUID], deleted: bool) -> int:
+        rows = (await self.async_db.execute(set_fragments_deleted_stmt(fragment_ids, deleted))).all()
+        changed = changed_fragment_ids(rows, deleted)
+        if changed:
+            await self.async_db.execute(shift_fragment_counts_stmt(changed, -1 if deleted else 1))
+        await async_commit_or_flush(self.async_db)
+        return len(rows)
+
+    async def hard_delete_fragment(self, fragment_id: UUID) -> bool:
+        stmt = select(FragmentModel).where(FragmentModel.id == fragment_id)
+        fragment = (await self.async_db.execute(stmt)).scalar_one_or_none()
+        if fragment:
+            await self.async_db.delete(fragment)
+            await async_commit_or_flush(self.async_db)
+            return True
+        return False
+
+    async def list_deleted_fragments(self) -> List[Fragment]:
+        stmt = select(FragmentModel).where(FragmentModel.is_deleted == True).order_by(FragmentModel.created_at.desc())
+        results = (await self.async_db.execute(stmt)).scalars().all()
+        return [Fragment.model_validate(r) for r in results]
+
+    async def soft_delete_batch_fragments(self, ids: List[UUID]) -> int:
+        if not ids:
+            return 0
+        return await self._set_fragments_deleted(ids, True)
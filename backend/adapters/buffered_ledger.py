@@ -0,0 +1,216 @@
+import os
+import atexit
+import asyncio
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+from uuid import UUID, uuid4
+
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+
+from domain.events import DecisionResult
+from ports.decision_ledger import DecisionLedgerPort
+from infrastructure.database import on_commit, in_unit_of_work
+from adapters.orm import DecisionLogModel
+from adapters.postgres_ledger import decision_log_values
+
+logger = logging.getLogger("ledger.buffer")
+
+# direct: one write per decision in the caller's transaction (default)
+# buffered: decisions are queued and written in bulk by a background thread
+# strict: buffered, but each row goes to the flush thread as soon as its transaction commits,
+#         or is written before record_decision returns outside one (tests)
+DECISION_LEDGER_MODE = os.getenv("DECISION_LEDGER_MODE", "direct")
+LEDGER_FLUSH_ROWS = int(os.getenv("LEDGER_FLUSH_ROWS", "500"))
+LEDGER_FLUSH_MS = float(os.getenv("LEDGER_FLUSH_MS", "200"))
+
+class DecisionLogBuffer:
+    """
+    Process-wide queue of decision_logs rows, written with one multi-row INSERT every
+    flush_rows rows or flush_ms milliseconds, whichever comes first, on a daemon
+    thread with its own connection.
+
+    Rows keep their queue order across flushes. A batch that hits a constraint is
+    retried row by row so one bad row doesn't take the batch with it; any other
+    failure (database unreachable) puts the batch back for the next flush.
+    Call close() on shutdown to write what is left.
+    """
+
+    def __init__(self, engine: Engine, flush_rows: int = LEDGER_FLUSH_ROWS, flush_ms: float = LEDGER_FLUSH_MS):
+        self.engine = engine
+        self.flush_rows = max(1, flush_rows)
+        self.flush_interval = max(flush_ms, 1) / 1000
+        self._rows: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()  # Guards _rows
+        self._flush_lock = threading.Lock()  # One writer at a time
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self.flushes = 0
+        self.written = 0
+        self.dropped = 0
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def add(self, rows: List[Dict[str, Any]], flush_if_closed: bool = True) -> None:
+        with self._lock:
+            self._rows.extend(rows)
+            full = len(self._rows) >= self.flush_rows
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(target=self._run, name="decision-log-flush", daemon=True)
+                self._thread.start()
+        if self._closed:
+            # Decisions made during shutdown (a job finishing) are written straight away
+            if flush_if_closed:
+                self.flush()
+        elif full:
+            self._wake.set()
+
+    def request_flush(self) -> None:
+        """Has the flush thread write the queue now instead of at the next interval (non-blocking)."""
+        self._wake.set()
+
+    def flush(self) -> int:
+        """Writes every queued row now. Returns the number written."""
+        with self._flush_lock:
+            with self._lock:
+                rows, self._rows = self._rows, []
+            if not rows:
+                return 0
+            try:
+                written = self._write(rows)
+            except Exception:
+                with self._lock:
+                    self._rows[:0] = rows
+                raise
+            self.flushes += 1
+            self.written += written
+            return written
+
+    def _write(self, rows: List[Dict[str, Any]]) -> int:
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(insert(DecisionLogModel.__table__), rows)
+            return len(rows)
+        except IntegrityError:
+            pass
+        written = 0
+        for row in rows:
+            try:
+                with self.engine.begin() as conn:
+                    conn.execute(insert(DecisionLogModel.__table__), [row])
+                written += 1
+            except IntegrityError as e:
+                self.dropped += 1
+                logger.error(f"Dropped decision log {row['id']} for fragment {row['fragment_id']}: {e.orig}")
+        return written
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.warning(f"Decision log flush failed, {self.pending()} rows kept for retry: {e}")
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._rows)
+
+    def close(self) -> None:
+        """Stops the flush thread and writes the remaining rows (blocking)."""
+        self._closed = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"Decision log buffer closed with {self.pending()} unwritten rows: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": DECISION_LEDGER_MODE,
+            "flush_rows": self.flush_rows,
+            "flush_ms": self.flush_interval * 1000,
+            "pending": self.pending(),
+            "flushes": self.flushes,
+            "written": self.written,
+            "dropped": self.dropped
+        }
+
+_buffer: Optional[DecisionLogBuffer] = None
+
+def get_decision_log_buffer() -> DecisionLogBuffer:
+    global _buffer
+    if _buffer is None:
+        from infrastructure.database import engine
+        _buffer = DecisionLogBuffer(engine)
+        atexit.register(_buffer.close)
+    return _buffer
+
+def close_decision_log_buffer():
+    if _buffer is not None:
+        _buffer.close()
+
+class BufferedDecisionLedger(DecisionLedgerPort):
+    """
+    Ledger for DECISION_LEDGER_MODE=buffered/strict: record_decision queues the row
+    on the DecisionLogBuffer instead of writing and committing it on the ingest path.
+
+    A decision recorded inside a unit of work is queued only when that unit commits,
+    and dropped if it rolls back, so the log never outruns the fragment and idea it
+    points to. Reads go to `reader` after a flush, so they see every decision made.
+    """
+
+    def __init__(self, db, reader: DecisionLedgerPort, buffer: DecisionLogBuffer, strict: bool = False):
+        self.db = db  # Session or AsyncSession the pipeline's writes go through
+        self.reader = reader
+        self.buffer = buffer
+        self.strict = strict
+
+    async def record_decision(self, fragment, decision: DecisionResult):
+        row = {"id": uuid4(), **decision_log_values(fragment, decision)}
+        if in_unit_of_work(self.db):
+            on_commit(self.db, lambda: self._enqueue_committed(row))
+        else:
+            # Nothing left to commit: queue it now, off the event loop (strict mode writes it)
+            await asyncio.to_thread(self._enqueue, row)
+
+    def _enqueue(self, row: Dict[str, Any]):
+        self.buffer.add([row])
+        if self.strict:
+            self.buffer.flush()
+
+    def _enqueue_committed(self, row: Dict[str, Any]):
+        # Runs on the caller's thread (the event loop) right after its commit: never write
+        # here, the flush thread does (strict mode just doesn't wait for the interval).
+        # The fragment is stored, so a failure is logged rather than failing the request
+        try:
+            self.buffer.add([row], flush_if_closed=False)
+            if self.buffer.closed:
+                # Shutting down: no flush thread left, write from the default executor
+                asyncio.get_running_loop().run_in_executor(None, self._flush_logged)
+            elif self.strict:
+                self.buffer.request_flush()
+        except Exception as e:
+            logger.error(f"Decision log {row['id']} not written after commit, {self.buffer.pending()} rows kept for retry: {e}")
+
+    def _flush_logged(self):
+        try:
+            self.buffer.flush()
+        except Exception as e:
+            logger.error(f"Decision log flush after close failed, {self.buffer.pending()} rows unwritten: {e}")
+
+    async def get_decision_history(self, fragment_id: UUID) -> List[dict]:
+        await asyncio.to_thread(self.buffer.flush)
+        return await self.reader.get_decision_history(fragment_id)
+
+    async def get_recent_logs(self, limit: int = 50) -> List[dict]:
+        await asyncio.to_thread(self.buffer.flush)
+        return await self.reader.get_recent_logs(limit)
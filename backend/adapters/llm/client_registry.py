@@ -0,0 +1,116 @@
+import os
+import asyncio
+import logging
+import threading
+import importlib.util
+from typing import Dict, Optional, Tuple
+
+import httpx
+from groq import AsyncGroq
+
+from adapters.llm.groq_adapter import GroqAdapter
+from adapters.llm.ollama_adapter import OllamaAdapter
+
+logger = logging.getLogger("llm.registry")
+
+DEFAULT_OLLAMA_URL = "http://localhost:11434"
+GROQ_BASE_URL = "https://api.groq.com"
+
+def http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+class ProviderRegistry:
+    """
+    Process-wide LLM adapters with long-lived, pooled HTTP clients.
+
+    One httpx.AsyncClient per (provider, base_url) keeps TCP/TLS connections alive
+    across requests; adapters are cached per (provider, base_url, model) on top of it.
+    Clients belong to the event loop that created them, so every loop (e.g. a script
+    calling asyncio.run twice, or each job worker slot) gets its own pool; pools of
+    closed loops are dropped. Call aclose() on each loop before it shuts down.
+    """
+
+    def __init__(self, max_connections: int = 100, max_keepalive: int = 20, keepalive_expiry: float = 30.0, http2: Optional[bool] = None):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry
+        )
+        # HTTP/2 needs the optional h2 package and only applies to https endpoints
+        self.http2 = http2_available() if http2 is None else http2
+        # Per event loop: ({(provider, base_url): client}, {(provider, base_url, model): adapter})
+        self._pools: Dict[Optional[asyncio.AbstractEventLoop], Tuple[dict, dict]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "ProviderRegistry":
+        http2 = os.getenv("LLM_HTTP2")
+        return cls(
+            max_connections=int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "100")),
+            max_keepalive=int(os.getenv("LLM_HTTP_MAX_KEEPALIVE", "20")),
+            keepalive_expiry=float(os.getenv("LLM_HTTP_KEEPALIVE_EXPIRY", "30")),
+            http2=None if http2 is None else http2.lower() in ("1", "true", "yes")
+        )
+
+    def _pool(self) -> Tuple[dict, dict]:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        with self._lock:
+            pool = self._pools.get(loop)
+            if pool is None:
+                # Pooled connections cannot move between event loops; forget loops that are gone
+                self._pools = {other: kept for other, kept in self._pools.items() if other is None or not other.is_closed()}
+                pool = self._pools[loop] = ({}, {})
+            return pool
+
+    def _client(self, clients: dict, provider: str, base_url: str) -> httpx.AsyncClient:
+        key = (provider, base_url)
+        client = clients.get(key)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(limits=self.limits, http2=self.http2, timeout=httpx.Timeout(120.0, connect=5.0))
+            clients[key] = client
+            logger.info(f"Opened pooled HTTP client for {provider} at {base_url} (http2={self.http2})")
+        return client
+
+    def get_ollama(self, model: str, base_url: Optional[str] = None) -> OllamaAdapter:
+        clients, adapters = self._pool()
+        base_url = base_url or os.getenv("OLLAMA_BASE_URL", DEFAULT_OLLAMA_URL)
+        key = ("ollama", base_url, model)
+        adapter = adapters.get(key)
+        if adapter is None:
+            adapter = OllamaAdapter(base_url=base_url, model=model, client=self._client(clients, "ollama", base_url))
+            adapters[key] = adapter
+        return adapter
+
+    def get_groq(self, api_key: str, model: str) -> GroqAdapter:
+        clients, adapters = self._pool()
+        key = ("groq", GROQ_BASE_URL, model)
+        adapter = adapters.get(key)
+        if adapter is None or adapter.client.api_key != api_key:
+            client = AsyncGroq(api_key=api_key, http_client=self._client(clients, "groq", GROQ_BASE_URL))
+            adapter = GroqAdapter(api_key=api_key, model=model, client=client)
+            adapters[key] = adapter
+        return adapter
+
+    async def aclose(self):
+        """Closes the clients of the running loop."""
+        clients, adapters = self._pool()
+        closing = list(clients.values())
+        clients.clear()
+        adapters.clear()
+        for client in closing:
+            await client.aclose()
+
+_registry: Optional[ProviderRegistry] = None
+
+def get_provider_registry() -> ProviderRegistry:
+    global _registry
+    if _registry is None:
+        _registry = ProviderRegistry.from_env()
+    return _registry
+
+async def close_provider_registry():
+    if _registry is not None:
+        await _registry.aclose()
@@ -1,41 +1,46 @@
 import os
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator
 from uuid import UUID
 from ports.ai_provider import AIProviderPort
 from ports.llm_provider import LLMProvider
-from adapters.llm.groq_adapter import GroqAdapter
-from adapters.llm.ollama_adapter import OllamaAdapter
 from adapters.llm.mock_adapter import MockAdapter
+from adapters.llm.embedding_cache import EmbeddingCache, get_embedding_cache
+from adapters.llm.client_registry import get_provider_registry
+from adapters.llm.single_flight import SingleFlight, get_single_flight, prompt_hash
 from domain.services.ai_config_service import AIConfigService, AIModelConfig
 
 class CompositeAIProvider(AIProviderPort):
-    def __init__(self, config_service: AIConfigService):
+    def __init__(self, config_service: AIConfigService, embedding_cache: Optional[EmbeddingCache] = None, single_flight: Optional[SingleFlight] = None):
         # We inject the config service (scoped to request usually)
         # or we instantiate it if passed inside the method
         # BUT standard pattern for stateless singleton provider:
         # Pass DB/User Context in method args OR use request-scoped dependency injection.
         # Since 'get_ai_provider' in fastAPI can be request-scoped, we can inject DB session into it.
         self.config_service = config_service
+        self.embedding_cache = embedding_cache or get_embedding_cache()
+        # Identical concurrent embedding/synthesis calls share one model call
+        self.single_flight = single_flight or get_single_flight()
         self._groq_api_key = os.getenv("GROQ_API_KEY", "")
         self._force_mock = os.getenv("AI_PROVIDER") == "mock"
 
     def _get_provider(self, config: AIModelConfig) -> LLMProvider:
-        # Factories method - Lightweight enough to recreate or we could cache safely if no state involved
+        # Real providers come from the process-wide registry (pooled, keep-alive clients)
         if self._force_mock:
             return MockAdapter()
 
+        registry = get_provider_registry()
         if config.provider == "groq":
             if not self._groq_api_key:
                 print(f"[CompositeAI] Warning: GROQ_API_KEY not set. {config.model_name} might fail.")
-            return GroqAdapter(api_key=self._groq_api_key, model=config.model_name)
+            return registry.get_groq(api_key=self._groq_api_key, model=config.model_name)
         
         elif config.provider == "ollama":
-            return OllamaAdapter(model=config.model_name)
+            return registry.get_ollama(model=config.model_name)
             
         else:
-            return OllamaAdapter(model="llama3")
+            return registry.get_ollama(model="llama3")
 
-    async def generate_embedding(self, text: str, user_id: Optional[UUID] = None) -> List[float]:
+    def _embedding_config(self, user_id: Optional[UUID]) -> AIModelConfig:
         profile = self.config_service.get_config(user_id)
         
         # Check environment setting to avoid defaulting to dead Ollama
@@ -51,33 +56,67 @@ class CompositeAIProvider(AIProviderPort):
              else:
                  # Fallback to mock for stability - Groq doesn't do embeddings
                  config = AIModelConfig(provider="mock", model_name="random-projection")
-             
+        
         # Force mock if explicitly configured
-        if config.provider == "mock" or env_provider == "mock":
-            return await MockAdapter().generate_embedding(text)
+        if env_provider == "mock":
+            return AIModelConfig(provider="mock", model_name="random-projection")
+        return config
+
+    async def generate_embedding(self, text: str, user_id: Optional[UUID] = None) -> List[float]:
+        return (await self.generate_embeddings([text], user_id=user_id))[0]
+
+    async def generate_embeddings(self, texts: List[str], user_id: Optional[UUID] = None) -> List[List[float]]:
+        """Batch path: cached texts are skipped and the rest go to the provider in one call."""
+        if not texts:
+            return []
+        config = self._embedding_config(user_id)
+        
+        if config.provider == "mock":
+            return await MockAdapter().generate_embeddings(texts)
         
-        # Try Ollama with fallback to Mock on failure
+        # Try Ollama with fallback to Mock on failure (fallback vectors are never cached)
         if config.provider == "ollama":
             try:
-                provider = self._get_provider(config)
-                return await provider.generate_embedding(text)
+                return await self._coalesced_embeddings(texts, config)
             except Exception as e:
                 # Ollama failed (404, connection refused, etc.) - fallback to Mock
                 print(f"[CompositeAI] Ollama embedding failed: {str(e)}. Falling back to MockAdapter.")
-                return await MockAdapter().generate_embedding(text)
+                return await MockAdapter().generate_embeddings(texts)
         
         # For other providers (shouldn't happen for embeddings, but safe default)
+        return await self._coalesced_embeddings(texts, config)
+
+    async def _coalesced_embeddings(self, texts: List[str], config: AIModelConfig) -> List[List[float]]:
+        key = ("embed", config.provider, config.model_name, prompt_hash(*texts))
+        return await self.single_flight.do(key, lambda: self._cached_embeddings(texts, config))
+
+    async def _cached_embeddings(self, texts: List[str], config: AIModelConfig) -> List[List[float]]:
         provider = self._get_provider(config)
-        return await provider.generate_embedding(text)
+        # Adapters may embed with a different model than the configured chat model
+        model = getattr(provider, "embedding_model", config.model_name)
+        return await self.embedding_cache.get_or_compute_many(
+            texts, config.provider, model, provider.generate_embeddings
+        )
 
     async def synthesize(self, context: str, prompt: str, user_id: Optional[UUID] = None, language: str = "en") -> str:
         profile = self.config_service.get_config(user_id)
         provider = self._get_provider(profile.drafter)
         
+        full_prompt = self._synthesis_prompt(context, prompt, language)
+        key = ("synthesize", profile.drafter.provider, profile.drafter.model_name, prompt_hash(full_prompt))
+        return await self.single_flight.do(key, lambda: provider.generate_text(full_prompt))
+
+    async def synthesize_stream(self, context: str, prompt: str, user_id: Optional[UUID] = None, language: str = "en") -> AsyncIterator[str]:
+        # Streams are not coalesced: every caller needs its own chunk sequence
+        profile = self.config_service.get_config(user_id)
+        provider = self._get_provider(profile.drafter)
+        async for chunk in provider.generate_text_stream(self._synthesis_prompt(context, prompt, language)):
+            yield chunk
+
+    @staticmethod
+    def _synthesis_prompt(context: str, prompt: str, language: str) -> str:
         lang_instruction = "INSTRUCTION: Output strictly in English." if language == "en" else "INSTRUCCIÓN: Responde estrictamente en Español."
-        
-        full_prompt = f"{lang_instruction}\n\nContext:\n{context}\n\nTask:\n{prompt}"
-        return await provider.generate_text(full_prompt)
+        return f"{lang_instruction}\n\nContext:\n{context}\n\nTask:\n{prompt}"
 
     async def generate_json(self, context: str, prompt: str, user_id: Optional[UUID] = None, language: str = "en") -> Dict[str, Any]:
         profile = self.config_service.get_config(user_id)
@@ -0,0 +1,244 @@
+import os
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select, update, delete, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from infrastructure.database import SessionLocal
+from domain.exceptions import EmbeddingError
+from adapters.orm import EmbeddingCacheModel
+
+logger = logging.getLogger("embedding.cache")
+
+CacheKey = Tuple[str, str, str]
+
+class EmbeddingCache:
+    """
+    Two-tier embedding cache keyed by (sha256(text), provider, model).
+
+    Tier 1 is an in-process LRU of float32 vectors (max_entries).
+    Tier 2 is the embedding_cache table, shared by every worker and kept across
+    restarts; rows past max_rows are evicted by last_used_at every prune_every writes.
+    Reads are plain SELECTs: the last_used_at of rows hit is bumped in batches of
+    touch_every keys (and before every prune), not on each lookup.
+    The table is accessed through its own short-lived sessions, off the event loop,
+    so cached vectors survive a rolled-back ingest and never block a request's unit of work.
+    Database errors are logged and counted, never raised: the cache is an optimization.
+    """
+
+    def __init__(self, max_entries: int = 4096, max_rows: int = 1_000_000, prune_every: int = 1000, touch_every: int = 500,
+                 session_factory=SessionLocal):
+        self.max_entries = max_entries
+        self.max_rows = max_rows
+        self.prune_every = prune_every
+        self.touch_every = max(1, touch_every)
+        self._session_factory = session_factory
+        self._entries: "OrderedDict[CacheKey, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes_since_prune = 0
+        self._touched: set = set()  # Table keys hit since the last last_used_at update
+        self._metrics = {
+            "memory_hits": 0,
+            "db_hits": 0,
+            "misses": 0,
+            "memory_evictions": 0,
+            "db_evictions": 0,
+            "db_errors": 0,
+        }
+
+    @classmethod
+    def from_env(cls) -> "EmbeddingCache":
+        return cls(
+            max_entries=int(os.getenv("EMBEDDING_CACHE_SIZE", "4096")),
+            max_rows=int(os.getenv("EMBEDDING_CACHE_DB_MAX_ROWS", "1000000")),
+        )
+
+    @staticmethod
+    def content_hash(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    async def get_or_compute(self, text: str, provider: str, model: str, compute: Callable[[], Awaitable[List[float]]]) -> List[float]:
+        async def compute_one(missing: List[str]) -> List[List[float]]:
+            return [await compute()]
+        return (await self.get_or_compute_many([text], provider, model, compute_one))[0]
+
+    async def get_or_compute_many(self, texts: List[str], provider: str, model: str, compute: Callable[[List[str]], Awaitable[List[List[float]]]]) -> List[List[float]]:
+        """
+        Resolves every text from memory, then the table (one query), and calls
+        compute once with the distinct texts still missing, in first-seen order.
+        """
+        keys = [(self.content_hash(text), provider, model) for text in texts]
+        found: Dict[CacheKey, np.ndarray] = {}
+
+        for key in dict.fromkeys(keys):
+            vector = self._memory_get(key)
+            if vector is not None:
+                found[key] = vector
+        self._count("memory_hits", len(found))
+
+        pending = [key for key in dict.fromkeys(keys) if key not in found]
+        if pending and self.max_rows > 0:
+            db_found = await asyncio.to_thread(self._db_get_many, pending)
+            self._count("db_hits", len(db_found))
+            for key, vector in db_found.items():
+                self._memory_put(key, vector)
+            found.update(db_found)
+
+        missing = [key for key in dict.fromkeys(keys) if key not in found]
+        computed: Dict[CacheKey, List[float]] = {}
+        if missing:
+            self._count("misses", len(missing))
+            text_by_key = dict(zip(keys, texts))
+            embeddings = await compute([text_by_key[key] for key in missing])
+            if len(embeddings) != len(missing):
+                raise EmbeddingError("Provider returned a wrong number of embeddings", original_error=f"{len(embeddings)} for {len(missing)} texts")
+            new_rows = []
+            for key, embedding in zip(missing, embeddings):
+                vector = np.asarray(embedding, dtype=np.float32)
+                computed[key] = embedding
+                new_rows.append((key, vector))
+                self._memory_put(key, vector)
+            if self.max_rows > 0:
+                await asyncio.to_thread(self._db_put_many, new_rows)
+
+        # Freshly computed embeddings are returned as the model produced them
+        return [computed[key] if key in computed else found[key].tolist() for key in keys]
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            stats = dict(self._metrics)
+            stats["memory_entries"] = len(self._entries)
+        lookups = stats["memory_hits"] + stats["db_hits"] + stats["misses"]
+        stats["max_entries"] = self.max_entries
+        stats["max_rows"] = self.max_rows
+        stats["hit_rate"] = round((stats["memory_hits"] + stats["db_hits"]) / lookups, 4) if lookups else 0.0
+        return stats
+
+    def clear_memory(self):
+        with self._lock:
+            self._entries.clear()
+
+    # --- Tier 1: in-process LRU ---
+
+    def _count(self, metric: str, amount: int = 1):
+        with self._lock:
+            self._metrics[metric] += amount
+
+    def _memory_get(self, key: CacheKey) -> Optional[np.ndarray]:
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+            return vector
+
+    def _memory_put(self, key: CacheKey, vector: np.ndarray):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = vector
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._metrics["memory_evictions"] += 1
+
+    # --- Tier 2: embedding_cache table (runs in a worker thread) ---
+
+    def _db_get_many(self, keys: List[CacheKey]) -> Dict[CacheKey, np.ndarray]:
+        # Keys share provider and model
+        _, provider, model = keys[0]
+        stmt = select(EmbeddingCacheModel.content_hash, EmbeddingCacheModel.embedding)\
+               .where(
+                   EmbeddingCacheModel.content_hash.in_([key[0] for key in keys]),
+                   EmbeddingCacheModel.provider == provider,
+                   EmbeddingCacheModel.model == model
+               )
+        try:
+            with self._session_factory() as db:
+                rows = db.execute(stmt).all()
+        except SQLAlchemyError as e:
+            logger.warning(f"Embedding cache read failed: {e}")
+            self._count("db_errors")
+            return {}
+        found = {(content_hash, provider, model): np.asarray(embedding, dtype=np.float32) for content_hash, embedding in rows}
+        with self._lock:
+            self._touched.update(found)
+            touch = len(self._touched) >= self.touch_every
+        if touch:
+            try:
+                with self._session_factory() as db:
+                    self._touch(db)
+                    db.commit()
+            except SQLAlchemyError as e:
+                logger.warning(f"Embedding cache touch failed: {e}")
+                self._count("db_errors")
+        return found
+
+    def _touch(self, db):
+        # One UPDATE per (provider, model) for every key hit since the last touch,
+        # in a stable order so concurrent touches of the same rows don't deadlock
+        with self._lock:
+            touched, self._touched = self._touched, set()
+        groups: Dict[Tuple[str, str], List[str]] = {}
+        for content_hash, provider, model in sorted(touched):
+            groups.setdefault((provider, model), []).append(content_hash)
+        for (provider, model), hashes in groups.items():
+            db.execute(update(EmbeddingCacheModel)
+                       .where(EmbeddingCacheModel.content_hash.in_(hashes),
+                              EmbeddingCacheModel.provider == provider,
+                              EmbeddingCacheModel.model == model)
+                       .values(last_used_at=func.now()))
+
+    def _db_put_many(self, rows: List[Tuple[CacheKey, np.ndarray]]):
+        if not rows:
+            return
+        stmt = insert(EmbeddingCacheModel).values([
+            {"content_hash": content_hash, "provider": provider, "model": model, "embedding": vector}
+            for (content_hash, provider, model), vector in rows
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[EmbeddingCacheModel.content_hash, EmbeddingCacheModel.provider, EmbeddingCacheModel.model],
+            set_={"embedding": stmt.excluded.embedding, "last_used_at": func.now()}
+        )
+        with self._lock:
+            self._writes_since_prune += len(rows)
+            prune = self._writes_since_prune >= self.prune_every
+            if prune:
+                self._writes_since_prune = 0
+        try:
+            with self._session_factory() as db:
+                db.execute(stmt)
+                if prune:
+                    # Recent hits first, so pruning doesn't evict rows that are in use
+                    self._touch(db)
+                    self._prune(db)
+                db.commit()
+        except SQLAlchemyError as e:
+            logger.warning(f"Embedding cache write failed: {e}")
+            self._count("db_errors")
+
+    def _prune(self, db):
+        # Keep the max_rows most recently used rows
+        cutoff = select(EmbeddingCacheModel.last_used_at)\
+                 .order_by(EmbeddingCacheModel.last_used_at.desc())\
+                 .offset(self.max_rows).limit(1)\
+                 .scalar_subquery()
+        result = db.execute(delete(EmbeddingCacheModel).where(EmbeddingCacheModel.last_used_at <= cutoff))
+        if result.rowcount:
+            self._count("db_evictions", result.rowcount)
+            logger.info(f"Embedding cache pruned {result.rowcount} rows")
+
+_embedding_cache: Optional[EmbeddingCache] = None
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Process-wide cache shared by every request-scoped CompositeAIProvider."""
+    global _embedding_cache
+    if _embedding_cache is None:
+        _embedding_cache = EmbeddingCache.from_env()
+    return _embedding_cache
@@ -1,15 +1,16 @@
 import json
 import logging
 import time
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator
 from groq import AsyncGroq, APIConnectionError
 from ports.llm_provider import LLMProvider
 
 logger = logging.getLogger("groq.adapter")
 
 class GroqAdapter(LLMProvider):
-    def __init__(self, api_key: str, model: str = "llama-3.3-70b-versatile"):
-        self.client = AsyncGroq(api_key=api_key)
+    def __init__(self, api_key: str, model: str = "llama-3.3-70b-versatile", client: Optional[AsyncGroq] = None):
+        # Pass a shared client (see client_registry) to reuse its connection pool
+        self.client = client or AsyncGroq(api_key=api_key)
         self.model = model
 
     async def check_health(self) -> bool:
@@ -61,6 +62,51 @@ class GroqAdapter(LLMProvider):
             }))
             raise e
 
+    async def generate_text_stream(self, prompt: str, system_prompt: Optional[str] = None, **kwargs) -> AsyncIterator[str]:
+        start_time = time.time()
+        first_chunk_ms = None
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+        
+        if "temperature" not in kwargs:
+            kwargs["temperature"] = 0.7
+            
+        try:
+            stream = await self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                stream=True,
+                **kwargs
+            )
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                content = chunk.choices[0].delta.content
+                if content:
+                    if first_chunk_ms is None:
+                        first_chunk_ms = round((time.time() - start_time) * 1000, 2)
+                    yield content
+            
+            logger.info(json.dumps({
+                "provider": "groq",
+                "model": self.model,
+                "action": "stream",
+                "first_chunk_ms": first_chunk_ms,
+                "latency_ms": round((time.time() - start_time) * 1000, 2),
+                "prompt_chars": len(prompt),
+                "status": "success"
+            }))
+        except Exception as e:
+            logger.error(json.dumps({
+                "provider": "groq",
+                "model": self.model,
+                "status": "error",
+                "error": str(e)
+            }))
+            raise e
+
     async def generate_json(self, prompt: str, schema: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
         kwargs["response_format"] = {"type": "json_object"}
         original_system_prompt = kwargs.get("system_prompt", "")
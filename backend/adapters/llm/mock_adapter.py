@@ -1,9 +1,12 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, AsyncIterator
 from ports.llm_provider import LLMProvider
-import random
 import json
+import hashlib
+import numpy as np
 
 class MockAdapter(LLMProvider):
+    DIMENSIONS = 1536
+
     def __init__(self, model: str = "mock-gpt"):
         self.model = model
         self._mock_vector = [0.1] * 1536
@@ -26,37 +29,60 @@ class MockAdapter(LLMProvider):
         
         return f"[MOCK] Generated response for: {prompt[:30]}..."
 
+    async def generate_text_stream(self, prompt: str, system_prompt: Optional[str] = None, **kwargs) -> AsyncIterator[str]:
+        """
+        Streams the mock text word by word.
+        """
+        text = await self.generate_text(prompt, system_prompt=system_prompt, **kwargs)
+        words = text.split(" ")
+        for i, word in enumerate(words):
+            yield word if i == len(words) - 1 else word + " "
+
     async def generate_embedding(self, text: str) -> List[float]:
         """
         Deterministic mock embedding.
         """
-        # Base vectors for clusters (using deterministic random for base)
-        def get_base_vector(seed_key):
-            rng = random.Random(seed_key)
-            return [rng.uniform(-1.0, 1.0) for _ in range(1536)]
-            
+        return (await self.generate_embeddings([text]))[0]
+
+    async def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        Deterministic mock embeddings, built in one vectorized pass:
+        a cluster base vector (one per distinct cluster) plus per-text noise.
+        """
+        if not texts:
+            return []
+        
         # Determine cluster
-        text_lower = text.lower()
-        if "neural" in text_lower or "learning" in text_lower:
-            base = get_base_vector("ai_cluster")
-        elif "quantum" in text_lower or "physics" in text_lower:
-            base = get_base_vector("physics_cluster")
-        elif "cook" in text_lower or "pasta" in text_lower:
-            base = get_base_vector("cooking_cluster")
-        else:
-            base = get_base_vector("misc_" + text[:5])
-            
-        # Add noise based on text content to simulate variations
-        text_seed = sum(ord(c) for c in text)
-        rng_noise = random.Random(text_seed)
+        cluster_keys = []
+        for text in texts:
+            text_lower = text.lower()
+            if "neural" in text_lower or "learning" in text_lower:
+                cluster_keys.append("ai_cluster")
+            elif "quantum" in text_lower or "physics" in text_lower:
+                cluster_keys.append("physics_cluster")
+            elif "cook" in text_lower or "pasta" in text_lower:
+                cluster_keys.append("cooking_cluster")
+            else:
+                cluster_keys.append("misc_" + text[:5])
         
-        vector = []
-        for b in base:
-            noise = (rng_noise.random() - 0.5) * 0.1 # +/- 0.05
-            val = b + noise
-            vector.append(val)
-            
-        return vector
+        distinct = list(dict.fromkeys(cluster_keys))
+        bases = np.stack([
+            np.random.default_rng(self._seed(key)).uniform(-1.0, 1.0, self.DIMENSIONS)
+            for key in distinct
+        ])
+        base_index = np.array([distinct.index(key) for key in cluster_keys])
+        
+        # Add noise based on text content to simulate variations (+/- 0.05)
+        noise = np.stack([
+            np.random.default_rng(sum(ord(c) for c in text)).random(self.DIMENSIONS)
+            for text in texts
+        ])
+        vectors = bases[base_index] + (noise - 0.5) * 0.1
+        return vectors.tolist()
+
+    @staticmethod
+    def _seed(key: str) -> int:
+        return int.from_bytes(hashlib.sha256(key.encode("utf-8")).digest()[:8], "little")
 
     async def generate_json(self, prompt: str, schema: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
         """
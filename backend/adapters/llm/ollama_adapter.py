@@ -3,19 +3,31 @@ import json
 import httpx
 import logging
 import time
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator
 from ports.llm_provider import LLMProvider
 
 logger = logging.getLogger("ollama.adapter")
 
 class OllamaAdapter(LLMProvider):
-    def __init__(self, base_url: str = None, model: str = "llama3.3"):
+    def __init__(self, base_url: str = None, model: str = "llama3.3", client: Optional[httpx.AsyncClient] = None):
         self.base_url = base_url or os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
         self.model = model
         self.embedding_model = os.getenv("OLLAMA_EMBED_MODEL", "nomic-embed-text")
+        self.embed_batch_size = int(os.getenv("OLLAMA_EMBED_BATCH_SIZE", "64"))
+        # Shared pooled client (see client_registry); None opens one per call
+        self.client = client
+
+    async def _post(self, url: str, payload: Dict[str, Any], timeout: float) -> httpx.Response:
+        if self.client is not None:
+            return await self.client.post(url, json=payload, timeout=timeout)
+        async with httpx.AsyncClient(timeout=timeout) as client:
+            return await client.post(url, json=payload)
 
     async def check_health(self) -> bool:
         try:
+            if self.client is not None:
+                resp = await self.client.get(f"{self.base_url}/api/version", timeout=2.0)
+                return resp.status_code == 200
             async with httpx.AsyncClient(timeout=2.0) as client:
                 resp = await client.get(f"{self.base_url}/api/version")
                 return resp.status_code == 200
@@ -26,14 +38,38 @@ class OllamaAdapter(LLMProvider):
     async def generate_text(self, prompt: str, system_prompt: Optional[str] = None, **kwargs) -> str:
         url = f"{self.base_url}/api/generate"
         start_time = time.time()
-        
+        payload = self._generate_payload(prompt, system_prompt, stream=False, **kwargs)
+
+        try:
+            resp = await self._post(url, payload, timeout=120.0)
+            resp.raise_for_status()
+            response_text = resp.json()["response"]
+            
+            duration = time.time() - start_time
+            logger.info(json.dumps({
+                "provider": "ollama",
+                "model": self.model,
+                "latency_ms": round(duration * 1000, 2),
+                "prompt_chars": len(prompt),
+                "status": "success"
+            }))
+            return response_text
+            
+        except httpx.ConnectError:
+            logger.error("Connection failed to Ollama.")
+            raise ConnectionError(f"Could not connect to Ollama at {self.base_url}. Is it running?")
+        except Exception as e:
+            logger.error(f"Ollama generation error: {e}")
+            raise RuntimeError(f"Ollama generation failed: {str(e)}")
+
+    def _generate_payload(self, prompt: str, system_prompt: Optional[str], stream: bool, **kwargs) -> Dict[str, Any]:
         valid_options = {"temperature", "num_ctx", "seed", "top_k", "top_p"}
         options = {k: v for k, v in kwargs.items() if k in valid_options}
         
         payload = {
             "model": self.model,
             "prompt": prompt,
-            "stream": False,
+            "stream": stream,
         }
         
         if system_prompt:
@@ -44,29 +80,51 @@ class OllamaAdapter(LLMProvider):
             
         if options:
             payload["options"] = options
+        return payload
 
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            try:
-                resp = await client.post(url, json=payload)
+    async def generate_text_stream(self, prompt: str, system_prompt: Optional[str] = None, **kwargs) -> AsyncIterator[str]:
+        """Streams /api/generate (NDJSON, one {"response": ..., "done": ...} object per line)."""
+        url = f"{self.base_url}/api/generate"
+        start_time = time.time()
+        first_chunk_ms = None
+        payload = self._generate_payload(prompt, system_prompt, stream=True, **kwargs)
+        
+        client = self.client or httpx.AsyncClient()
+        try:
+            async with client.stream("POST", url, json=payload, timeout=httpx.Timeout(120.0, connect=5.0)) as resp:
                 resp.raise_for_status()
-                response_text = resp.json()["response"]
-                
-                duration = time.time() - start_time
-                logger.info(json.dumps({
-                    "provider": "ollama",
-                    "model": self.model,
-                    "latency_ms": round(duration * 1000, 2),
-                    "prompt_chars": len(prompt),
-                    "status": "success"
-                }))
-                return response_text
-                
-            except httpx.ConnectError:
-                logger.error("Connection failed to Ollama.")
-                raise ConnectionError(f"Could not connect to Ollama at {self.base_url}. Is it running?")
-            except Exception as e:
-                logger.error(f"Ollama generation error: {e}")
-                raise RuntimeError(f"Ollama generation failed: {str(e)}")
+                async for line in resp.aiter_lines():
+                    if not line.strip():
+                        continue
+                    data = json.loads(line)
+                    if data.get("error"):
+                        raise RuntimeError(data["error"])
+                    chunk = data.get("response", "")
+                    if chunk:
+                        if first_chunk_ms is None:
+                            first_chunk_ms = round((time.time() - start_time) * 1000, 2)
+                        yield chunk
+                    if data.get("done"):
+                        break
+            
+            logger.info(json.dumps({
+                "provider": "ollama",
+                "model": self.model,
+                "action": "stream",
+                "first_chunk_ms": first_chunk_ms,
+                "latency_ms": round((time.time() - start_time) * 1000, 2),
+                "prompt_chars": len(prompt),
+                "status": "success"
+            }))
+        except httpx.ConnectError:
+            logger.error("Connection failed to Ollama.")
+            raise ConnectionError(f"Could not connect to Ollama at {self.base_url}. Is it running?")
+        except Exception as e:
+            logger.error(f"Ollama streaming error: {e}")
+            raise RuntimeError(f"Ollama generation failed: {str(e)}")
+        finally:
+            if self.client is None:
+                await client.aclose()
 
     async def generate_json(self, prompt: str, schema: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
         kwargs["format"] = "json"
@@ -99,24 +157,68 @@ class OllamaAdapter(LLMProvider):
             "prompt": text
         }
         start_time = time.time()
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        try:
+            resp = await self._post(url, payload, timeout=10.0)
+            resp.raise_for_status()
+            
+            duration = time.time() - start_time
+            logger.info(json.dumps({
+                "provider": "ollama",
+                "action": "embed",
+                "model": self.embedding_model,
+                "latency_ms": round(duration * 1000, 2),
+                "text_chars": len(text)
+            }))
+            
+            return resp.json()["embedding"]
+        except Exception as e:
+            logger.error(f"Ollama embedding failed: {e}")
+            raise RuntimeError(f"Ollama embedding failed: {str(e)}")
+
+    async def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embeds texts through /api/embed (array input), embed_batch_size texts per request.
+        Falls back to one /api/embeddings call per text on servers without /api/embed.
+        """
+        url = f"{self.base_url}/api/embed"
+        embeddings: List[List[float]] = []
+        for start in range(0, len(texts), self.embed_batch_size):
+            chunk = texts[start:start + self.embed_batch_size]
+            payload = {
+                "model": self.embedding_model,
+                "input": chunk
+            }
+            start_time = time.time()
+            try:
+                resp = await self._post(url, payload, timeout=10.0 + len(chunk))
+            except Exception as e:
+                logger.error(f"Ollama batch embedding failed: {e}")
+                raise RuntimeError(f"Ollama embedding failed: {str(e)}")
+            
+            if resp.status_code == 404 and "model" not in resp.text.lower():
+                # Ollama < 0.3 has no /api/embed
+                embeddings.extend([await self.generate_embedding(text) for text in chunk])
+                continue
+            
             try:
-                resp = await client.post(url, json=payload)
                 resp.raise_for_status()
+                batch = resp.json()["embeddings"]
+                if len(batch) != len(chunk):
+                    raise ValueError(f"expected {len(chunk)} embeddings, got {len(batch)}")
                 
                 duration = time.time() - start_time
                 logger.info(json.dumps({
                     "provider": "ollama",
-                    "action": "embed",
+                    "action": "embed_batch",
                     "model": self.embedding_model,
                     "latency_ms": round(duration * 1000, 2),
-                    "text_chars": len(text)
+                    "texts": len(chunk)
                 }))
-                
-                return resp.json()["embedding"]
+                embeddings.extend(batch)
             except Exception as e:
-                logger.error(f"Ollama embedding failed: {e}")
+                logger.error(f"Ollama batch embedding failed: {e}")
                 raise RuntimeError(f"Ollama embedding failed: {str(e)}")
+        return embeddings
 
     async def get_model_name(self) -> str:
         return self.model
@@ -0,0 +1,68 @@
+import asyncio
+import hashlib
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+def prompt_hash(*parts: str) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x1f")
+    return digest.hexdigest()
+
+class SingleFlight:
+    """
+    Coalesces identical in-flight calls: while a call for a key is running,
+    further calls with the same key await its result instead of starting their own.
+
+    The work runs in its own task and waiters are shielded from each other, so a
+    cancelled caller (e.g. a closed browser tab) does not cancel the shared call.
+    Results are shared objects; callers must not mutate them.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._lock = threading.Lock()
+        self._metrics = {"calls": 0, "executed": 0, "coalesced": 0}
+        self._by_operation: Dict[str, int] = {}
+
+    async def do(self, key: Tuple[Any, ...], fn: Callable[[], Awaitable[Any]]) -> Any:
+        """key[0] is the operation name, used for the per-operation coalesced count."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._metrics["calls"] += 1
+            task = self._inflight.get(key)
+            if task is not None and task.get_loop() is loop and not task.done():
+                self._metrics["coalesced"] += 1
+                self._by_operation[key[0]] = self._by_operation.get(key[0], 0) + 1
+            else:
+                self._metrics["executed"] += 1
+                task = loop.create_task(fn())
+                self._inflight[key] = task
+                task.add_done_callback(lambda done, key=key: self._finish(key, done))
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task):
+        with self._lock:
+            if self._inflight.get(key) is task:
+                del self._inflight[key]
+        # Mark the exception retrieved even if every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._metrics)
+            stats["inflight"] = len(self._inflight)
+            stats["coalesced_by_operation"] = dict(self._by_operation)
+        stats["coalesced_ratio"] = round(stats["coalesced"] / stats["calls"], 4) if stats["calls"] else 0.0
+        return stats
+
+_single_flight: Optional[SingleFlight] = None
+
+def get_single_flight() -> SingleFlight:
+    """Process-wide, so calls from different requests (and providers) coalesce."""
+    global _single_flight
+    if _single_flight is None:
+        _single_flight = SingleFlight()
+    return _single_flight
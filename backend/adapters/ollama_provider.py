@@ -32,6 +32,21 @@ class OllamaProvider(AIProviderPort):
             # For now, let's re-raise to be handled by caller or fallback logic
             raise e
 
+    async def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        try:
+            async with httpx.AsyncClient(timeout=5.0 + len(texts)) as client:
+                payload = {
+                    "model": self.embedding_model,
+                    "input": texts
+                }
+                response = await client.post(f"{self.base_url}/api/embed", json=payload)
+                response.raise_for_status()
+                data = response.json()
+                return data["embeddings"]
+        except Exception as e:
+            print(f"[OllamaProvider] Error generating embeddings: {e}")
+            raise e
+
     async def synthesize(self, context: str, prompt_key: str) -> str:
         # Simple prompt construction for now
         # Ideally we load templates based on prompt_key
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Float, DateTime, ForeignKey, Text, Index, Boolean
+from sqlalchemy import Column, String, Integer, Float, DateTime, ForeignKey, Text, Index, Boolean, func, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from pgvector.sqlalchemy import Vector
 from sqlalchemy.orm import relationship, backref
@@ -34,6 +34,22 @@ class FragmentModel(Base):
     
     space = relationship("SpaceModel", back_populates="fragments")
 
+    __table_args__ = (
+        Index(
+            'idx_fragments_embedding', 
+            embedding, 
+            postgresql_using='hnsw', 
+            postgresql_with={'m': 16, 'ef_construction': 64},
+            postgresql_ops={'embedding': 'vector_cosine_ops'}
+        ),
+        # Full-text index; queries must use the same to_tsvector('simple', raw_text) expression
+        Index(
+            'idx_fragments_raw_text_fts',
+            text("to_tsvector('simple', raw_text)"),
+            postgresql_using='gin'
+        ),
+    )
+
 class IdeaModel(Base):
     __tablename__ = "ideas"
 
@@ -44,10 +60,15 @@ class IdeaModel(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
-    # Store the SemanticProfile as JSON
+    # SemanticProfile fields except the centroid (fragment_count, ...)
     semantic_profile = Column(JSONB, nullable=True)
-    # Searchable Vector (Syncs with Profile Centroid)
+    # The profile centroid; also the searchable vector
     embedding = Column(Vector(1536))
+    # Counters maintained by the repository in the same statement as the write they
+    # count (fragment link, version insert, fragment soft delete/restore)
+    fragment_count = Column(Integer, nullable=False, default=0, server_default="0")  # Non-deleted linked fragments
+    version_count = Column(Integer, nullable=False, default=0, server_default="0")
+    latest_version_number = Column(Integer, nullable=False, default=0, server_default="0")
     is_deleted = Column(Boolean, default=False)
     space_id = Column(UUID(as_uuid=True), ForeignKey("spaces.id"))
     language = Column(String(2), default="es")  # Language code: 'es' or 'en'
@@ -81,13 +102,78 @@ class IdeaVersionModel(Base):
 
     idea = relationship("IdeaModel", back_populates="versions")
 
-# Association Table for Idea <-> Fragment (Many-to-Many)
+    __table_args__ = (
+        # One number per version of an idea; also serves its history and latest version
+        Index('uq_idea_versions_idea_number', idea_id, version_number, unique=True),
+    )
+
+# Association Table for Idea <-> Fragment (Many-to-Many): the provenance of each idea.
+# Written by CognitivePipeline on CREATE_NEW and ATTACH (see PostgresRepository.link_fragment).
 class IdeaFragmentModel(Base):
     __tablename__ = "idea_fragments"
 
     idea_id = Column(UUID(as_uuid=True), ForeignKey("ideas.id"), primary_key=True)
     fragment_id = Column(UUID(as_uuid=True), ForeignKey("fragments.id"), primary_key=True)
 
+    # The (idea_id, fragment_id) primary key serves an idea's fragments; this serves
+    # the reverse lookup (which ideas a fragment fed)
+    __table_args__ = (
+        Index('idx_idea_fragments_fragment', fragment_id, idea_id),
+    )
+
+# Materialized knowledge-graph edges: each idea's k nearest neighbours in its space.
+# Maintained incrementally at ingest time (see PostgresRepository.update_idea_edges).
+class IdeaEdgeModel(Base):
+    __tablename__ = "idea_edges"
+
+    source_id = Column(UUID(as_uuid=True), ForeignKey("ideas.id", ondelete="CASCADE"), primary_key=True)
+    target_id = Column(UUID(as_uuid=True), ForeignKey("ideas.id", ondelete="CASCADE"), primary_key=True)
+    similarity = Column(Float, nullable=False)
+    updated_at = Column(DateTime, server_default=func.now())
+
+    __table_args__ = (
+        Index('idx_idea_edges_target', target_id),
+    )
+
+# Persistent tier of adapters/llm/embedding_cache.py; vector width depends on the model
+class EmbeddingCacheModel(Base):
+    __tablename__ = "embedding_cache"
+
+    content_hash = Column(String(64), primary_key=True)  # sha256(text) hex
+    provider = Column(String(50), primary_key=True)
+    model = Column(String(255), primary_key=True)
+    embedding = Column(Vector(), nullable=False)
+    created_at = Column(DateTime, server_default=func.now())
+    last_used_at = Column(DateTime, server_default=func.now())
+
+    __table_args__ = (
+        Index('idx_embedding_cache_last_used', last_used_at),
+    )
+
+class JobModel(Base):
+    __tablename__ = "jobs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    kind = Column(String(50), nullable=False)
+    payload = Column(JSONB, nullable=False, default={})
+    status = Column(String(20), nullable=False, default="queued")  # queued, running, succeeded, failed, cancelled
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    run_at = Column(DateTime, nullable=False, server_default=func.now())  # Earliest (re)try
+    locked_by = Column(String(255))
+    locked_at = Column(DateTime)
+    cancel_requested = Column(Boolean, nullable=False, default=False)
+    result = Column(JSONB)
+    error = Column(Text)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now())
+    finished_at = Column(DateTime)
+
+    __table_args__ = (
+        # Claim path: oldest runnable job; finished jobs stay out of the index
+        Index('idx_jobs_claim', run_at, postgresql_where=text("status IN ('queued', 'running')")),
+    )
+
 class DecisionLogModel(Base):
     __tablename__ = "decision_logs"
 
@@ -104,6 +190,10 @@ class DecisionLogModel(Base):
     # Store constraints or extra meta as JSON
     meta_data = Column(JSONB, nullable=True)
 
+    __table_args__ = (
+        Index('idx_decision_logs_target_idea', target_idea_id),
+    )
+
 class EditorialProfileModel(Base):
     __tablename__ = "editorial_profiles"
 
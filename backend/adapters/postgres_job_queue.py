@@ -0,0 +1,127 @@
+from datetime import timedelta
+from typing import Any, Dict, Optional
+from uuid import UUID
+from sqlalchemy import select, update, insert, func, and_, or_, case
+from sqlalchemy.orm import Session
+from domain.models import Job
+from ports.job_queue import JobQueuePort
+from infrastructure.database import commit_or_flush
+from adapters.orm import JobModel
+
+def lease_expired(lease_seconds: float):
+    return and_(JobModel.status == "running", JobModel.locked_at < func.now() - timedelta(seconds=lease_seconds))
+
+def claim_job_stmt(worker_id: str, lease_seconds: float):
+    """
+    Locks the oldest runnable job with FOR UPDATE SKIP LOCKED, so concurrent workers
+    each claim a different row without waiting on one another. Jobs with a pending
+    cancel are never claimed; cancel_abandoned_jobs_stmt finishes them instead.
+    """
+    runnable = select(JobModel.id).where(
+        or_(
+            and_(JobModel.status == "queued", JobModel.run_at <= func.now()),
+            lease_expired(lease_seconds)
+        ),
+        JobModel.cancel_requested.is_(False)
+    ).order_by(JobModel.run_at).limit(1).with_for_update(skip_locked=True).scalar_subquery()
+    return update(JobModel).where(JobModel.id == runnable).values(
+        status="running",
+        locked_by=worker_id,
+        locked_at=func.now(),
+        attempts=JobModel.attempts + 1,
+        updated_at=func.now()
+    ).returning(JobModel)
+
+def cancel_abandoned_jobs_stmt(lease_seconds: float):
+    """
+    Cancels jobs whose cancel was requested while running but that no worker will
+    finish: the worker died (lease expired) or handed the job back for a retry.
+    """
+    return update(JobModel).where(
+        JobModel.cancel_requested.is_(True),
+        or_(JobModel.status == "queued", lease_expired(lease_seconds))
+    ).values(
+        status="cancelled",
+        locked_by=None,
+        locked_at=None,
+        finished_at=func.now(),
+        updated_at=func.now()
+    )
+
+def owned_job(job_id: UUID, worker_id: str):
+    """Writes from a worker only land while it still holds the job's lease."""
+    return and_(JobModel.id == job_id, JobModel.locked_by == worker_id, JobModel.status == "running")
+
+class PostgresJobQueue(JobQueuePort):
+    def __init__(self, db: Session):
+        self.db = db
+
+    def enqueue(self, kind: str, payload: Dict[str, Any], max_attempts: int = 3) -> Job:
+        stmt = insert(JobModel).values(kind=kind, payload=payload, max_attempts=max_attempts).returning(JobModel)
+        job = Job.model_validate(self.db.execute(stmt).scalar_one())
+        commit_or_flush(self.db)
+        return job
+
+    def get(self, job_id: UUID) -> Optional[Job]:
+        result = self.db.execute(select(JobModel).where(JobModel.id == job_id)).scalar_one_or_none()
+        return Job.model_validate(result) if result else None
+
+    def cancel(self, job_id: UUID) -> Optional[Job]:
+        queued = JobModel.status == "queued"
+        stmt = update(JobModel).where(JobModel.id == job_id).values(
+            status=case((queued, "cancelled"), else_=JobModel.status),
+            finished_at=case((queued, func.now()), else_=JobModel.finished_at),
+            cancel_requested=case((JobModel.status == "running", True), else_=JobModel.cancel_requested),
+            updated_at=func.now()
+        ).returning(JobModel)
+        result = self.db.execute(stmt).scalar_one_or_none()
+        job = Job.model_validate(result) if result else None
+        commit_or_flush(self.db)
+        return job
+
+    def claim(self, worker_id: str, lease_seconds: float) -> Optional[Job]:
+        self.db.execute(cancel_abandoned_jobs_stmt(lease_seconds))
+        result = self.db.execute(claim_job_stmt(worker_id, lease_seconds)).scalar_one_or_none()
+        job = Job.model_validate(result) if result else None
+        commit_or_flush(self.db)
+        return job
+
+    def heartbeat(self, job_id: UUID, worker_id: str) -> bool:
+        stmt = update(JobModel).where(owned_job(job_id, worker_id))\
+               .values(locked_at=func.now())\
+               .returning(JobModel.cancel_requested)
+        cancel_requested = self.db.execute(stmt).scalar_one_or_none()
+        commit_or_flush(self.db)
+        return cancel_requested is False
+
+    def complete(self, job_id: UUID, worker_id: str, result: Dict[str, Any]) -> None:
+        self._finish(job_id, worker_id, status="succeeded", result=result, error=None)
+
+    def fail(self, job_id: UUID, worker_id: str, error: str, retry_in: Optional[float]) -> None:
+        if retry_in is None:
+            self._finish(job_id, worker_id, status="failed", error=error)
+            return
+        stmt = update(JobModel).where(owned_job(job_id, worker_id)).values(
+            status="queued",
+            error=error,
+            run_at=func.now() + timedelta(seconds=retry_in),
+            locked_by=None,
+            locked_at=None,
+            updated_at=func.now()
+        )
+        self.db.execute(stmt)
+        commit_or_flush(self.db)
+
+    def mark_cancelled(self, job_id: UUID, worker_id: str) -> None:
+        self._finish(job_id, worker_id, status="cancelled")
+
+    def _finish(self, job_id: UUID, worker_id: str, status: str, **values):
+        stmt = update(JobModel).where(owned_job(job_id, worker_id)).values(
+            status=status,
+            locked_at=None,
+            finished_at=func.now(),
+            updated_at=func.now(),
+            **values
+        )
+        self.db.execute(stmt)
+        commit_or_flush(self.db)
@@ -4,28 +4,29 @@ from typing import List, Optional
 from sqlalchemy.orm import Session
 from domain.events import DecisionResult
 from ports.decision_ledger import DecisionLedgerPort
+from infrastructure.database import commit_or_flush
 from adapters.orm import DecisionLogModel
 
+def decision_log_values(fragment, decision: DecisionResult) -> dict:
+    """Column values of the decision_logs row recording decision (shared by every ledger)."""
+    return {
+        "fragment_id": fragment.id,
+        "target_idea_id": decision.target_idea_id,
+        "action": decision.action.value,
+        "confidence": decision.confidence,
+        "rule_id": decision.rule_id,
+        "reasoning": decision.reasoning,
+        "meta_data": {"constraints": decision.constraints},
+        "timestamp": datetime.utcnow()
+    }
+
 class PostgresDecisionLedger(DecisionLedgerPort):
     def __init__(self, db_session: Session):
         self.db = db_session
 
     async def record_decision(self, fragment, decision: DecisionResult):
-        # fragment can be Fragment domain object, extract id
-        f_id = fragment.id
-        
-        log_entry = DecisionLogModel(
-            fragment_id=f_id,
-            target_idea_id=decision.target_idea_id,
-            action=decision.action.value,
-            confidence=decision.confidence,
-            rule_id=decision.rule_id,
-            reasoning=decision.reasoning,
-            meta_data={"constraints": decision.constraints},
-            timestamp=datetime.utcnow()
-        )
-        self.db.add(log_entry)
-        self.db.commit()
+        self.db.add(DecisionLogModel(**decision_log_values(fragment, decision)))
+        commit_or_flush(self.db)
 
     async def get_decision_history(self, fragment_id: UUID) -> List[dict]:
         # For replayability/audit
@@ -1,17 +1,414 @@
-from typing import List, Optional, Tuple, Any
+from typing import List, Optional, Tuple, Any, AsyncIterator
 from uuid import UUID
-from sqlalchemy.orm import Session, selectinload
-from sqlalchemy import select, update, delete
-from domain.models import Fragment, Idea, IdeaVersion, Space, Product, ProductSection
+from sqlalchemy.orm import Session, selectinload, aliased
+from sqlalchemy import select, update, delete, insert, text, true, func, literal, literal_column, and_, case
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert as pg_insert
+from domain.services.maturity_calculator import MaturityCalculator
+from domain.semantic import SemanticProfile
+from domain.models import Fragment, Idea, IdeaVersion, IdeaGraphNode, IdeaMaturityStats, IdeaSourceContent, RetrievalHit, Space, Product, ProductSection
 from ports.repository import RepositoryPort
-from adapters.orm import FragmentModel, IdeaModel, IdeaVersionModel, DecisionLogModel, SpaceModel, ProductModel, ProductSectionModel, EditorialProfileModel
+from infrastructure.database import commit_or_flush, unit_of_work
+from adapters.orm import FragmentModel, IdeaModel, IdeaVersionModel, DecisionLogModel, IdeaFragmentModel, SpaceModel, ProductModel, ProductSectionModel, EditorialProfileModel, IdeaEdgeModel
 import uuid
+from contextlib import asynccontextmanager
 from datetime import datetime
 
+# --- SHARED STATEMENTS (sync and async repositories) ---
+
+def idea_from_model(model: IdeaModel) -> Idea:
+    """
+    Rebuilds the SemanticProfile from the embedding column (the centroid, already
+    float32 from pgvector) and the semantic_profile JSON (its count and metadata).
+    """
+    profile = None
+    if model.embedding is not None:
+        metadata = dict(model.semantic_profile or {})
+        metadata.pop("centroid", None)  # Rows written before the JSON copy was dropped
+        profile = SemanticProfile(centroid=model.embedding, **metadata)
+    fields = {name: getattr(model, name) for name in Idea.model_fields if name != "semantic_profile" and hasattr(model, name)}
+    return Idea(semantic_profile=profile, **fields)
+
+def idea_profile_values(idea: Idea) -> dict:
+    """Column values for an idea's profile: the centroid as the vector, the rest as JSON."""
+    if not idea.semantic_profile:
+        return {"semantic_profile": None, "embedding": None}
+    return {"semantic_profile": idea.semantic_profile.storage_metadata(), "embedding": idea.semantic_profile.centroid}
+
+def lock_idea_stmt(idea_id: UUID):
+    """
+    The idea row, locked until the transaction ends. populate_existing refreshes an
+    instance the session already holds, so the caller sees the latest committed state.
+    """
+    return select(IdeaModel)\
+           .where(IdeaModel.id == idea_id, IdeaModel.is_deleted == False)\
+           .with_for_update()\
+           .execution_options(populate_existing=True)
+
+def idea_profile_update_stmt(idea: Idea):
+    return update(IdeaModel).where(IdeaModel.id == idea.id).values(**idea_profile_values(idea))
+
+def graph_nodes_stmt(space_id: Optional[UUID], limit: int, offset: int):
+    stmt = select(
+        IdeaModel.id,
+        IdeaModel.title_provisional,
+        IdeaModel.status,
+        IdeaModel.domain,
+        IdeaModel.fragment_count
+    ).where(IdeaModel.is_deleted == False)
+    if space_id:
+        stmt = stmt.where(IdeaModel.space_id == space_id)
+    return stmt.order_by(IdeaModel.created_at, IdeaModel.id).limit(limit).offset(offset)
+
+def graph_edges_stmt(idea_ids: List[UUID], k: int, min_similarity: float, space_id: Optional[UUID]):
+    """
+    LATERAL kNN join: for every source idea, ORDER BY <=> LIMIT k is answered
+    by idx_ideas_embedding instead of comparing against every idea in Python.
+    """
+    src = select(IdeaModel.id, IdeaModel.space_id, IdeaModel.embedding)\
+          .where(IdeaModel.id.in_(idea_ids), IdeaModel.embedding.isnot(None))\
+          .subquery("src")
+
+    neighbour = aliased(IdeaModel, name="neighbour")
+    distance = neighbour.embedding.cosine_distance(src.c.embedding)
+    knn = select(neighbour.id.label("target_id"), distance.label("distance"))\
+          .where(neighbour.is_deleted == False, neighbour.id != src.c.id, neighbour.embedding.isnot(None))
+    if space_id:
+        knn = knn.where(neighbour.space_id == space_id)
+    else:
+        knn = knn.where(neighbour.space_id.is_not_distinct_from(src.c.space_id))
+    knn = knn.order_by(distance).limit(k).lateral("knn")
+
+    return select(src.c.id, knn.c.target_id, (1 - knn.c.distance).label("similarity"))\
+           .select_from(src.join(knn, true()))\
+           .where(knn.c.distance <= 1 - min_similarity)
+
+def maturity_score_expr(fragment_count, version_count, created_at, domain):
+    """MaturityCalculator.score as a SQL expression (created_at is naive UTC)."""
+    mc = MaturityCalculator
+    days_old = func.floor(func.extract("epoch", func.timezone("utc", func.now()) - created_at) / 86400)
+    return func.least(
+        func.least(fragment_count * mc.FRAGMENT_POINTS, mc.FRAGMENT_MAX)
+        + func.least(version_count * mc.VERSION_POINTS, mc.VERSION_MAX)
+        + func.least(days_old * mc.AGE_POINTS_PER_DAY, mc.AGE_MAX)
+        + case((and_(domain.isnot(None), domain != "", domain != mc.UNCLASSIFIED_DOMAIN), mc.DOMAIN_POINTS), else_=0),
+        100
+    )
+
+def idea_maturity_stats_stmt(space_id: Optional[UUID], min_score: Optional[int] = None):
+    """
+    Fragment and version counters of every idea (columns on ideas, no joins).
+    min_score keeps only ideas whose maturity score is >= min_score.
+    """
+    stmt = select(
+        IdeaModel.id,
+        IdeaModel.title_provisional,
+        IdeaModel.domain,
+        IdeaModel.created_at,
+        IdeaModel.fragment_count,
+        IdeaModel.version_count
+    ).where(IdeaModel.is_deleted == False)
+    if space_id:
+        stmt = stmt.where(IdeaModel.space_id == space_id)
+    if min_score is not None:
+        stmt = stmt.where(maturity_score_expr(IdeaModel.fragment_count, IdeaModel.version_count, IdeaModel.created_at, IdeaModel.domain) >= min_score)
+    return stmt
+
+def idea_sources_stmt(idea_ids: List[UUID]):
+    """
+    Latest synthesized text per idea, else its non-deleted fragments (oldest first).
+    Both are correlated subqueries: COALESCE only runs the fragment aggregate for
+    ideas without a synthesized version.
+    """
+    latest_text = select(IdeaVersionModel.synthesized_text)\
+                  .where(IdeaVersionModel.idea_id == IdeaModel.id)\
+                  .order_by(IdeaVersionModel.version_number.desc())\
+                  .limit(1)\
+                  .scalar_subquery()
+    attached = select(IdeaFragmentModel.fragment_id)\
+               .where(IdeaFragmentModel.idea_id == IdeaModel.id)\
+               .correlate(IdeaModel)
+    fragments_text = select(func.string_agg(FragmentModel.raw_text, aggregate_order_by(literal("\n"), FragmentModel.created_at, FragmentModel.id)))\
+                     .where(FragmentModel.id.in_(attached), FragmentModel.is_deleted == False)\
+                     .scalar_subquery()
+    return select(
+        IdeaModel.id,
+        IdeaModel.title_provisional,
+        func.coalesce(latest_text, fragments_text).label("content")
+    ).where(IdeaModel.id.in_(idea_ids), IdeaModel.is_deleted == False)
+
+def idea_sources_in_order(idea_ids: List[UUID], rows) -> List[IdeaSourceContent]:
+    by_id = {row.id: IdeaSourceContent.model_validate(row._mapping) for row in rows}
+    return [by_id[idea_id] for idea_id in dict.fromkeys(idea_ids) if idea_id in by_id]
+
+# Counter maintenance is not an edit of the idea: overrides the column's onupdate
+KEEP_UPDATED_AT = {"updated_at": IdeaModel.updated_at}
+
+def link_fragment_stmt(idea_id: UUID, fragment_id: UUID):
+    """
+    Links the pair and bumps the idea's fragment_count in one statement. Idempotent:
+    re-linking a pair (a retried ingest) inserts nothing and so counts nothing.
+    """
+    linked = pg_insert(IdeaFragmentModel).values(idea_id=idea_id, fragment_id=fragment_id)\
+             .on_conflict_do_nothing(index_elements=[IdeaFragmentModel.idea_id, IdeaFragmentModel.fragment_id])\
+             .returning(IdeaFragmentModel.idea_id)\
+             .cte("linked")
+    return update(IdeaModel).where(IdeaModel.id == linked.c.idea_id)\
+           .values(fragment_count=IdeaModel.fragment_count + 1, **KEEP_UPDATED_AT)
+
+def fragments_by_idea_stmt(idea_id: UUID, limit: Optional[int] = None):
+    stmt = select(FragmentModel).join(IdeaFragmentModel, IdeaFragmentModel.fragment_id == FragmentModel.id)\
+           .where(IdeaFragmentModel.idea_id == idea_id, FragmentModel.is_deleted == False)\
+           .order_by(FragmentModel.created_at, FragmentModel.id)
+    return stmt.limit(limit) if limit is not None else stmt
+
+def save_idea_version_stmt(version: IdeaVersion):
+    """Inserts the version and bumps the idea's version counters in one statement."""
+    inserted = insert(IdeaVersionModel).values(
+        id=version.id,
+        idea_id=version.idea_id,
+        version_number=version.version_number,
+        stage=version.stage,
+        synthesized_text=version.synthesized_text,
+        reasoning_log=version.reasoning_log,
+        created_at=version.created_at
+    ).returning(IdeaVersionModel.idea_id, IdeaVersionModel.version_number).cte("inserted")
+    return update(IdeaModel).where(IdeaModel.id == inserted.c.idea_id).values(
+        version_count=IdeaModel.version_count + 1,
+        latest_version_number=func.greatest(IdeaModel.latest_version_number, inserted.c.version_number),
+        **KEEP_UPDATED_AT
+    )
+
+def append_idea_version_stmt(version: IdeaVersion):
+    """
+    Allocates the idea's next version number and inserts the version with it, in one
+    statement. The counter UPDATE takes the idea's row lock, so concurrent appends to
+    one idea queue on it and each one gets its own number; nothing is read first.
+    """
+    allocated = update(IdeaModel).where(IdeaModel.id == version.idea_id).values(
+        latest_version_number=IdeaModel.latest_version_number + 1,
+        version_count=IdeaModel.version_count + 1,
+        **KEEP_UPDATED_AT
+    ).returning(IdeaModel.id, IdeaModel.latest_version_number).cte("allocated")
+    values = {
+        "id": version.id,
+        "stage": version.stage,
+        "synthesized_text": version.synthesized_text,
+        "reasoning_log": version.reasoning_log,
+        "created_at": version.created_at
+    }
+    row = select(
+        allocated.c.id,
+        allocated.c.latest_version_number,
+        *[literal(value, IdeaVersionModel.__table__.c[name].type) for name, value in values.items()]
+    )
+    return insert(IdeaVersionModel).from_select(["idea_id", "version_number", *values], row)\
+           .returning(IdeaVersionModel.version_number)
+
+def latest_version_stmt(idea_id: UUID):
+    """Point lookup on (idea_id, version_number) via the idea's latest_version_number."""
+    latest_number = select(IdeaModel.latest_version_number).where(IdeaModel.id == idea_id).scalar_subquery()
+    return select(IdeaVersionModel).where(
+        IdeaVersionModel.idea_id == idea_id,
+        IdeaVersionModel.version_number == latest_number
+    ).limit(1)
+
+def set_fragments_deleted_stmt(fragment_ids: List[UUID], deleted: bool):
+    """
+    Sets is_deleted and returns each matched fragment with its previous flag, so
+    the caller can adjust the counters of exactly the fragments that changed state.
+    """
+    previous = select(FragmentModel.id, FragmentModel.is_deleted)\
+               .where(FragmentModel.id.in_(fragment_ids))\
+               .with_for_update()\
+               .cte("previous")
+    return update(FragmentModel).where(FragmentModel.id == previous.c.id)\
+           .values(is_deleted=deleted)\
+           .returning(FragmentModel.id, previous.c.is_deleted.label("was_deleted"))
+
+def changed_fragment_ids(rows, deleted: bool) -> List[UUID]:
+    return [row.id for row in rows if bool(row.was_deleted) != deleted]
+
+def shift_fragment_counts_stmt(fragment_ids: List[UUID], delta: int):
+    """Adds delta to fragment_count of every idea linked to the fragments, once per link."""
+    links = select(IdeaFragmentModel.idea_id, func.count().label("links"))\
+            .where(IdeaFragmentModel.fragment_id.in_(fragment_ids))\
+            .group_by(IdeaFragmentModel.idea_id)\
+            .subquery("links")
+    return update(IdeaModel).where(IdeaModel.id == links.c.idea_id)\
+           .values(fragment_count=IdeaModel.fragment_count + delta * links.c.links, **KEEP_UPDATED_AT)
+
+def recount_idea_counters_stmt():
+    """Recomputes every idea's counters from idea_fragments and idea_versions (backfills, repairs)."""
+    fragment_count = select(func.count())\
+                     .select_from(IdeaFragmentModel)\
+                     .join(FragmentModel, FragmentModel.id == IdeaFragmentModel.fragment_id)\
+                     .where(IdeaFragmentModel.idea_id == IdeaModel.id, FragmentModel.is_deleted == False)\
+                     .scalar_subquery()
+    version_count = select(func.count()).where(IdeaVersionModel.idea_id == IdeaModel.id).scalar_subquery()
+    latest_number = select(func.coalesce(func.max(IdeaVersionModel.version_number), 0))\
+                    .where(IdeaVersionModel.idea_id == IdeaModel.id)\
+                    .scalar_subquery()
+    return update(IdeaModel).values(
+        fragment_count=fragment_count,
+        version_count=version_count,
+        latest_version_number=latest_number,
+        **KEEP_UPDATED_AT
+    )
+
+def backfill_idea_fragments_stmt():
+    """
+    Links recorded in the ledger before idea_fragments was maintained: the
+    CREATE_NEW/ATTACH decisions whose fragment and idea still exist.
+    """
+    linked = select(DecisionLogModel.target_idea_id, DecisionLogModel.fragment_id)\
+             .join(FragmentModel, FragmentModel.id == DecisionLogModel.fragment_id)\
+             .join(IdeaModel, IdeaModel.id == DecisionLogModel.target_idea_id)\
+             .where(DecisionLogModel.action.in_(["CREATE_NEW", "ATTACH"]))\
+             .distinct()
+    return pg_insert(IdeaFragmentModel).from_select(["idea_id", "fragment_id"], linked)\
+           .on_conflict_do_nothing(index_elements=[IdeaFragmentModel.idea_id, IdeaFragmentModel.fragment_id])
+
+def count_fragments_stmt(space_id: Optional[UUID]):
+    stmt = select(func.count()).select_from(FragmentModel).where(FragmentModel.is_deleted == False)
+    if space_id:
+        stmt = stmt.where(FragmentModel.space_id == space_id)
+    return stmt
+
+# Neighbours materialized per idea in idea_edges; reads can ask for any k up to this
+IDEA_EDGES_K = 10
+IDEA_EDGES_MIN_SIMILARITY = 0.0
+
+def stored_graph_edges_stmt(idea_ids: List[UUID], k: int, min_similarity: float):
+    ranked = select(
+        IdeaEdgeModel.source_id,
+        IdeaEdgeModel.target_id,
+        IdeaEdgeModel.similarity,
+        func.row_number().over(partition_by=IdeaEdgeModel.source_id, order_by=IdeaEdgeModel.similarity.desc()).label("rank")
+    ).join(IdeaModel, IdeaModel.id == IdeaEdgeModel.target_id)\
+     .where(IdeaEdgeModel.source_id.in_(idea_ids), IdeaModel.is_deleted == False, IdeaEdgeModel.similarity >= min_similarity)\
+     .subquery("ranked")
+    return select(ranked.c.source_id, ranked.c.target_id, ranked.c.similarity).where(ranked.c.rank <= k)
+
+def refresh_idea_edges_stmts(idea_ids: List[UUID]):
+    """
+    DELETE + INSERT ... SELECT (LATERAL kNN) replacing the stored neighbours of idea_ids.
+    The insert upserts: a concurrent refresh of an overlapping neighbourhood may have
+    re-inserted the same pair after our delete.
+    """
+    knn = graph_edges_stmt(idea_ids, IDEA_EDGES_K, IDEA_EDGES_MIN_SIMILARITY, None)
+    upsert = pg_insert(IdeaEdgeModel).from_select(["source_id", "target_id", "similarity"], knn)
+    return (
+        delete(IdeaEdgeModel).where(IdeaEdgeModel.source_id.in_(idea_ids)),
+        upsert.on_conflict_do_update(
+            index_elements=[IdeaEdgeModel.source_id, IdeaEdgeModel.target_id],
+            set_={"similarity": upsert.excluded.similarity, "updated_at": func.now()}
+        )
+    )
+
+def idea_edges_exist_stmt():
+    return select(select(IdeaEdgeModel.source_id).limit(1).exists())
+
+def idea_edge_neighbours_stmt(idea_id: UUID):
+    # Ideas linked to idea_id in either direction
+    return select(IdeaEdgeModel.source_id).where(IdeaEdgeModel.target_id == idea_id)\
+           .union(select(IdeaEdgeModel.target_id).where(IdeaEdgeModel.source_id == idea_id))
+
+def search_fragments_stmt(vector: List[float], limit: int, space_id: Optional[UUID]):
+    distance_expr = FragmentModel.embedding.cosine_distance(vector).label("distance")
+    stmt = select(FragmentModel, distance_expr)\
+           .where(FragmentModel.is_deleted == False, FragmentModel.embedding.isnot(None))
+    if space_id:
+        stmt = stmt.where(FragmentModel.space_id == space_id)
+    return stmt.order_by(distance_expr).limit(limit)
+
+# Lexical side of retrieval; must match idx_fragments_raw_text_fts expression-for-expression
+FTS_CONFIG = literal_column("'simple'")
+RRF_K = 60
+
+def fragment_tsvector():
+    return func.to_tsvector(FTS_CONFIG, FragmentModel.raw_text)
+
+def fragment_tsquery(query: str):
+    return func.websearch_to_tsquery(FTS_CONFIG, query)
+
+def search_knowledge_stmt(query: str, space_id: Optional[UUID], limit: int):
+    tsquery = fragment_tsquery(query)
+    stmt = select(FragmentModel)\
+           .where(fragment_tsvector().op("@@")(tsquery), FragmentModel.is_deleted == False)
+    if space_id:
+        stmt = stmt.where(FragmentModel.space_id == space_id)
+    return stmt.order_by(func.ts_rank_cd(fragment_tsvector(), tsquery).desc()).limit(limit)
+
+def hybrid_search_stmt(query: str, vector: List[float], limit: int, space_id: Optional[UUID],
+                       lexical_weight: float, semantic_weight: float, pool: int):
+    """
+    Reciprocal-rank fusion of two index-backed candidate lists of `pool` rows each:
+    full-text matches (GIN on to_tsvector) and nearest embeddings (HNSW).
+    score = lexical_weight / (RRF_K + lexical_rank) + semantic_weight / (RRF_K + semantic_rank)
+    """
+    tsquery = fragment_tsquery(query)
+    lexical_hits = select(FragmentModel.id, func.ts_rank_cd(fragment_tsvector(), tsquery).label("rank_score"))\
+                   .where(fragment_tsvector().op("@@")(tsquery), FragmentModel.is_deleted == False)
+    distance = FragmentModel.embedding.cosine_distance(vector)
+    semantic_hits = select(FragmentModel.id, distance.label("distance"))\
+                    .where(FragmentModel.is_deleted == False, FragmentModel.embedding.isnot(None))
+    if space_id:
+        lexical_hits = lexical_hits.where(FragmentModel.space_id == space_id)
+        semantic_hits = semantic_hits.where(FragmentModel.space_id == space_id)
+    lexical_hits = lexical_hits.order_by(literal_column("rank_score").desc()).limit(pool).subquery("lexical_hits")
+    semantic_hits = semantic_hits.order_by(distance).limit(pool).subquery("semantic_hits")
+
+    lexical = select(
+        lexical_hits.c.id,
+        func.row_number().over(order_by=lexical_hits.c.rank_score.desc()).label("rank")
+    ).subquery("lexical")
+    semantic = select(
+        semantic_hits.c.id,
+        func.row_number().over(order_by=semantic_hits.c.distance).label("rank")
+    ).subquery("semantic")
+
+    fragment_id = func.coalesce(lexical.c.id, semantic.c.id)
+    score = func.coalesce(lexical_weight / (RRF_K + lexical.c.rank), 0.0) \
+          + func.coalesce(semantic_weight / (RRF_K + semantic.c.rank), 0.0)
+    fused = select(
+        fragment_id.label("id"),
+        score.label("score"),
+        lexical.c.rank.label("lexical_rank"),
+        semantic.c.rank.label("semantic_rank")
+    ).select_from(lexical.outerjoin(semantic, lexical.c.id == semantic.c.id, full=True))\
+     .order_by(score.desc()).limit(limit).subquery("fused")
+
+    similarity = func.coalesce(1 - FragmentModel.embedding.cosine_distance(vector), 0.0)
+    return select(FragmentModel, fused.c.score, similarity.label("similarity"), fused.c.lexical_rank, fused.c.semantic_rank)\
+           .join(fused, fused.c.id == FragmentModel.id)\
+           .order_by(fused.c.score.desc())
+
+def hybrid_pool(limit: int) -> int:
+    # Candidates per list; fusion can only promote what either list returned
+    return max(limit * 4, 40)
+
+def retrieval_hit(row) -> RetrievalHit:
+    return RetrievalHit(
+        fragment=Fragment.model_validate(row[0]),
+        score=float(row.score),
+        similarity=float(row.similarity),
+        lexical_rank=row.lexical_rank,
+        semantic_rank=row.semantic_rank
+    )
+
+def hnsw_ef_search_stmt(k: int):
+    # Default ef_search (40) can return fewer than k rows once the space filter applies
+    return text(f"SET LOCAL hnsw.ef_search = {min(1000, max(40, int(k) * 10))}")
+
 class PostgresRepository(RepositoryPort):
     def __init__(self, db: Session):
         self.db = db
 
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[None]:
+        with unit_of_work(self.db):
+            yield
+
     async def save_fragment(self, fragment: Fragment) -> Fragment:
         db_fragment = FragmentModel(
             id=fragment.id,
@@ -22,7 +419,7 @@ class PostgresRepository(RepositoryPort):
             space_id=fragment.space_id
         )
         self.db.add(db_fragment)
-        self.db.commit()
+        commit_or_flush(self.db)
         self.db.refresh(db_fragment)
         return fragment
 
@@ -48,7 +445,7 @@ class PostgresRepository(RepositoryPort):
             color=color
         )
         self.db.add(space)
-        self.db.commit()
+        commit_or_flush(self.db)
         self.db.refresh(space)
         return Space.model_validate(space)
 
@@ -62,7 +459,7 @@ class PostgresRepository(RepositoryPort):
             existing.description = space.description
             existing.icon = space.icon
             existing.color = space.color
-            self.db.commit()
+            commit_or_flush(self.db)
             self.db.refresh(existing)
             return Space.model_validate(existing)
         else:
@@ -74,7 +471,7 @@ class PostgresRepository(RepositoryPort):
         space = self.db.execute(stmt).scalar_one_or_none()
         if space:
             self.db.delete(space)
-            self.db.commit()
+            commit_or_flush(self.db)
             return True
         return False
     # --- END SPACES ---
@@ -93,7 +490,7 @@ class PostgresRepository(RepositoryPort):
             updated_at=product.updated_at
         )
         self.db.add(db_product)
-        self.db.commit()
+        commit_or_flush(self.db)
         return product
 
     def get_product(self, product_id: UUID) -> Optional[Product]:
@@ -134,7 +531,7 @@ class PostgresRepository(RepositoryPort):
             )
         )
         self.db.execute(stmt)
-        self.db.commit()
+        commit_or_flush(self.db)
         return self.get_product(product.id)
     
     def list_products(self, space_id: UUID) -> List[Product]:
@@ -145,7 +542,7 @@ class PostgresRepository(RepositoryPort):
     def update_product_status(self, product_id: UUID, status: str) -> bool:
         stmt = update(ProductModel).where(ProductModel.id == product_id).values(status=status)
         result = self.db.execute(stmt)
-        self.db.commit()
+        commit_or_flush(self.db)
         return result.rowcount > 0
 
     def delete_product(self, product_id: UUID) -> bool:
@@ -153,7 +550,7 @@ class PostgresRepository(RepositoryPort):
         product = self.db.execute(stmt).scalar_one_or_none()
         if product:
             self.db.delete(product)
-            self.db.commit()
+            commit_or_flush(self.db)
             return True
         return False
 
@@ -170,7 +567,7 @@ class PostgresRepository(RepositoryPort):
             updated_at=section.updated_at
         )
         self.db.add(section_model)
-        self.db.commit()
+        commit_or_flush(self.db)
         self.db.refresh(section_model)
         return ProductSection.model_validate(section_model)
     
@@ -184,7 +581,7 @@ class PostgresRepository(RepositoryPort):
         # Delete the section itself
         stmt = delete(ProductSectionModel).where(ProductSectionModel.id == section_id)
         result = self.db.execute(stmt)
-        self.db.commit()
+        commit_or_flush(self.db)
         
         return result.rowcount > 0
         
@@ -209,7 +606,7 @@ class PostgresRepository(RepositoryPort):
             )
         )
         self.db.execute(stmt)
-        self.db.commit()
+        commit_or_flush(self.db)
         
         # Return updated section
         return self.get_section(section.id)
@@ -221,23 +618,12 @@ class PostgresRepository(RepositoryPort):
             updated_at=datetime.utcnow()
         )
         result = self.db.execute(stmt)
-        self.db.commit()
+        commit_or_flush(self.db)
         return result.rowcount > 0
 
     async def search_knowledge(self, query: str, space_id: UUID = None, limit: int = 10) -> List[Any]:
-        # Using vector search logic similar to search_candidates but possibly using query embedding if available
-        # checking if we have an embedding service here... 
-        # Actually Repository usually doesn't generate embeddings.
-        # It should receive the vector. 
-        # For text search, we can use ILIKE for now as a fallback or if pg_trgm is enabled.
-        # Assuming hybrid search is Phase 14, let's use Simple Like for now for the prototype
-        stmt = select(FragmentModel).where(FragmentModel.raw_text.ilike(f"%{query}%"), FragmentModel.is_deleted == False)
-        if space_id:
-            stmt = stmt.where(FragmentModel.space_id == space_id)
-        stmt = stmt.limit(limit)
-        results = self.db.execute(stmt).scalars().all()
-        # Mapping result to a simple object for consumption
-        # Or return Fragments
+        # Lexical only (GIN full-text index); hybrid_search adds the vector side
+        results = self.db.execute(search_knowledge_stmt(query, space_id, limit)).scalars().all()
         return [Fragment.model_validate(r) for r in results]
 
     # --- END PRODUCTS ---
@@ -257,37 +643,56 @@ class PostgresRepository(RepositoryPort):
         results = self.db.execute(stmt).scalars().all()
         return [Fragment.model_validate(r) for r in results]
 
-    async def list_fragments_by_idea(self, idea_id: UUID) -> List[Fragment]:
-        # Join Fragments with DecisionLogs to find those attached to this Idea
-        stmt = select(FragmentModel).join(DecisionLogModel, FragmentModel.id == DecisionLogModel.fragment_id)\
-               .where(DecisionLogModel.target_idea_id == idea_id, FragmentModel.is_deleted == False)\
-               .distinct()
-        results = self.db.execute(stmt).scalars().all()
+    async def count_fragments(self, space_id: Optional[UUID] = None) -> int:
+        return self.db.execute(count_fragments_stmt(space_id)).scalar_one()
+
+    async def list_idea_maturity_stats(self, space_id: Optional[UUID] = None, min_score: Optional[int] = None) -> List[IdeaMaturityStats]:
+        rows = self.db.execute(idea_maturity_stats_stmt(space_id, min_score)).all()
+        return [IdeaMaturityStats.model_validate(row._mapping) for row in rows]
+
+    async def list_idea_sources(self, idea_ids: List[UUID]) -> List[IdeaSourceContent]:
+        if not idea_ids:
+            return []
+        rows = self.db.execute(idea_sources_stmt(idea_ids)).all()
+        return idea_sources_in_order(idea_ids, rows)
+
+    async def list_fragments_by_idea(self, idea_id: UUID, limit: Optional[int] = None) -> List[Fragment]:
+        results = self.db.execute(fragments_by_idea_stmt(idea_id, limit)).scalars().all()
         return [Fragment.model_validate(r) for r in results]
 
+    async def link_fragment(self, idea_id: UUID, fragment_id: UUID) -> None:
+        self.db.execute(link_fragment_stmt(idea_id, fragment_id))
+        commit_or_flush(self.db)
+
+    async def backfill_idea_fragments(self) -> int:
+        result = self.db.execute(backfill_idea_fragments_stmt())
+        commit_or_flush(self.db)
+        return result.rowcount
+
+    async def recount_idea_counters(self) -> int:
+        result = self.db.execute(recount_idea_counters_stmt())
+        commit_or_flush(self.db)
+        return result.rowcount
+
     async def save_idea(self, idea: Idea) -> Idea:
         stmt = select(IdeaModel).where(IdeaModel.id == idea.id)
         existing = self.db.execute(stmt).scalar_one_or_none()
         
-        # Serialize Profile
-        profile_json = idea.semantic_profile.model_dump() if idea.semantic_profile else None
-        
-        # NOTE: For Vector Search to work on Idea level, we need a Vector Column on IdeaModel too.
-        # But our Profile is JSON. 
-        # Strategy: We sync the 'centroid' from profile to the 'embedding' column for index search.
-        embedding_val = idea.semantic_profile.centroid if idea.semantic_profile else None
+        # The centroid lives only in the 'embedding' column (also used for index search);
+        # semantic_profile keeps the count
+        profile = idea_profile_values(idea)
         
         if existing:
             existing.title_provisional = idea.title_provisional
             existing.domain = idea.domain
             existing.status = idea.status
             existing.updated_at = idea.updated_at
-            existing.semantic_profile = profile_json
-            existing.embedding = embedding_val # SYNCED
+            existing.semantic_profile = profile["semantic_profile"]
+            existing.embedding = profile["embedding"]
             
-            self.db.commit()
+            commit_or_flush(self.db)
             self.db.refresh(existing)
-            return Idea.model_validate(existing)
+            return idea_from_model(existing)
         else:
             db_idea = IdeaModel(
                 id=idea.id,
@@ -296,12 +701,12 @@ class PostgresRepository(RepositoryPort):
                 status=idea.status,
                 created_at=idea.created_at,
                 updated_at=idea.updated_at,
-                semantic_profile=profile_json,
-                embedding=embedding_val, # SYNCED
+                semantic_profile=profile["semantic_profile"],
+                embedding=profile["embedding"],
                 space_id=idea.space_id
             )
             self.db.add(db_idea)
-            self.db.commit()
+            commit_or_flush(self.db)
             self.db.refresh(db_idea)
             return idea
 
@@ -310,24 +715,41 @@ class PostgresRepository(RepositoryPort):
         result = self.db.execute(stmt).scalar_one_or_none()
         if result:
             # Pydantic should auto-deserialize JSONB to SemanticProfile based on type hint in model
-            return Idea.model_validate(result)
+            return idea_from_model(result)
         return None
 
+    async def update_idea_profile(self, idea_id: UUID, vector: List[float]) -> Optional[Idea]:
+        # Read-modify-write under the row lock: concurrent updates to the idea queue
+        # here and each applies its vector to the profile the previous one wrote
+        async with self.transaction():
+            model = self.db.execute(lock_idea_stmt(idea_id)).scalar_one_or_none()
+            if model is None:
+                return None
+            idea = idea_from_model(model)
+            if idea.semantic_profile is None:
+                return idea
+            idea.semantic_profile = idea.semantic_profile.update(vector)
+            self.db.execute(idea_profile_update_stmt(idea))
+        return idea
+
+    async def update_idea_status(self, idea_id: UUID, status: str) -> bool:
+        stmt = update(IdeaModel).where(IdeaModel.id == idea_id).values(status=status, updated_at=datetime.utcnow())
+        result = self.db.execute(stmt)
+        commit_or_flush(self.db)
+        return result.rowcount > 0
+
     async def save_idea_version(self, version: IdeaVersion) -> IdeaVersion:
-        db_version = IdeaVersionModel(
-            id=version.id,
-            idea_id=version.idea_id,
-            version_number=version.version_number,
-            stage=version.stage,
-            synthesized_text=version.synthesized_text,
-            reasoning_log=version.reasoning_log,
-            created_at=version.created_at
-        )
-        self.db.add(db_version)
-        self.db.commit()
-        self.db.refresh(db_version)
+        self.db.execute(save_idea_version_stmt(version))
+        commit_or_flush(self.db)
         return version
 
+    async def append_idea_version(self, version: IdeaVersion) -> Optional[IdeaVersion]:
+        number = self.db.execute(append_idea_version_stmt(version)).scalar_one_or_none()
+        if number is None:
+            return None
+        commit_or_flush(self.db)
+        return version.model_copy(update={"version_number": number})
+
     async def list_ideas(self, status: Optional[str] = None, space_id: Optional[UUID] = None) -> List[Idea]:
         stmt = select(IdeaModel).where(IdeaModel.is_deleted == False)
         if status:
@@ -336,14 +758,10 @@ class PostgresRepository(RepositoryPort):
             stmt = stmt.where(IdeaModel.space_id == space_id)
         
         results = self.db.execute(stmt).scalars().all()
-        return [Idea.model_validate(r) for r in results]
+        return [idea_from_model(r) for r in results]
 
     async def get_latest_version(self, idea_id: UUID) -> Optional[IdeaVersion]:
-        stmt = select(IdeaVersionModel)\
-               .where(IdeaVersionModel.idea_id == idea_id)\
-               .order_by(IdeaVersionModel.version_number.desc())\
-               .limit(1)
-        result = self.db.execute(stmt).scalar_one_or_none()
+        result = self.db.execute(latest_version_stmt(idea_id)).scalar_one_or_none()
         if result:
             return IdeaVersion.model_validate(result)
         return None
@@ -375,36 +793,93 @@ class PostgresRepository(RepositoryPort):
             idea_model = row[0]
             dist = row[1]
             sim = 1.0 - dist
-            candidates.append((Idea.model_validate(idea_model), sim))
+            candidates.append((idea_from_model(idea_model), sim))
         
         return candidates
 
+    async def list_graph_nodes(self, space_id: Optional[UUID] = None, limit: int = 500, offset: int = 0) -> List[IdeaGraphNode]:
+        rows = self.db.execute(graph_nodes_stmt(space_id, limit, offset)).all()
+        return [
+            IdeaGraphNode(
+                id=row.id,
+                title_provisional=row.title_provisional,
+                status=row.status or "germinal",
+                domain=row.domain,
+                fragment_count=row.fragment_count or 0
+            )
+            for row in rows
+        ]
+
+    async def list_graph_edges(self, idea_ids: List[UUID], k: int = 5, min_similarity: float = 0.3) -> List[Tuple[UUID, UUID, float]]:
+        if not idea_ids or k <= 0:
+            return []
+        rows = self.db.execute(stored_graph_edges_stmt(idea_ids, k, min_similarity)).all()
+        if not rows and not self.db.execute(idea_edges_exist_stmt()).scalar():
+            # idea_edges not populated yet (upgraded database awaiting rebuild_idea_edges)
+            return await self.compute_graph_edges(idea_ids, k, min_similarity)
+        return [(row[0], row[1], float(row[2])) for row in rows]
+
+    async def compute_graph_edges(self, idea_ids: List[UUID], k: int = 5, min_similarity: float = 0.3, space_id: Optional[UUID] = None) -> List[Tuple[UUID, UUID, float]]:
+        if not idea_ids or k <= 0:
+            return []
+        self.db.execute(hnsw_ef_search_stmt(k))
+        rows = self.db.execute(graph_edges_stmt(idea_ids, k, min_similarity, space_id)).all()
+        return [(row[0], row[1], float(row[2])) for row in rows]
+
+    async def refresh_idea_edges(self, idea_ids: List[UUID]) -> int:
+        if not idea_ids:
+            return 0
+        delete_stmt, insert_stmt = refresh_idea_edges_stmts(idea_ids)
+        self.db.execute(hnsw_ef_search_stmt(IDEA_EDGES_K))
+        self.db.execute(delete_stmt)
+        result = self.db.execute(insert_stmt)
+        commit_or_flush(self.db)
+        return result.rowcount
+
+    async def update_idea_edges(self, idea_id: UUID) -> int:
+        # Ideas that pointed at the old centroid, plus the new neighbours, may rank it differently now
+        with unit_of_work(self.db):
+            previous = set(self.db.execute(idea_edge_neighbours_stmt(idea_id)).scalars().all())
+            count = await self.refresh_idea_edges([idea_id])
+            current = set(self.db.execute(idea_edge_neighbours_stmt(idea_id)).scalars().all())
+            neighbourhood = list((previous | current) - {idea_id})
+            return count + await self.refresh_idea_edges(neighbourhood)
+
+    async def search_fragments(self, vector: List[float], limit: int = 5, space_id: Optional[UUID] = None) -> List[Tuple[Fragment, float]]:
+        self.db.execute(hnsw_ef_search_stmt(limit))
+        results = self.db.execute(search_fragments_stmt(vector, limit, space_id)).all()
+        return [(Fragment.model_validate(row[0]), 1.0 - row[1]) for row in results]
+
+    async def hybrid_search(self, query: str, vector: List[float], limit: int = 10, space_id: Optional[UUID] = None,
+                            lexical_weight: float = 1.0, semantic_weight: float = 1.0) -> List[RetrievalHit]:
+        pool = hybrid_pool(limit)
+        self.db.execute(hnsw_ef_search_stmt(pool))
+        stmt = hybrid_search_stmt(query, vector, limit, space_id, lexical_weight, semantic_weight, pool)
+        return [retrieval_hit(row) for row in self.db.execute(stmt).all()]
+
     # --- TRASH MANAGEMENT ---
     
     async def soft_delete_fragment(self, fragment_id: UUID) -> bool:
-        stmt = select(FragmentModel).where(FragmentModel.id == fragment_id)
-        fragment = self.db.execute(stmt).scalar_one_or_none()
-        if fragment:
-            fragment.is_deleted = True
-            self.db.commit()
-            return True
-        return False
+        return self._set_fragments_deleted([fragment_id], True) > 0
         
     async def restore_fragment(self, fragment_id: UUID) -> bool:
-        stmt = select(FragmentModel).where(FragmentModel.id == fragment_id)
-        fragment = self.db.execute(stmt).scalar_one_or_none()
-        if fragment:
-            fragment.is_deleted = False
-            self.db.commit()
-            return True
-        return False
+        return self._set_fragments_deleted([fragment_id], False) > 0
+
+    def _set_fragments_deleted(self, fragment_ids: List[UUID], deleted: bool) -> int:
+        """Flags the fragments and moves their ideas' fragment_count in the same transaction."""
+        rows = self.db.execute(set_fragments_deleted_stmt(fragment_ids, deleted)).all()
+        changed = changed_fragment_ids(rows, deleted)
+        if changed:
+            self.db.execute(shift_fragment_counts_stmt(changed, -1 if deleted else 1))
+        commit_or_flush(self.db)
+        return len(rows)
 
     async def hard_delete_fragment(self, fragment_id: UUID) -> bool:
         stmt = select(FragmentModel).where(FragmentModel.id == fragment_id)
         fragment = self.db.execute(stmt).scalar_one_or_none()
         if fragment:
             self.db.delete(fragment)
-            self.db.commit()
+            commit_or_flush(self.db)
             return True
         return False
 
@@ -413,11 +888,8 @@ class PostgresRepository(RepositoryPort):
         results = self.db.execute(stmt).scalars().all()
         return [Fragment.model_validate(r) for r in results]
 
-    # Batch operations (can be optimized later with update/delete queries)
     async def soft_delete_batch_fragments(self, ids: List[UUID]) -> int:
-        count = 0
-        for fid in ids:
-            if await self.soft_delete_fragment(fid):
-                count += 1
-        return count
+        if not ids:
+            return 0
+        return self._set_fragments_deleted(ids, True)
 
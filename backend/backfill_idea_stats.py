@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Backfills the running spread statistics of idea profiles (SemanticProfile m2,
+mean_sq_norm, max_radius) for ideas created before they were tracked, by
+recomputing each profile from its attached fragments' embeddings. The centroid
+and count are recomputed too (so are the ideas' graph edges); drift is kept.
+Each idea is recomputed under its row lock, like a live attach, and only its
+profile columns are written, so the script can run next to live ingestion.
+
+    python backfill_idea_stats.py                 # ideas with incomplete statistics
+    python backfill_idea_stats.py --all           # every idea
+    python backfill_idea_stats.py --space <uuid>  # only one space
+"""
+import argparse
+import asyncio
+from uuid import UUID
+
+from infrastructure.database import SessionLocal
+from adapters.postgres_repository import PostgresRepository, idea_from_model, lock_idea_stmt, idea_profile_update_stmt
+from domain.semantic import SemanticProfile
+from domain.services.idea_maintenance import iter_idea_pages
+
+async def recompute_profile(repo, idea_id, everything) -> bool:
+    # Attaches lock the idea too, so the fragments read here are the ones the profile is built from
+    async with repo.transaction():
+        model = repo.db.execute(lock_idea_stmt(idea_id)).scalar_one_or_none()
+        if model is None:
+            return False
+        idea = idea_from_model(model)
+        profile = idea.semantic_profile
+        if profile is None or (profile.has_complete_stats and not everything):
+            return False
+        vectors = [f.embedding for f in await repo.list_fragments_by_idea(idea_id) if f.embedding is not None]
+        if not vectors:
+            return False
+        idea.semantic_profile = SemanticProfile.from_vectors(vectors, drift=profile.drift)
+        repo.db.execute(idea_profile_update_stmt(idea))
+    return True
+
+async def backfill(repo, space_id, batch_size, everything):
+    checked = 0
+    updated = 0
+    async for idea_ids in iter_idea_pages(repo, space_id, batch_size):
+        refreshed = [idea_id for idea_id in idea_ids if await recompute_profile(repo, idea_id, everything)]
+        if refreshed:
+            async with repo.transaction():
+                await repo.refresh_idea_edges(refreshed)
+        updated += len(refreshed)
+        checked += len(idea_ids)
+        print(f"   checked {checked} ideas, updated {updated}")
+    print(f"--- Backfill done: {checked} ideas, {updated} updated ---")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--space", type=UUID, default=None)
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--all", action="store_true", help="Recompute ideas whose statistics are already complete")
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        asyncio.run(backfill(PostgresRepository(db), args.space, args.batch_size, args.all))
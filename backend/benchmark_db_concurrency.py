@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Concurrency benchmark: p50/p95/p99 latency under mixed ingest + query load.
+
+Run it once against a backend started with DB_DRIVER=sync and once with
+DB_DRIVER=async, then compare:
+
+    DB_DRIVER=sync  uvicorn main:app --port 8000
+    python benchmark_db_concurrency.py --label sync
+    DB_DRIVER=async uvicorn main:app --port 8000
+    python benchmark_db_concurrency.py --label async --baseline bench_sync.json
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from datetime import datetime
+
+import httpx
+
+BASE_URL = "http://localhost:8000"
+
+def log(msg):
+    print(f"[{datetime.now().strftime('%H:%M:%S')}] {msg}")
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+async def ingest_call(client, space_id, i):
+    payload = {"text": f"Benchmark fragment {i} {uuid.uuid4().hex} about neural learning", "space_id": space_id, "source": "benchmark"}
+    return await client.post("/ingest/", json=payload)
+
+async def query_call(client, space_id, i):
+    if i % 2:
+        return await client.post("/query/search", json={"query": "neural learning", "space_id": space_id, "limit": 5})
+    return await client.get("/query/fragments", params={"limit": 20})
+
+async def worker(client, space_id, kind, requests_per_worker, samples, errors):
+    call = ingest_call if kind == "ingest" else query_call
+    for i in range(requests_per_worker):
+        start = time.perf_counter()
+        try:
+            resp = await call(client, space_id, i)
+            if resp.status_code >= 400:
+                errors[kind] += 1
+        except httpx.HTTPError:
+            errors[kind] += 1
+        samples[kind].append((time.perf_counter() - start) * 1000)
+
+async def run(args):
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=120.0) as client:
+        res = await client.post("/spaces/", json={"name": f"Bench_{uuid.uuid4().hex[:8]}"})
+        res.raise_for_status()
+        space_id = res.json()["id"]
+
+        samples = {"ingest": [], "query": []}
+        errors = {"ingest": 0, "query": 0}
+        tasks = [worker(client, space_id, "ingest", args.requests, samples, errors) for _ in range(args.ingest_workers)]
+        tasks += [worker(client, space_id, "query", args.requests, samples, errors) for _ in range(args.query_workers)]
+
+        log(f"Running {len(tasks)} workers x {args.requests} requests against {args.base_url}")
+        started = time.perf_counter()
+        await asyncio.gather(*tasks)
+        wall = time.perf_counter() - started
+
+        await client.delete(f"/spaces/{space_id}")
+
+    report = {"label": args.label, "wall_s": round(wall, 2), "kinds": {}}
+    for kind, values in samples.items():
+        report["kinds"][kind] = {
+            "count": len(values),
+            "errors": errors[kind],
+            "p50_ms": round(percentile(values, 50), 1),
+            "p95_ms": round(percentile(values, 95), 1),
+            "p99_ms": round(percentile(values, 99), 1),
+        }
+    return report
+
+def print_report(report, baseline=None):
+    log(f"=== {report['label']} (wall {report['wall_s']}s) ===")
+    for kind, stats in report["kinds"].items():
+        line = f"   {kind:<7} n={stats['count']:<5} err={stats['errors']:<3} p50={stats['p50_ms']}ms p95={stats['p95_ms']}ms p99={stats['p99_ms']}ms"
+        if baseline and kind in baseline["kinds"]:
+            before = baseline["kinds"][kind]["p99_ms"]
+            if before:
+                line += f"  (p99 {before}ms -> {stats['p99_ms']}ms, x{before / max(stats['p99_ms'], 0.001):.2f})"
+        log(line)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--label", default="run")
+    parser.add_argument("--ingest-workers", type=int, default=8)
+    parser.add_argument("--query-workers", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=25, help="Requests per worker")
+    parser.add_argument("--baseline", help="JSON report of a previous run to compare against")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    out = f"bench_{args.label}.json"
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2)
+    log(f"Report saved to {out}")
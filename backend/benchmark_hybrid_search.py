@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Retrieval benchmark over a synthetic corpus: ILIKE scan (old search_knowledge)
+vs full-text (GIN) vs vector (HNSW) vs hybrid reciprocal-rank fusion.
+
+    python benchmark_hybrid_search.py --seed --size 1000000   # one-off, builds the corpus
+    python benchmark_hybrid_search.py --queries 200           # p50/p95/p99 per mode
+    python benchmark_hybrid_search.py --drop                  # removes the corpus
+
+The corpus lives in its own space, so benchmark queries are scoped to it.
+Seeding 1M 1536-d rows writes several GB and the HNSW index build takes a while.
+"""
+import argparse
+import random
+import time
+import uuid
+from datetime import datetime
+
+from sqlalchemy import select, text, delete
+
+from infrastructure.database import SessionLocal
+from adapters.orm import SpaceModel, FragmentModel
+from adapters.postgres_repository import (
+    search_knowledge_stmt, search_fragments_stmt, hybrid_search_stmt, hybrid_pool, hnsw_ef_search_stmt
+)
+
+SPACE_NAME = "Hybrid search benchmark"
+VOCABULARY = [
+    "neural", "learning", "graph", "editorial", "memory", "vector", "index", "narrative",
+    "cognitive", "archive", "draft", "semantic", "fragment", "voice", "structure", "evolution",
+    "network", "signal", "pattern", "insight", "theory", "method", "language", "reader",
+    "author", "chapter", "argument", "evidence", "context", "concept", "model", "system",
+]
+
+def log(msg):
+    print(f"[{datetime.now().strftime('%H:%M:%S')}] {msg}")
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+def get_space_id(db):
+    return db.execute(select(SpaceModel.id).where(SpaceModel.name == SPACE_NAME)).scalar_one_or_none()
+
+def seed(db, size, batch_size):
+    space_id = get_space_id(db)
+    if space_id is None:
+        space_id = uuid.uuid4()
+        db.add(SpaceModel(id=space_id, name=SPACE_NAME))
+        db.commit()
+
+    words = "ARRAY[" + ",".join(f"'{w}'" for w in VOCABULARY) + "]"
+    # Twelve random vocabulary words and a random 1536-d vector per row; the
+    # correlated "g > 0" stops Postgres from evaluating the subqueries only once
+    insert_batch = text(f"""
+        INSERT INTO fragments (id, raw_text, source, created_at, embedding, is_deleted, space_id, language)
+        SELECT gen_random_uuid(),
+               (SELECT string_agg(({words})[1 + floor(random() * {len(VOCABULARY)})::int], ' ')
+                  FROM generate_series(1, 12) WHERE g > 0),
+               'benchmark', now(),
+               (SELECT array_agg(random() - 0.5)::vector FROM generate_series(1, 1536) WHERE g > 0),
+               false, :space_id, 'en'
+        FROM generate_series(1, :n) AS g
+    """)
+    done = 0
+    while done < size:
+        n = min(batch_size, size - done)
+        db.execute(insert_batch, {"space_id": space_id, "n": n})
+        db.commit()
+        done += n
+        log(f"   seeded {done}/{size}")
+    db.execute(text("ANALYZE fragments"))
+    db.commit()
+    return space_id
+
+def drop(db):
+    space_id = get_space_id(db)
+    if space_id is None:
+        log("No benchmark corpus found")
+        return
+    db.execute(delete(FragmentModel).where(FragmentModel.space_id == space_id))
+    db.execute(delete(SpaceModel).where(SpaceModel.id == space_id))
+    db.commit()
+    log("Benchmark corpus dropped")
+
+def sample_queries(db, space_id, count):
+    vectors = db.execute(
+        select(FragmentModel.embedding).where(FragmentModel.space_id == space_id).limit(count)
+    ).scalars().all()
+    return [(" ".join(random.sample(VOCABULARY, 2)), list(vector)) for vector in vectors]
+
+def run_mode(db, mode, queries, space_id, limit, lexical_weight, semantic_weight):
+    samples = []
+    for query, vector in queries:
+        start = time.perf_counter()
+        if mode == "ilike":
+            stmt = select(FragmentModel).where(
+                FragmentModel.raw_text.ilike(f"%{query}%"), FragmentModel.is_deleted == False, FragmentModel.space_id == space_id
+            ).limit(limit)
+        elif mode == "lexical":
+            stmt = search_knowledge_stmt(query, space_id, limit)
+        elif mode == "semantic":
+            db.execute(hnsw_ef_search_stmt(limit))
+            stmt = search_fragments_stmt(vector, limit, space_id)
+        else:
+            pool = hybrid_pool(limit)
+            db.execute(hnsw_ef_search_stmt(pool))
+            stmt = hybrid_search_stmt(query, vector, limit, space_id, lexical_weight, semantic_weight, pool)
+        db.execute(stmt).all()
+        db.rollback()  # Ends the transaction so SET LOCAL does not leak between modes
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", action="store_true", help="Insert the synthetic corpus before running")
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--drop", action="store_true", help="Delete the synthetic corpus and exit")
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--lexical-weight", type=float, default=1.0)
+    parser.add_argument("--semantic-weight", type=float, default=1.0)
+    parser.add_argument("--modes", default="ilike,lexical,semantic,hybrid")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.drop:
+            drop(db)
+        else:
+            space_id = seed(db, args.size, args.batch_size) if args.seed else get_space_id(db)
+            if space_id is None:
+                raise SystemExit("No benchmark corpus; run with --seed first")
+
+            queries = sample_queries(db, space_id, args.queries)
+            log(f"Running {len(queries)} queries per mode (limit={args.limit})")
+            for mode in args.modes.split(","):
+                values = run_mode(db, mode, queries, space_id, args.limit, args.lexical_weight, args.semantic_weight)
+                log(f"   {mode:<9} p50={percentile(values, 50):.1f}ms p95={percentile(values, 95):.1f}ms p99={percentile(values, 99):.1f}ms")
+    finally:
+        db.close()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: per-call httpx clients vs the pooled ProviderRegistry clients,
+and single-text embeddings vs the batch generate_embeddings path.
+
+Starts a stub Ollama server (/api/embeddings, /api/embed, /api/generate) on a
+local port and fires embedding requests through OllamaAdapter:
+
+    python benchmark_llm_clients.py
+    python benchmark_llm_clients.py --requests 2000 --concurrency 32 --delay-ms 2
+"""
+import argparse
+import asyncio
+import threading
+import time
+from datetime import datetime
+
+import uvicorn
+from fastapi import FastAPI
+
+from adapters.llm.ollama_adapter import OllamaAdapter
+from adapters.llm.client_registry import ProviderRegistry
+
+def log(msg):
+    print(f"[{datetime.now().strftime('%H:%M:%S')}] {msg}")
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+def build_stub(delay_ms, dimensions):
+    stub = FastAPI()
+    vector = [0.1] * dimensions
+
+    @stub.post("/api/embeddings")
+    async def embeddings(payload: dict):
+        if delay_ms:
+            await asyncio.sleep(delay_ms / 1000)
+        return {"embedding": vector}
+
+    @stub.post("/api/embed")
+    async def embed(payload: dict):
+        if delay_ms:
+            await asyncio.sleep(delay_ms / 1000)
+        return {"embeddings": [vector] * len(payload["input"])}
+
+    @stub.post("/api/generate")
+    async def generate(payload: dict):
+        if delay_ms:
+            await asyncio.sleep(delay_ms / 1000)
+        return {"response": "ok"}
+
+    return stub
+
+def start_stub(port, delay_ms, dimensions):
+    config = uvicorn.Config(build_stub(delay_ms, dimensions), host="127.0.0.1", port=port, log_level="warning")
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread
+
+async def run_mode(adapter, requests, concurrency):
+    samples = []
+    queue = asyncio.Queue()
+    for i in range(requests):
+        queue.put_nowait(i)
+
+    async def worker():
+        while not queue.empty():
+            i = queue.get_nowait()
+            start = time.perf_counter()
+            await adapter.generate_embedding(f"benchmark text {i}")
+            samples.append((time.perf_counter() - start) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return samples, time.perf_counter() - started
+
+async def run(args, base_url):
+    results = {}
+
+    per_call = OllamaAdapter(base_url=base_url, model="stub")
+    results["per-call"] = await run_mode(per_call, args.requests, args.concurrency)
+
+    registry = ProviderRegistry(max_connections=args.concurrency, max_keepalive=args.concurrency)
+    pooled = registry.get_ollama(model="stub", base_url=base_url)
+    await run_mode(pooled, args.concurrency, args.concurrency)  # Warm the pool
+    results["pooled"] = await run_mode(pooled, args.requests, args.concurrency)
+
+    # Same number of texts through /api/embed, embed_batch_size texts per request
+    texts = [f"benchmark text {i}" for i in range(args.requests)]
+    started = time.perf_counter()
+    await pooled.generate_embeddings(texts)
+    batch_wall = time.perf_counter() - started
+    await registry.aclose()
+
+    for label, (samples, wall) in results.items():
+        log(f"   {label:<9} n={len(samples)} p50={percentile(samples, 50):.2f}ms "
+            f"p95={percentile(samples, 95):.2f}ms p99={percentile(samples, 99):.2f}ms "
+            f"throughput={len(samples) / wall:.0f} texts/s")
+    log(f"   {'batched':<9} n={len(texts)} batch={pooled.embed_batch_size} "
+        f"wall={batch_wall * 1000:.0f}ms throughput={len(texts) / batch_wall:.0f} texts/s")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=18434)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--delay-ms", type=float, default=0.0, help="Simulated model latency of the stub")
+    parser.add_argument("--dimensions", type=int, default=768)
+    args = parser.parse_args()
+
+    server, thread = start_stub(args.port, args.delay_ms, args.dimensions)
+    try:
+        log(f"Stub Ollama on 127.0.0.1:{args.port}; {args.requests} requests x {args.concurrency} concurrent")
+        asyncio.run(run(args, f"http://127.0.0.1:{args.port}"))
+    finally:
+        server.should_exit = True
+        thread.join()
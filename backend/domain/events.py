@@ -25,6 +25,14 @@ class DecisionResult(BaseModel):
     rule_id: str  # Traceability: Which rule triggered this?
     constraints: List[str] = []
 
+class IngestItemResult(BaseModel):
+    """Outcome of one text within a batch ingestion."""
+    index: int
+    fragment_id: UUID
+    status: str  # processed, skipped, failed
+    decision: Optional[DecisionResult] = None
+    error: Optional[str] = None
+
 # Specific Events
 class FragmentIngested(DomainEvent):
     name: str = "FragmentIngested"
@@ -16,6 +16,10 @@ class DatabaseError(DomainError):
     def __init__(self, message: str = "Database operation failed", original_error: str = None):
         super().__init__(f"{message}: {original_error}" if original_error else message, "DB_ERROR")
 
+class JobPayloadError(DomainError):
+    def __init__(self, message: str = "Invalid job payload", original_error: str = None):
+        super().__init__(f"{message}: {original_error}" if original_error else message, "INVALID_JOB")
+
 class NetworkError(DomainError):
     def __init__(self, message: str = "Network connectivity issue", original_error: str = None):
         super().__init__(f"{message}: {original_error}" if original_error else message, "NETWORK_ERROR")
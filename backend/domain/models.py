@@ -38,6 +38,14 @@ class Fragment(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+class RetrievalHit(BaseModel):
+    """A fragment returned by hybrid retrieval."""
+    fragment: Fragment
+    score: float  # Weighted reciprocal-rank-fusion score
+    similarity: float  # Cosine similarity to the query vector
+    lexical_rank: Optional[int] = None
+    semantic_rank: Optional[int] = None
+
 class Idea(BaseModel):
     id: UUID = uuid4()
     title_provisional: Optional[str] = None
@@ -51,12 +59,40 @@ class Idea(BaseModel):
     space_id: Optional[UUID] = None
     language: str = "en"
 
+    # Maintained by the repository; read-only for the domain
+    fragment_count: int = 0
+    version_count: int = 0
+    latest_version_number: int = 0
+
     model_config = ConfigDict(from_attributes=True)
 
+class IdeaGraphNode(BaseModel):
+    """Lightweight projection of an Idea for graph views (no semantic profile)."""
+    id: UUID
+    title_provisional: Optional[str] = None
+    status: str = "germinal"
+    domain: Optional[str] = None
+    fragment_count: int = 0
+
+class IdeaMaturityStats(BaseModel):
+    """Per-idea inputs of MaturityCalculator, aggregated in one query."""
+    id: UUID
+    title_provisional: Optional[str] = None
+    domain: Optional[str] = None
+    created_at: datetime
+    fragment_count: int = 0
+    version_count: int = 0
+
+class IdeaSourceContent(BaseModel):
+    """An idea's title and latest synthesized text (or its fragments), as drafting source material."""
+    id: UUID
+    title_provisional: Optional[str] = None
+    content: Optional[str] = None
+
 class IdeaVersion(BaseModel):
     id: UUID = uuid4()
     idea_id: UUID
-    version_number: int
+    version_number: Optional[int] = None  # Allocated by RepositoryPort.append_idea_version
     stage: str
     synthesized_text: Optional[str] = None
     synthesized_text: Optional[str] = None
@@ -66,6 +102,46 @@ class IdeaVersion(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+class SectionDraftStatus(BaseModel):
+    """Progress of one section inside a draft-all job."""
+    section_id: UUID
+    title: Optional[str] = None
+    status: str = "pending"  # pending, drafting, drafted, failed
+    error: Optional[str] = None
+
+class DraftJob(BaseModel):
+    """Whole-product draft generation: one entry per leaf section."""
+    id: UUID = Field(default_factory=uuid4)
+    product_id: UUID
+    status: str = "pending"  # pending, running, completed, failed, cancelled
+    concurrency: int = 1
+    total: int = 0
+    drafted: int = 0
+    failed: int = 0
+    sections: List[SectionDraftStatus] = []
+    error: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    finished_at: Optional[datetime] = None
+
+class Job(BaseModel):
+    """A unit of long-running LLM work in the jobs queue, run by the worker process."""
+    id: UUID
+    kind: str
+    payload: Dict[str, Any] = {}
+    status: str = "queued"  # queued, running, succeeded, failed, cancelled
+    attempts: int = 0
+    max_attempts: int = 3
+    run_at: Optional[datetime] = None
+    locked_by: Optional[str] = None
+    cancel_requested: bool = False
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
 class EditorialProfile(BaseModel):
     id: UUID = uuid4()
     name: str
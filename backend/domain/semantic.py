@@ -1,50 +1,149 @@
-from typing import List
-from pydantic import BaseModel, Field
+from typing import Any, Dict, Optional, Sequence, Union
+from pydantic import BaseModel, ConfigDict, field_serializer, field_validator
+import numpy as np
 import math
 
+VectorLike = Union[Sequence[float], np.ndarray]
+
 class SemanticProfile(BaseModel):
     """
     Represents the aggregated semantic state of an Idea.
     Decoupled from the Vector Store implementation.
+
+    The centroid is a float32 array (the precision pgvector stores), so updates are
+    vectorized and it can be written to the vector column without conversion.
+    Persisted as that vector column plus storage_metadata(); there is no JSON copy.
+
+    Spread is tracked with Welford's algorithm, O(d) per update and exact:
+    m2 is the sum of squared distances of the vectors to the centroid and
+    mean_sq_norm the mean squared norm of the vectors. stats_count is the number of
+    vectors those two cover; profiles created before the statistics existed lag
+    behind fragment_count until backfilled, and report no tightness meanwhile.
     """
-    centroid: List[float]
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    centroid: np.ndarray
     fragment_count: int = 1
-    # Potential future fields: variance, radius, keywords
+    m2: float = 0.0
+    mean_sq_norm: float = 0.0
+    stats_count: int = 0
+    max_radius: float = 0.0  # Largest distance of a vector to the centroid at the time it was added
+    drift: float = 0.0  # Total distance the centroid has moved
+
+    @field_validator("centroid", mode="before")
+    @classmethod
+    def _as_float32(cls, value: Any) -> np.ndarray:
+        return np.asarray(value, dtype=np.float32)
+
+    @field_serializer("centroid")
+    def _serialize_centroid(self, centroid: np.ndarray):
+        return centroid.tolist()
+
+    @classmethod
+    def from_vector(cls, vector: VectorLike) -> 'SemanticProfile':
+        """Profile of a single vector (a new idea)."""
+        vector = np.asarray(vector, dtype=np.float32)
+        return cls(centroid=vector, fragment_count=1, mean_sq_norm=float(np.dot(vector, vector)), stats_count=1)
 
-    def update(self, new_vector: List[float]) -> 'SemanticProfile':
+    @classmethod
+    def from_vectors(cls, vectors: Sequence[VectorLike], drift: float = 0.0) -> 'SemanticProfile':
+        """
+        Profile of many vectors at once (backfills). max_radius is measured against the
+        final centroid; drift cannot be recovered from the vectors and is passed in.
+        """
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if matrix.ndim != 2 or not len(matrix):
+            raise ValueError("Expected a non-empty list of vectors")
+        centroid = matrix.mean(axis=0)
+        sq_distances = np.einsum("ij,ij->i", matrix - centroid, matrix - centroid, dtype=np.float64)
+        return cls(
+            centroid=centroid,
+            fragment_count=len(matrix),
+            m2=float(sq_distances.sum()),
+            mean_sq_norm=float(np.einsum("ij,ij->i", matrix, matrix, dtype=np.float64).mean()),
+            stats_count=len(matrix),
+            max_radius=float(np.sqrt(sq_distances.max())),
+            drift=drift
+        )
+
+    def update(self, new_vector: VectorLike) -> 'SemanticProfile':
         """
         Pure function: Returns a NEW SemanticProfile with the updated centroid.
         Uses a moving average strategy.
         """
-        if len(new_vector) != len(self.centroid):
+        new_vector = np.asarray(new_vector, dtype=np.float32)
+        if new_vector.shape != self.centroid.shape:
             raise ValueError("Vector dimension mismatch")
 
         new_count = self.fragment_count + 1
-        
+
         # Incremental Mean Formula: NewMean = OldMean + (NewVal - OldMean) / NewCount
-        # Or simply: (OldSum + NewVal) / NewCount -> (OldMean * OldCount + NewVal) / NewCount
-        
-        new_centroid = []
-        for i, old_val in enumerate(self.centroid):
-            new_val = (old_val * self.fragment_count + new_vector[i]) / new_count
-            new_centroid.append(new_val)
-            
+        delta = new_vector - self.centroid
+        new_centroid = self.centroid + delta / np.float32(new_count)
+
+        # Welford: M2 += (x - old_mean) . (x - new_mean)
+        delta_after = new_vector - new_centroid
+        stats_count = self.stats_count + 1
+        sq_norm = float(np.dot(new_vector, new_vector))
+
         return SemanticProfile(
             centroid=new_centroid,
-            fragment_count=new_count
+            fragment_count=new_count,
+            m2=self.m2 + float(np.dot(delta, delta_after)),
+            mean_sq_norm=self.mean_sq_norm + (sq_norm - self.mean_sq_norm) / stats_count,
+            stats_count=stats_count,
+            max_radius=max(self.max_radius, float(np.linalg.norm(delta_after))),
+            drift=self.drift + float(np.linalg.norm(new_centroid - self.centroid))
         )
 
+    @property
+    def has_complete_stats(self) -> bool:
+        return self.stats_count >= self.fragment_count
+
+    @property
+    def dispersion(self) -> Optional[float]:
+        """Mean squared distance of the vectors to the centroid (total variance)."""
+        if not self.has_complete_stats:
+            return None
+        return max(self.m2, 0.0) / self.fragment_count
+
+    @property
+    def radius(self) -> Optional[float]:
+        """Root-mean-square distance of the vectors to the centroid."""
+        dispersion = self.dispersion
+        return None if dispersion is None else math.sqrt(dispersion)
+
+    @property
+    def tightness(self) -> Optional[float]:
+        """
+        Share of the vectors' energy explained by the centroid: |centroid|^2 / mean |x|^2,
+        0 (scattered) to 1 (identical vectors). Scale-free; for unit-length embeddings
+        it approaches the mean pairwise cosine similarity.
+        """
+        dispersion = self.dispersion
+        if dispersion is None or self.mean_sq_norm <= 0:
+            return None
+        return min(max(1.0 - dispersion / self.mean_sq_norm, 0.0), 1.0)
+
+    def distance_to(self, vector: VectorLike) -> float:
+        return float(np.linalg.norm(np.asarray(vector, dtype=np.float32) - self.centroid))
+
+    def storage_metadata(self) -> Dict[str, Any]:
+        """Everything but the centroid, which is stored in the vector column."""
+        return self.model_dump(exclude={"centroid"})
+
 class VectorUtils:
     @staticmethod
-    def cosine_similarity(v1: List[float], v2: List[float]) -> float:
-        if len(v1) != len(v2):
+    def cosine_similarity(v1: VectorLike, v2: VectorLike) -> float:
+        a = np.asarray(v1, dtype=np.float64)
+        b = np.asarray(v2, dtype=np.float64)
+        if a.shape != b.shape:
             raise ValueError("Vector dimension mismatch")
-            
-        dot_product = sum(a * b for a, b in zip(v1, v2))
-        norm_a = math.sqrt(sum(a * a for a in v1))
-        norm_b = math.sqrt(sum(b * b for b in v2))
-        
+
+        norm_a = np.linalg.norm(a)
+        norm_b = np.linalg.norm(b)
+
         if norm_a == 0 or norm_b == 0:
             return 0.0
-            
-        return dot_product / (norm_a * norm_b)
+
+        return float(np.dot(a, b) / (norm_a * norm_b))
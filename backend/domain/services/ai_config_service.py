@@ -4,6 +4,7 @@ from typing import Dict, Optional, Any
 from uuid import UUID
 from pydantic import BaseModel
 from domain.ai_models_sql import AISettings
+from infrastructure.config_cache import ai_config_cache, notify_config_change
 
 # Reuse existing Pydantic models for internal typing
 class AIModelConfig(BaseModel):
@@ -49,7 +50,16 @@ class AIConfigService:
         """
         Fetches the AI configuration for a specific user.
         If not found, returns the default 'Maestro' profile.
+        Resolved profiles are cached per user (TTL + invalidation on save).
         """
+        cached = ai_config_cache.get(user_id)
+        if cached is not None:
+            return cached.model_copy(deep=True)
+        profile = self._load_config(user_id)
+        ai_config_cache.set(user_id, profile.model_copy(deep=True))
+        return profile
+
+    def _load_config(self, user_id: Optional[UUID]) -> AIProfile:
         stmt = select(AISettings).where(AISettings.user_id == user_id)
         result = self.db.execute(stmt)
         settings = result.scalar_one_or_none()
@@ -99,6 +109,8 @@ class AIConfigService:
              settings.custom_config = custom_config
         else:
              settings.custom_config = None # Clear custom config if switching to standard
-             
+        
+        notify_config_change(self.db, "ai", user_id)
         self.db.commit()
+        ai_config_cache.invalidate(user_id)
         self.db.refresh(settings)
@@ -1,6 +1,6 @@
 from typing import List, Optional
 from uuid import UUID
-from domain.models import Product, ProductSection, Fragment, Idea, EditorialProfile
+from domain.models import Product, ProductSection, Fragment, Idea, EditorialProfile, RetrievalHit
 from ports.repository import RepositoryPort
 from ports.ai_provider import AIProviderPort
 
@@ -17,7 +17,9 @@ class Drafter:
         # 1. Retrieve Context (The "Raw Material")
         # For now, we search by Section Title + Product Title
         query = f"{section.title} {product.title}"
-        context_fragments = await self.repo.search_knowledge(query, space_id=product.space_id, limit=10)
+        query_vector = await self.ai.generate_embedding(query)
+        hits = await self.repo.hybrid_search(query, query_vector, limit=10, space_id=product.space_id)
+        context_fragments = [hit.fragment for hit in hits]
         
         # 2. Retrieve Previous Context (for Flow)
         prev_section_content = ""
@@ -33,7 +35,7 @@ class Drafter:
 
         # 4. Generate Content based on Level
         if level == 0:
-            return self._level_0_assembly(context_fragments)
+            return self._level_0_assembly(hits)
         elif level == 1:
             return await self._level_1_clean(section, context_fragments)
         elif level == 2:
@@ -43,13 +45,12 @@ class Drafter:
         
         return "Invalid Level"
 
-    def _level_0_assembly(self, fragments: List[any]) -> str:
+    def _level_0_assembly(self, hits: List[RetrievalHit]) -> str:
         """Raw compilation of sources."""
         text = "<h3>Raw Knowledge Compilation</h3><ul>"
-        for f in fragments:
-             # handling SearchResult object vs Fragment object
-             content = f.raw_text
-             text += f"<li>{content} <small>({getattr(f, 'score', 0):.2f})</small></li>"
+        for hit in hits:
+             content = hit.fragment.raw_text
+             text += f"<li>{content} <small>({hit.similarity:.2f})</small></li>"
         text += "</ul>"
         return text
 
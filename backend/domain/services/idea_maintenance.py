@@ -0,0 +1,26 @@
+from typing import AsyncIterator, List, Optional
+from uuid import UUID
+
+from ports.repository import RepositoryPort
+
+async def iter_idea_pages(repo: RepositoryPort, space_id: Optional[UUID], batch_size: int) -> AsyncIterator[List[UUID]]:
+    """Ids of every live idea (optionally of one space), batch_size at a time, in creation order."""
+    offset = 0
+    while True:
+        page = await repo.list_graph_nodes(space_id=space_id, limit=batch_size, offset=offset)
+        if not page:
+            return
+        yield [node.id for node in page]
+        offset += batch_size
+
+async def rebuild_idea_edges(repo: RepositoryPort, space_id: Optional[UUID] = None, batch_size: int = 200, progress=None) -> dict:
+    """Recomputes the stored knowledge-graph edges of every idea, one transaction per page."""
+    ideas = 0
+    edges = 0
+    async for idea_ids in iter_idea_pages(repo, space_id, batch_size):
+        async with repo.transaction():
+            edges += await repo.refresh_idea_edges(idea_ids)
+        ideas += len(idea_ids)
+        if progress:
+            progress(ideas, edges)
+    return {"ideas": ideas, "edges": edges}
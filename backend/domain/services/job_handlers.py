@@ -0,0 +1,115 @@
+from typing import Any, Awaitable, Callable, Dict
+from uuid import UUID
+
+from domain.exceptions import JobPayloadError
+from domain.models import DraftJob
+from domain.services.pipeline import CognitivePipeline
+from domain.services.product_drafter import ProductDrafter, DRAFT_ALL_CONCURRENCY
+from domain.services import idea_maintenance
+
+JobHandler = Callable[[CognitivePipeline, Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+def _require(payload: Dict[str, Any], *keys: str):
+    missing = [key for key in keys if not payload.get(key)]
+    if missing:
+        raise JobPayloadError(f"Missing payload field(s): {', '.join(missing)}")
+
+def _uuid(value: Any, field: str) -> UUID:
+    try:
+        return UUID(str(value))
+    except ValueError as e:
+        raise JobPayloadError(f"Invalid {field}", original_error=str(e))
+
+def _load_product(pipeline: CognitivePipeline, payload: Dict[str, Any]):
+    _require(payload, "product_id")
+    product_id = _uuid(payload["product_id"], "product_id")
+    product = pipeline.repo.get_product(product_id)
+    if not product:
+        raise JobPayloadError(f"Product {product_id} not found")
+    return product
+
+async def generate_blueprint(pipeline: CognitivePipeline, payload: Dict[str, Any]) -> Dict[str, Any]:
+    language = payload.get("language", "en")
+    blueprint = await pipeline.generate_blueprint(_load_product(pipeline, payload), language=language)
+    return {"status": "blueprint_generated", "language": language, "blueprint": blueprint}
+
+async def generate_section_draft(pipeline: CognitivePipeline, payload: Dict[str, Any]) -> Dict[str, Any]:
+    _require(payload, "source_idea_ids")
+    if not isinstance(payload["source_idea_ids"], list):
+        raise JobPayloadError("source_idea_ids must be a list of idea ids")
+    section_id = _uuid(payload["section_id"], "section_id") if payload.get("section_id") else None
+    product = _load_product(pipeline, payload)
+    language = payload.get("language", "en")
+    section_title = payload.get("section_title") or "Section"
+    content = await pipeline.generate_section_draft(
+        section_title=section_title,
+        source_idea_ids=payload["source_idea_ids"],
+        product=product,
+        language=language
+    )
+    if section_id:
+        pipeline.repo.update_section_content(section_id, content, payload.get("level", 0))
+    return {"status": "draft_generated", "section_title": section_title, "content": content, "language": language}
+
+async def draft_product(pipeline: CognitivePipeline, payload: Dict[str, Any]) -> Dict[str, Any]:
+    raw_sources = payload.get("sources") or {}
+    if not isinstance(raw_sources, dict) or not all(isinstance(ids, list) for ids in raw_sources.values()):
+        raise JobPayloadError("sources must map section ids to lists of idea ids")
+    sources = {
+        _uuid(section_id, "section id in sources"): [_uuid(i, "idea id in sources") for i in ids]
+        for section_id, ids in raw_sources.items()
+    }
+    product = _load_product(pipeline, payload)
+    concurrency = min(payload.get("concurrency") or DRAFT_ALL_CONCURRENCY, DRAFT_ALL_CONCURRENCY)
+    drafter = ProductDrafter(pipeline, concurrency=concurrency)
+    job = await drafter.run(
+        DraftJob(product_id=product.id),
+        product,
+        sources,
+        overwrite=payload.get("overwrite", False),
+        language=payload.get("language", "en")
+    )
+    return job.model_dump(mode="json")
+
+async def ingest_batch(pipeline: CognitivePipeline, payload: Dict[str, Any]) -> Dict[str, Any]:
+    _require(payload, "texts")
+    if not isinstance(payload["texts"], list) or not all(isinstance(text, str) for text in payload["texts"]):
+        raise JobPayloadError("texts must be a list of strings")
+    texts = payload["texts"]
+    # Fragment ids are deterministic, so a retried batch skips what an earlier attempt stored
+    results = await pipeline.process_batch(
+        texts,
+        payload.get("source"),
+        mode=payload.get("mode", "default"),
+        space_id=payload.get("space_id"),
+        language=payload.get("language", "en")
+    )
+    return {
+        "total": len(results),
+        "processed": sum(1 for r in results if r.status == "processed"),
+        "skipped": sum(1 for r in results if r.status == "skipped"),
+        "failed": sum(1 for r in results if r.status == "failed"),
+        "results": [r.model_dump(mode="json") for r in results]
+    }
+
+async def backfill_idea_fragments(pipeline: CognitivePipeline, payload: Dict[str, Any]) -> Dict[str, Any]:
+    linked = await pipeline.repo.backfill_idea_fragments()
+    # New links change the ideas' fragment counts
+    return {"linked": linked, "recounted": await pipeline.repo.recount_idea_counters()}
+
+async def recount_idea_counters(pipeline: CognitivePipeline, payload: Dict[str, Any]) -> Dict[str, Any]:
+    return {"recounted": await pipeline.repo.recount_idea_counters()}
+
+async def rebuild_idea_edges(pipeline: CognitivePipeline, payload: Dict[str, Any]) -> Dict[str, Any]:
+    space_id = _uuid(payload["space_id"], "space_id") if payload.get("space_id") else None
+    return await idea_maintenance.rebuild_idea_edges(pipeline.repo, space_id)
+
+JOB_HANDLERS: Dict[str, JobHandler] = {
+    "generate_blueprint": generate_blueprint,
+    "generate_section_draft": generate_section_draft,
+    "draft_product": draft_product,
+    "ingest_batch": ingest_batch,
+    "backfill_idea_fragments": backfill_idea_fragments,
+    "recount_idea_counters": recount_idea_counters,
+    "rebuild_idea_edges": rebuild_idea_edges,
+}
@@ -1,22 +1,43 @@
-from typing import List
+from typing import List, Optional
 from datetime import datetime
-from domain.models import Idea, Fragment
+from domain.models import Idea, IdeaMaturityStats
 
 class MaturityCalculator:
     """
     Calcula la madurez de una Idea basándose en métricas objetivas.
     Score de 0-100.
     """
+    # Points per unit and cap of each component (also used by the SQL-side filter)
+    FRAGMENT_POINTS, FRAGMENT_MAX = 4, 40
+    VERSION_POINTS, VERSION_MAX = 6, 30
+    AGE_POINTS_PER_DAY, AGE_MAX = 2, 20
+    DOMAIN_POINTS = 10
+    UNCLASSIFIED_DOMAIN = "Unclassified"
     
     @staticmethod
-    def calculate(idea: Idea, fragments: List[Fragment], versions_count: int = 0) -> int:
+    def calculate(idea: Idea) -> int:
         """
-        Calculate maturity score for an idea.
+        Calculate maturity score for an idea from its stored counters.
         
         Args:
-            idea: The Idea instance
-            fragments: List of fragments associated with this idea
+            idea: The Idea instance (fragment_count and version_count as loaded)
+            
+        Returns:
+            Maturity score from 0-100
+        """
+        return MaturityCalculator.score(idea.fragment_count, idea.version_count, idea.created_at, idea.domain)
+    
+    @staticmethod
+    def score(fragment_count: int, versions_count: int, created_at: datetime, domain: Optional[str], now: Optional[datetime] = None) -> int:
+        """
+        Maturity score from the raw counts, without loading fragments or versions.
+        
+        Args:
+            fragment_count: Number of fragments associated with the idea
             versions_count: Number of versions (consolidations) the idea has
+            created_at: Creation time of the idea
+            domain: Domain classification of the idea
+            now: Reference time (defaults to utcnow)
             
         Returns:
             Maturity score from 0-100
@@ -25,27 +46,44 @@ class MaturityCalculator:
         
         # 1. Fragment count (max 40 points)
         # More fragments = more complete idea
-        fragment_score = min(len(fragments) * 4, 40)
+        fragment_score = min(fragment_count * MaturityCalculator.FRAGMENT_POINTS, MaturityCalculator.FRAGMENT_MAX)
         score += fragment_score
         
         # 2. Version count (max 30 points)
         # More versions = more consolidation/refinement
-        version_score = min(versions_count * 6, 30)
+        version_score = min(versions_count * MaturityCalculator.VERSION_POINTS, MaturityCalculator.VERSION_MAX)
         score += version_score
         
         # 3. Age in days (max 20 points)
         # Older ideas have had more time to mature
-        days_old = (datetime.utcnow() - idea.created_at).days
-        age_score = min(days_old * 2, 20)
+        days_old = ((now or datetime.utcnow()) - created_at).days
+        age_score = min(days_old * MaturityCalculator.AGE_POINTS_PER_DAY, MaturityCalculator.AGE_MAX)
         score += age_score
         
         # 4. Domain classification (10 points)
         # Ideas with classified domains are more refined
-        if idea.domain and idea.domain != "Unclassified":
-            score += 10
+        if domain and domain != MaturityCalculator.UNCLASSIFIED_DOMAIN:
+            score += MaturityCalculator.DOMAIN_POINTS
         
         return min(score, 100)
     
+    @staticmethod
+    def calculate_bulk(stats: List[IdeaMaturityStats]) -> List[int]:
+        """
+        Score many ideas at once from RepositoryPort.list_idea_maturity_stats.
+        
+        Args:
+            stats: Aggregated counts per idea
+            
+        Returns:
+            Maturity scores, in the same order as stats
+        """
+        now = datetime.utcnow()
+        return [
+            MaturityCalculator.score(s.fragment_count, s.version_count, s.created_at, s.domain, now)
+            for s in stats
+        ]
+    
     @staticmethod
     def get_status_label(score: int) -> str:
         """
@@ -1,6 +1,8 @@
-from typing import List, Optional, Tuple
+import asyncio
+from typing import Dict, List, Optional, Sequence, Tuple, AsyncIterator
 from uuid import UUID, uuid4, uuid5, NAMESPACE_OID
 from datetime import datetime
+from pydantic import BaseModel
 from i18n import t
 
 from ports.repository import RepositoryPort
@@ -8,11 +10,24 @@ from ports.ai_provider import AIProviderPort
 from ports.decision_ledger import DecisionLedgerPort
 from domain.engine import CognitiveEngine
 from domain.models import Fragment, Idea, IdeaVersion
-from domain.events import DecisionResult, CognitiveAction
-from domain.exceptions import NetworkError, EmbeddingError, DatabaseError, ModelError
+from domain.semantic import VectorUtils
+from domain.events import DecisionResult, CognitiveAction, IngestItemResult
+from domain.exceptions import DomainError, NetworkError, EmbeddingError, DatabaseError, ModelError
 
-class CognitivePipeline:
+# Primary-key constraint whose violation means "fragment already exists" (ids derive from the text)
+FRAGMENTS_PKEY = "fragments_pkey"
+
+class RoutePlan(BaseModel):
+    """What _plan_fragment decided for a fragment, for _apply_plan to write."""
+    fragment: Fragment
+    decision: DecisionResult
+    idea: Optional[Idea] = None  # New idea (CREATE_NEW) or target as read (ATTACH)
+    synthesis: Optional[str] = None  # Text of the ATTACH's new version
 
+class CognitivePipeline:
+    # Texts embedded and committed together by process_batch
+    BATCH_CHUNK_SIZE = 64
+    CANDIDATE_LIMIT = 5
 
     def __init__(
         self,
@@ -28,6 +43,96 @@ class CognitivePipeline:
 
     async def process_text(self, text: str, source: str = "manual", mode: str = "default", space_id: Optional[str] = None, language: str = "en") -> DecisionResult:
         # 1. Create Raw Fragment (Deterministic ID)
+        fragment = self._build_fragment(text, source, space_id, language)
+        
+        # 2. Enrich (Embedding)
+        try:
+            fragment.embedding = await self.ai.generate_embedding(text)
+        except Exception as e:
+            raise self._embedding_error(e)
+        
+        return await self._route_fragment(fragment, mode=mode, language=language)
+
+    async def process_batch(self, texts: List[str], source: str = "manual", mode: str = "default", space_id: Optional[str] = None, language: str = "en") -> List[IngestItemResult]:
+        """
+        Bulk variant of process_text for importers.
+        Texts are embedded chunk by chunk. Every item of a chunk is decided and
+        synthesized first, with no transaction open, so LLM latency never holds row
+        locks; the chunk is then persisted in one short transaction, ordered by target
+        idea, and every item runs inside its own savepoint so one bad text doesn't
+        discard the rest of its chunk.
+        
+        Returns:
+            One IngestItemResult per input text, in input order (blank texts fail).
+        """
+        results: Dict[int, IngestItemResult] = {}
+        seen = set()
+        
+        items = []
+        for index, text in enumerate(texts):
+            if text.strip():
+                items.append((index, text))
+            else:
+                results[index] = IngestItemResult(index=index, fragment_id=uuid5(NAMESPACE_OID, text), status="failed", error="Empty text")
+        
+        for start in range(0, len(items), self.BATCH_CHUNK_SIZE):
+            chunk = items[start:start + self.BATCH_CHUNK_SIZE]
+            fragments = [self._build_fragment(text, source, space_id, language) for _, text in chunk]
+            embeddings = await self._embed_chunk([text for _, text in chunk])
+            
+            plans: Dict[int, RoutePlan] = {}
+            # Ideas this chunk will create: candidates for the items after them
+            pending: List[Idea] = []
+            for (index, _), fragment, embedding in zip(chunk, fragments, embeddings):
+                if fragment.id in seen:
+                    results[index] = IngestItemResult(index=index, fragment_id=fragment.id, status="skipped", error="Duplicate text in batch")
+                    continue
+                seen.add(fragment.id)
+                
+                if isinstance(embedding, Exception):
+                    results[index] = IngestItemResult(index=index, fragment_id=fragment.id, status="failed", error=self._embedding_error(embedding).message)
+                    continue
+                fragment.embedding = embedding
+                
+                try:
+                    plan = await self._plan_fragment(fragment, mode=mode, language=language, pending=pending)
+                except Exception as e:
+                    results[index] = self._item_error(index, fragment, e)
+                    continue
+                if plan.decision.action == CognitiveAction.CREATE_NEW:
+                    pending.append(plan.idea)
+                plans[index] = plan
+            
+            # Same lock order in every batch (an idea's creation still precedes its attaches)
+            ordered = sorted(plans.items(), key=lambda item: (str(item[1].decision.target_idea_id or ""), item[0]))
+            async with self.repo.transaction():
+                for index, plan in ordered:
+                    try:
+                        decision = await self._apply_plan(plan, language=language)
+                        results[index] = IngestItemResult(index=index, fragment_id=plan.fragment.id, status="processed", decision=decision)
+                    except Exception as e:
+                        results[index] = self._item_error(index, plan.fragment, e)
+        
+        return [results[index] for index in sorted(results)]
+
+    @staticmethod
+    def is_duplicate_fragment(e: Exception) -> bool:
+        """True only for a primary-key clash on fragments (the text was already ingested)."""
+        message = (e.message if isinstance(e, DomainError) else str(e)).lower()
+        return "duplicate key" in message and FRAGMENTS_PKEY in message
+
+    @classmethod
+    def _item_error(cls, index: int, fragment: Fragment, e: Exception) -> IngestItemResult:
+        message = e.message if isinstance(e, DomainError) else str(e)
+        duplicate = cls.is_duplicate_fragment(e)
+        return IngestItemResult(
+            index=index,
+            fragment_id=fragment.id,
+            status="skipped" if duplicate else "failed",
+            error="Fragment already exists" if duplicate else message
+        )
+
+    def _build_fragment(self, text: str, source: str, space_id: Optional[str], language: str) -> Fragment:
         f_id = uuid5(NAMESPACE_OID, text)
         
         # Parse UUID if string
@@ -38,7 +143,7 @@ class CognitivePipeline:
              except:
                  pass # Fallback to None if invalid UUID
 
-        fragment = Fragment(
+        return Fragment(
             id=f_id,
             raw_text=text,
             source=source,
@@ -46,25 +151,58 @@ class CognitivePipeline:
             space_id=sid,
             language=language
         )
-        
-        # 2. Enrich (Embedding)
+
+    async def _embed_chunk(self, texts: List[str]) -> List:
+        # One batch call; if it fails, retry per item so failures come back as
+        # exceptions for just those items and the rest of the chunk can proceed.
+        # Always one entry per text.
         try:
-            fragment.embedding = await self.ai.generate_embedding(text)
-        except Exception as e:
-            if "connect" in str(e).lower():
-                raise NetworkError("Failed to connect to AI Provider for embedding", original_error=str(e))
-            raise EmbeddingError("Failed during embedding generation", original_error=str(e))
+            embeddings = await self.ai.generate_embeddings(texts)
+        except Exception:
+            return await asyncio.gather(*(self.ai.generate_embedding(text) for text in texts), return_exceptions=True)
+        if len(embeddings) != len(texts):
+            # Which vector belongs to which text is unknown: fail the whole chunk
+            error = EmbeddingError("Provider returned a wrong number of embeddings", original_error=f"{len(embeddings)} for {len(texts)} texts")
+            return [error] * len(texts)
+        return embeddings
+
+    @staticmethod
+    def _embedding_error(e: Exception) -> DomainError:
+        if isinstance(e, DomainError):
+            return e
+        if "connect" in str(e).lower():
+            return NetworkError("Failed to connect to AI Provider for embedding", original_error=str(e))
+        return EmbeddingError("Failed during embedding generation", original_error=str(e))
+
+    async def _route_fragment(self, fragment: Fragment, mode: str = "default", language: str = "en") -> DecisionResult:
+        """
+        Steps 3-5 of ingestion for an already embedded fragment:
+        candidate search, engine decision and execution of the resulting action.
+        """
+        plan = await self._plan_fragment(fragment, mode=mode, language=language)
+        return await self._apply_plan(plan, language=language)
+
+    async def _plan_fragment(self, fragment: Fragment, mode: str = "default", language: str = "en", pending: Sequence[Idea] = ()) -> RoutePlan:
+        """
+        Steps 3-4 plus the AI calls of step 5: reads and decides only, no writes.
+        `pending` are ideas planned but not stored yet (earlier items of a batch).
+        """
+        text = fragment.raw_text
+        f_id = fragment.id
+        sid = fragment.space_id
         
         # 3. Retrieve Candidates (Vector Search)
         # Returns List[Tuple[Idea, float]]
         try:
             if fragment.embedding:
                 # STRICT FILTER: Only search candidates within the same space
-                candidates_with_score = await self.repo.search_candidates(fragment.embedding, limit=5, space_id=sid)
+                candidates_with_score = await self.repo.search_candidates(fragment.embedding, limit=self.CANDIDATE_LIMIT, space_id=sid)
             else:
                 candidates_with_score = []
         except Exception as e:
              raise DatabaseError("Failed to search candidates in vector DB", original_error=str(e))
+        if pending and fragment.embedding:
+            candidates_with_score = self._with_pending_candidates(candidates_with_score, fragment.embedding, pending)
         
         # 4. Decide
         try:
@@ -82,7 +220,6 @@ class CognitivePipeline:
         decision.constraints.append("emb_model:mock-fixed-dim" if "Mock" in provider_name else "emb_model:ollama-nomic")
         decision.constraints.append("prompt_hash:mock-hash-123") 
         
-        # 5. Execute Action
         if decision.action == CognitiveAction.CREATE_NEW:
             # Create new Idea from Fragment
             start_vector = fragment.embedding
@@ -92,7 +229,7 @@ class CognitivePipeline:
             # Initialize Domain Semantic Profile
             from domain.semantic import SemanticProfile
             
-            initial_profile = SemanticProfile(centroid=start_vector, fragment_count=1)
+            initial_profile = SemanticProfile.from_vector(start_vector)
 
             try:
                 new_title = await self.ai.synthesize(text, "provisional_title", language=language)
@@ -114,60 +251,20 @@ class CognitivePipeline:
                 space_id=sid,
                 language=language
             )
-            
-            try:
-                # Save Idea first
-                await self.repo.save_idea(new_idea)
-                await self.repo.save_fragment(fragment)
-                
-                # Create Initial Version
-                initial_version = IdeaVersion(
-                    id=uuid4(),
-                    idea_id=new_idea.id,
-                    version_number=1,
-                    stage="germinal",
-                    synthesized_text=f"Initial seed: {text}",
-                    reasoning_log="Genesis from single fragment",
-                    created_at=datetime.utcnow(),
-                    language=language
-                )
-                await self.repo.save_idea_version(initial_version)
-                 
-                # Log decision with target
-                decision.target_idea_id = new_idea.id
-                await self.ledger.record_decision(fragment, decision)
-            except Exception as e:
-                raise DatabaseError("Failed to persist new Idea chain", original_error=str(e))
+            decision.target_idea_id = new_idea.id
+            return RoutePlan(fragment=fragment, decision=decision, idea=new_idea)
 
-            
         elif decision.action == CognitiveAction.ATTACH:
-            try:
-                # 1. Retrieve Target Idea
-                target_idea = await self.repo.get_idea(decision.target_idea_id)
-                if not target_idea:
-                    # Logic error/Data integrity
-                    raise DatabaseError(f"Target Idea {decision.target_idea_id} not found during ATTACH", original_error="ID mismatch")
-
-                # 2. Save Fragment
-                await self.repo.save_fragment(fragment)
-                
-                # --- SEMANTIC UPDATE ---
-                # Recalculate Centroid
-                if target_idea.semantic_profile and fragment.embedding:
-                    target_idea.semantic_profile = target_idea.semantic_profile.update(fragment.embedding)
-                    # Save updated idea (with new profile)
-                    await self.repo.save_idea(target_idea)
-            except Exception as e:
-                 raise DatabaseError("Failed DB operations during ATTACH phase", original_error=str(e))
-                
-            # 3. Evolution Logic: Create new Version
-            # Get latest version number
-            try:
-                latest_v = await self.repo.get_latest_version(target_idea.id)
-                current_ver_num = latest_v.version_number if latest_v else 0
-                new_version_num = current_ver_num + 1
-            except Exception as e:
-                 raise DatabaseError("Failed to fetch latest version", original_error=str(e))
+            # Retrieve Target Idea (stored, or created earlier in this batch)
+            target_idea = next((idea for idea in pending if idea.id == decision.target_idea_id), None)
+            if target_idea is None:
+                try:
+                    target_idea = await self.repo.get_idea(decision.target_idea_id)
+                except Exception as e:
+                    raise DatabaseError("Failed DB operations during ATTACH phase", original_error=str(e))
+            if not target_idea:
+                # Logic error/Data integrity
+                raise DatabaseError(f"Target Idea {decision.target_idea_id} not found during ATTACH", original_error="ID mismatch")
             
             # Synthesis of new state
             try:
@@ -176,36 +273,102 @@ class CognitivePipeline:
                  if "connect" in str(e).lower():
                       raise NetworkError("AI Provider synthesis connection failed", original_error=str(e))
                  raise ModelError("Synthesis of new version failed", original_error=str(e))
-            
-            new_version = IdeaVersion(
-                 id=uuid4(),
-                 idea_id=target_idea.id,
-                 version_number=new_version_num,
-                 stage=target_idea.status, # Stays same unless trigger
-                 synthesized_text=synthesis,
-                 reasoning_log=f"Attached fragment: {text[:30]}...",
-                 created_at=datetime.utcnow(),
-                 language=language
-            )
-            
-            try:
-                await self.repo.save_idea_version(new_version)
-                
-                # 4. Check for State Transition (Evolution)
-                # Ask Engine if this update triggers a phase change
-                transition_event = self.engine.detect_evolution_triggers(target_idea, new_version)
-                if transition_event:
-                    # Execute Transition
-                    target_idea.status = transition_event.payload["new_phase"]
-                    target_idea.updated_at = datetime.utcnow()
-                    await self.repo.save_idea(target_idea)
+            return RoutePlan(fragment=fragment, decision=decision, idea=target_idea, synthesis=synthesis)
+        
+        return RoutePlan(fragment=fragment, decision=decision)
+
+    @classmethod
+    def _with_pending_candidates(cls, candidates_with_score: List[Tuple[Idea, float]], vector: List[float], pending: Sequence[Idea]) -> List[Tuple[Idea, float]]:
+        scored = candidates_with_score + [
+            (idea, VectorUtils.cosine_similarity(vector, idea.semantic_profile.centroid)) for idea in pending
+        ]
+        return sorted(scored, key=lambda candidate: candidate[1], reverse=True)[:cls.CANDIDATE_LIMIT]
+
+    async def _apply_plan(self, plan: RoutePlan, language: str = "en") -> DecisionResult:
+        """
+        Step 5: writes what _plan_fragment decided, in one unit of work (a savepoint
+        inside process_batch's chunk transaction). No AI calls happen here.
+        """
+        fragment = plan.fragment
+        decision = plan.decision
+        text = fragment.raw_text
+        
+        async with self.repo.transaction():
+            if decision.action == CognitiveAction.CREATE_NEW:
+                new_idea = plan.idea
+                try:
+                    # Fragment first: re-ingested text fails here, on fragments_pkey, and is reported as a duplicate
+                    await self.repo.save_fragment(fragment)
+                    await self.repo.save_idea(new_idea)
+                    await self.repo.link_fragment(new_idea.id, fragment.id)
+                    await self.repo.update_idea_edges(new_idea.id)
+                    
+                    # Create Initial Version
+                    initial_version = IdeaVersion(
+                        id=uuid4(),
+                        idea_id=new_idea.id,
+                        stage="germinal",
+                        synthesized_text=f"Initial seed: {text}",
+                        reasoning_log="Genesis from single fragment",
+                        created_at=datetime.utcnow(),
+                        language=language
+                    )
+                    await self.repo.append_idea_version(initial_version)
+                     
+                    # Log decision with target
+                    await self.ledger.record_decision(fragment, decision)
+                except Exception as e:
+                    raise DatabaseError("Failed to persist new Idea chain", original_error=str(e))
+
+            elif decision.action == CognitiveAction.ATTACH:
+                target_idea = plan.idea
+                try:
+                    # 1. Save Fragment
+                    await self.repo.save_fragment(fragment)
+                    await self.repo.link_fragment(target_idea.id, fragment.id)
                     
-                    # Log usage of transition
-                    decision.reasoning += f" [Transitioned to {target_idea.status}]"
+                    # --- SEMANTIC UPDATE ---
+                    # Recalculate Centroid, atomically in the repository: target_idea may
+                    # already be stale if other fragments are attaching to it concurrently
+                    if target_idea.semantic_profile and fragment.embedding:
+                        target_idea = await self.repo.update_idea_profile(target_idea.id, fragment.embedding) or target_idea
+                        await self.repo.update_idea_edges(target_idea.id)
+                except Exception as e:
+                     raise DatabaseError("Failed DB operations during ATTACH phase", original_error=str(e))
                 
-                await self.ledger.record_decision(fragment, decision)
-            except Exception as e:
-                 raise DatabaseError("Failed to save evolution/version", original_error=str(e))
+                # 2. Evolution Logic: Create new Version
+                # Its number is allocated by the repository on insert (concurrent ATTACHes
+                # to the same idea each get their own)
+                new_version = IdeaVersion(
+                     id=uuid4(),
+                     idea_id=target_idea.id,
+                     stage=target_idea.status, # Stays same unless trigger
+                     synthesized_text=plan.synthesis,
+                     reasoning_log=f"Attached fragment: {text[:30]}...",
+                     created_at=datetime.utcnow(),
+                     language=language
+                )
+                
+                try:
+                    new_version = await self.repo.append_idea_version(new_version)
+                    if new_version is None:
+                        raise DatabaseError(f"Target Idea {target_idea.id} disappeared before its new version was saved", original_error="ID mismatch")
+                    
+                    # 3. Check for State Transition (Evolution)
+                    # Ask Engine if this update triggers a phase change
+                    transition_event = self.engine.detect_evolution_triggers(target_idea, new_version)
+                    if transition_event:
+                        # Execute Transition
+                        target_idea.status = transition_event.payload["new_phase"]
+                        target_idea.updated_at = datetime.utcnow()
+                        await self.repo.update_idea_status(target_idea.id, target_idea.status)
+                        
+                        # Log usage of transition
+                        decision.reasoning += f" [Transitioned to {target_idea.status}]"
+                    
+                    await self.ledger.record_decision(fragment, decision)
+                except Exception as e:
+                     raise DatabaseError("Failed to save evolution/version", original_error=str(e))
             
         return decision
 
@@ -223,29 +386,24 @@ class CognitivePipeline:
         """
         from domain.services.maturity_calculator import MaturityCalculator
         
-        # 1. Get all ideas from the product's space
-        ideas = await self.repo.list_ideas(space_id=product.space_id)
-        
-        if not ideas:
-            raise ModelError("No ideas available in this space to generate blueprint")
-        
-        # 2. Filter mature ideas (score > 50)
-        mature_ideas = []
-        for idea in ideas:
-            fragments = await self.repo.list_fragments_by_idea(idea.id)
-            versions = await self.repo.list_idea_versions(idea.id)
-            score = MaturityCalculator.calculate(idea, fragments, len(versions))
-            
-            if score > 50:
-                mature_ideas.append({
-                    "id": str(idea.id),
-                    "title": idea.title_provisional,
-                    "domain": idea.domain,
-                    "fragment_count": len(fragments),
-                    "maturity_score": score
-                })
+        # 1. Load only mature ideas (score > 50): filtered in SQL, scored in bulk
+        stats = await self.repo.list_idea_maturity_stats(space_id=product.space_id, min_score=51)
+        mature_ideas = [
+            {
+                "id": str(idea.id),
+                "title": idea.title_provisional,
+                "domain": idea.domain,
+                "fragment_count": idea.fragment_count,
+                "maturity_score": score
+            }
+            for idea, score in zip(stats, MaturityCalculator.calculate_bulk(stats))
+            if score > 50
+        ]
         
         if not mature_ideas:
+            # 2. Tell an empty space apart from one without mature ideas
+            if not await self.repo.list_graph_nodes(space_id=product.space_id, limit=1):
+                raise ModelError("No ideas available in this space to generate blueprint")
             raise ModelError("No mature ideas available (all scores < 50)")
         
         # 3. Build context for AI
@@ -333,50 +491,25 @@ Responde ÚNICAMENTE con el JSON, sin explicaciones adicionales."""
                 raise NetworkError("Failed to connect to AI Provider for blueprint", original_error=str(e))
             raise ModelError(f"Blueprint generation failed: {str(e)}")
 
-    async def generate_section_draft(self, section_title: str, source_idea_ids: List, product, language: str = "en"):
+    async def build_section_draft_prompt(self, section_title: str, source_idea_ids: List, product, language: str = "en") -> str:
         """
-        Generate a draft (written content) for a specific section using source ideas.
-        
-        Args:
-            section_title: Title of the section to write
-            source_idea_ids: List of UUIDs of ideas to use as source material
-            product: Product instance with archetype, audience, style
-            language: Target language
-            
-        Returns:
-            str: Generated draft content
+        Loads the source ideas and builds the drafting prompt for a section.
+        Raises ModelError if none of the source ideas could be loaded.
         """
-        # 1. Retrieve full content from source ideas
-        source_contents = []
+        # 1. Retrieve title and content of every source idea in one query
+        idea_uuids = []
         for idea_id in source_idea_ids:
             if not idea_id:
                 continue
-                
             try:
-                idea_id_uuid = UUID(idea_id) if isinstance(idea_id, str) else idea_id
-                
-                # Get idea and its fragments
-                idea = await self.repo.get_idea(idea_id_uuid)
-                if not idea:
-                    continue
-                    
-                fragments = await self.repo.list_fragments_by_idea(idea_id_uuid)
-                versions = await self.repo.list_idea_versions(idea_id_uuid)
-                
-                # Use latest version if available, otherwise fragments
-                if versions:
-                    latest_version = max(versions, key=lambda v: v.version_number)
-                    content = latest_version.synthesized_text
-                else:
-                    content = "\n".join([f.raw_text for f in fragments])
-                
-                source_contents.append({
-                    "title": idea.title_provisional,
-                    "content": content
-                })
-            except Exception as e:
-                print(f"Error loading idea {idea_id}: {e}")
-                continue
+                idea_uuids.append(UUID(idea_id) if isinstance(idea_id, str) else idea_id)
+            except ValueError:
+                print(f"Skipping invalid idea id {idea_id}")
+        
+        source_contents = [
+            {"title": source.title_provisional, "content": source.content or ""}
+            for source in await self.repo.list_idea_sources(idea_uuids)
+        ]
         
         if not source_contents:
             raise ModelError("No valid source ideas could be loaded for draft generation")
@@ -411,7 +544,26 @@ INSTRUCCIONES:
 - Escribe en {language}
 
 BORRADOR:"""
+        return prompt
+
+    async def generate_section_draft(self, section_title: str, source_idea_ids: List, product, language: str = "en"):
+        """
+        Generate a draft (written content) for a specific section using source ideas.
+        
+        Args:
+            section_title: Title of the section to write
+            source_idea_ids: List of UUIDs of ideas to use as source material
+            product: Product instance with archetype, audience, style
+            language: Target language
+            
+        Returns:
+            str: Generated draft content
+        """
+        prompt = await self.build_section_draft_prompt(section_title, source_idea_ids, product, language)
+        return await self.draft_from_prompt(prompt, language)
 
+    async def draft_from_prompt(self, prompt: str, language: str = "en") -> str:
+        """Generates a section draft from a prompt built by build_section_draft_prompt."""
         try:
             # 4. Generate draft
             draft_content = await self.ai.synthesize(
@@ -426,3 +578,20 @@ BORRADOR:"""
             if "connect" in str(e).lower():
                 raise NetworkError("Failed to connect to AI Provider for draft", original_error=str(e))
             raise ModelError(f"Draft generation failed: {str(e)}")
+
+    async def stream_section_draft(self, prompt: str, language: str = "en") -> AsyncIterator[str]:
+        """
+        Streams a section draft chunk by chunk from a prompt built by
+        build_section_draft_prompt. The caller joins the chunks for the final text.
+        """
+        try:
+            async for chunk in self.ai.synthesize_stream(
+                context=prompt,
+                prompt="generate_section_draft",
+                language=language
+            ):
+                yield chunk
+        except Exception as e:
+            if "connect" in str(e).lower():
+                raise NetworkError("Failed to connect to AI Provider for draft", original_error=str(e))
+            raise ModelError(f"Draft generation failed: {str(e)}")
@@ -0,0 +1,105 @@
+import os
+import asyncio
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from domain.models import DraftJob, Product, ProductSection, SectionDraftStatus
+from domain.services.pipeline import CognitivePipeline
+
+logger = logging.getLogger("draft.product")
+
+# Upper bound on concurrent LLM calls per product; requests may only lower it
+DRAFT_ALL_CONCURRENCY = int(os.getenv("DRAFT_ALL_CONCURRENCY", "4"))
+
+# Ideas retrieved for a section that was given no explicit sources
+SOURCES_PER_SECTION = 3
+
+def leaf_sections(sections: List[ProductSection]) -> List[ProductSection]:
+    """Sections that hold content (no subsections), depth-first in order_index order."""
+    leaves = []
+    for section in sorted(sections, key=lambda s: s.order_index):
+        if section.subsections:
+            leaves.extend(leaf_sections(section.subsections))
+        else:
+            leaves.append(section)
+    return leaves
+
+class ProductDrafter:
+    """
+    Drafts every leaf section of a product and saves each draft as soon as it arrives.
+
+    Source loading and prompt building run one section at a time on the pipeline's
+    session; only the LLM calls fan out, at most `concurrency` at once, which is the
+    knob for provider rate limits. A failed section is recorded on the job and does
+    not stop the others.
+    """
+
+    def __init__(self, pipeline: CognitivePipeline, concurrency: int = 4):
+        self.pipeline = pipeline
+        self.repo = pipeline.repo
+        self.concurrency = max(1, concurrency)
+
+    async def run(self, job: DraftJob, product: Product, sources: Optional[Dict[UUID, List[UUID]]] = None,
+                  overwrite: bool = False, language: str = "en") -> DraftJob:
+        sources = sources or {}
+        job.status = "running"
+        job.concurrency = self.concurrency
+
+        sections = [s for s in leaf_sections(product.sections) if overwrite or not (s.content or "").strip()]
+        job.sections = [SectionDraftStatus(section_id=s.id, title=s.title) for s in sections]
+        job.total = len(sections)
+
+        try:
+            prompts = []
+            for section, status in zip(sections, job.sections):
+                try:
+                    idea_ids = sources.get(section.id) or await self._nearest_ideas(section, product)
+                    prompts.append(await self.pipeline.build_section_draft_prompt(section.title or "", idea_ids, product, language))
+                except Exception as e:
+                    self._fail(job, status, e)
+                    prompts.append(None)
+
+            semaphore = asyncio.Semaphore(self.concurrency)
+
+            async def draft(section: ProductSection, status: SectionDraftStatus, prompt: str):
+                async with semaphore:
+                    status.status = "drafting"
+                    try:
+                        content = await self.pipeline.draft_from_prompt(prompt, language)
+                        self.repo.update_section_content(section.id, content, section.intervention_level)
+                    except Exception as e:
+                        self._fail(job, status, e)
+                        return
+                    status.status = "drafted"
+                    job.drafted += 1
+
+            await asyncio.gather(*[
+                draft(section, status, prompt)
+                for section, status, prompt in zip(sections, job.sections, prompts)
+                if prompt is not None
+            ])
+            job.status = "failed" if job.total and not job.drafted else "completed"
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+            raise
+        except Exception as e:
+            logger.exception(f"Draft job {job.id} failed")
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            job.finished_at = datetime.utcnow()
+        logger.info(f"Draft job {job.id}: {job.drafted}/{job.total} drafted, {job.failed} failed")
+        return job
+
+    async def _nearest_ideas(self, section: ProductSection, product: Product) -> List[UUID]:
+        vector = await self.pipeline.ai.generate_embedding(f"{section.title} {product.title}")
+        candidates = await self.repo.search_candidates(vector, limit=SOURCES_PER_SECTION, space_id=product.space_id)
+        return [idea.id for idea, _ in candidates]
+
+    @staticmethod
+    def _fail(job: DraftJob, status: SectionDraftStatus, error: Exception):
+        status.status = "failed"
+        status.error = str(error)
+        job.failed += 1
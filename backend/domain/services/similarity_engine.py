@@ -0,0 +1,87 @@
+from typing import Iterator, List, Optional, Sequence, Tuple, Any
+import numpy as np
+
+class SimilarityEngine:
+    """
+    Cosine similarity between many vectors (e.g. idea centroids) without building
+    the full N x N matrix. Vectors are normalized once into a float32 matrix and
+    compared block by block, so memory stays at block_size x N.
+    """
+
+    def __init__(self, ids: Sequence[Any], vectors: Sequence[Sequence[float]], block_size: int = 512):
+        """
+        Args:
+            ids: Identifier for each vector, returned in the edges
+            vectors: One vector per id. Empty/None/zero vectors never get edges.
+            block_size: Rows compared per matrix product
+        """
+        if len(ids) != len(vectors):
+            raise ValueError("ids and vectors must have the same length")
+
+        self.block_size = block_size
+        valid = [i for i, v in enumerate(vectors) if v is not None and len(v) > 0]
+        self.ids = [ids[i] for i in valid]
+
+        if not valid:
+            self._matrix = np.zeros((0, 0), dtype=np.float32)
+            return
+
+        matrix = np.asarray([vectors[i] for i in valid], dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1)
+        nonzero = norms > 0
+        matrix = matrix[nonzero] / norms[nonzero, None]
+        self.ids = [id_ for id_, keep in zip(self.ids, nonzero) if keep]
+        self._matrix = matrix
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def iter_threshold_edges(self, threshold: float) -> Iterator[Tuple[Any, Any, float]]:
+        """
+        Yields (source_id, target_id, similarity) for every unordered pair with
+        similarity >= threshold. Only the upper triangle is computed.
+        """
+        matrix = self._matrix
+        n = len(self.ids)
+        for start in range(0, n, self.block_size):
+            stop = min(start + self.block_size, n)
+            # Rows [start, stop) against columns [start, n): upper triangle only
+            sims = matrix[start:stop] @ matrix[start:].T
+            rows, cols = np.nonzero(sims >= threshold)
+            for r, c in zip(rows.tolist(), cols.tolist()):
+                i, j = start + r, start + c
+                if j <= i:
+                    continue
+                yield self.ids[i], self.ids[j], float(sims[r, c])
+
+    def iter_top_k_edges(self, k: int, min_similarity: Optional[float] = None) -> Iterator[Tuple[Any, Any, float]]:
+        """
+        Yields the k most similar neighbours of every vector as undirected edges
+        (each pair once, even when both ends pick each other).
+        Neighbours below min_similarity are dropped.
+        """
+        matrix = self._matrix
+        n = len(self.ids)
+        k = min(k, n - 1)
+        if k <= 0:
+            return
+
+        emitted = set()
+        for start in range(0, n, self.block_size):
+            stop = min(start + self.block_size, n)
+            sims = matrix[start:stop] @ matrix.T
+            # Exclude self-similarity
+            sims[np.arange(stop - start), np.arange(start, stop)] = -np.inf
+
+            top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+            for r, neighbours in enumerate(top.tolist()):
+                i = start + r
+                for j in neighbours:
+                    similarity = float(sims[r, j])
+                    if min_similarity is not None and similarity < min_similarity:
+                        continue
+                    pair = (i, j) if i < j else (j, i)
+                    if pair in emitted:
+                        continue
+                    emitted.add(pair)
+                    yield self.ids[pair[0]], self.ids[pair[1]], similarity
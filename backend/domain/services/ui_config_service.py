@@ -4,6 +4,7 @@ from typing import Optional
 from uuid import UUID
 from pydantic import BaseModel
 from domain.ui_models_sql import UISettings
+from infrastructure.config_cache import ui_config_cache, notify_config_change
 
 class UIConfig(BaseModel):
     theme: str = "light"
@@ -17,7 +18,16 @@ class UIConfigService:
         """
         Fetches the UI configuration (theme + language) for a specific user.
         If not found, returns the default config.
+        Cached per user (TTL + invalidation on save).
         """
+        cached = ui_config_cache.get(user_id)
+        if cached is not None:
+            return cached.model_copy()
+        config = self._load_config(user_id)
+        ui_config_cache.set(user_id, config.model_copy())
+        return config
+
+    def _load_config(self, user_id: Optional[UUID]) -> UIConfig:
         stmt = select(UISettings).where(UISettings.user_id == user_id)
         result = self.db.execute(stmt)
         settings = result.scalar_one_or_none()
@@ -43,7 +53,9 @@ class UIConfigService:
             self.db.add(settings)
             
         settings.theme = theme
+        notify_config_change(self.db, "ui", user_id)
         self.db.commit()
+        ui_config_cache.invalidate(user_id)
         self.db.refresh(settings)
     
     def save_language(self, language: str, user_id: Optional[UUID] = None):
@@ -69,5 +81,7 @@ class UIConfigService:
             # If DB doesn't have language column yet, just skip
             pass
         
+        notify_config_change(self.db, "ui", user_id)
         self.db.commit()
+        ui_config_cache.invalidate(user_id)
         self.db.refresh(settings)
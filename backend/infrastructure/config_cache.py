@@ -0,0 +1,138 @@
+import os
+import json
+import time
+import select
+import logging
+import threading
+from typing import Any, Dict, Hashable, Optional
+from uuid import UUID
+
+from sqlalchemy import text
+
+logger = logging.getLogger("config.cache")
+
+CONFIG_CHANNEL = "config_invalidated"
+CONFIG_CACHE_TTL = float(os.getenv("CONFIG_CACHE_TTL", "30"))
+
+_MISSING = object()
+
+class TTLCache:
+    """Small thread-safe in-process cache; entries expire ttl seconds after being set."""
+
+    def __init__(self, ttl: float = CONFIG_CACHE_TTL):
+        self.ttl = ttl
+        self._entries: Dict[Hashable, tuple] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is not _MISSING and entry[0] > now:
+                self.hits += 1
+                return entry[1]
+            if entry is not _MISSING:
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses, "ttl": self.ttl}
+
+# Resolved AIProfile / UIConfig per user_id (None = system-wide)
+ai_config_cache = TTLCache()
+ui_config_cache = TTLCache()
+CONFIG_CACHES = {"ai": ai_config_cache, "ui": ui_config_cache}
+
+def notify_config_change(db, cache_name: str, user_id: Optional[UUID]):
+    """
+    Invalidates the local entry and queues a NOTIFY for the other workers.
+    Call before commit: Postgres delivers the notification only if the save commits.
+    """
+    CONFIG_CACHES[cache_name].invalidate(user_id)
+    payload = json.dumps({"cache": cache_name, "user_id": str(user_id) if user_id else None})
+    db.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": CONFIG_CHANNEL, "payload": payload})
+
+class ConfigInvalidationListener:
+    """
+    Background thread holding a dedicated LISTEN connection (psycopg2) that drops
+    cached config entries when any worker saves them. After a reconnect every cache
+    is cleared, since notifications sent meanwhile are lost; the TTL bounds staleness
+    if the listener is down altogether.
+    """
+
+    def __init__(self, engine, caches: Dict[str, TTLCache] = CONFIG_CACHES, channel: str = CONFIG_CHANNEL, retry_delay: float = 5.0):
+        self.engine = engine
+        self.caches = caches
+        self.channel = channel
+        self.retry_delay = retry_delay
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="config-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            conn = None
+            try:
+                raw = self.engine.raw_connection()
+                raw.detach()  # Long-lived; keep it out of the request pool
+                conn = raw.dbapi_connection
+                conn.autocommit = True
+                conn.cursor().execute(f"LISTEN {self.channel}")
+                for cache in self.caches.values():
+                    cache.clear()
+
+                while not self._stop.is_set():
+                    if select.select([conn], [], [], 1.0) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        self._handle(conn.notifies.pop(0).payload)
+            except Exception as e:
+                logger.warning(f"Config listener error: {e}. Retrying in {self.retry_delay}s")
+                self._stop.wait(self.retry_delay)
+            finally:
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+
+    def _handle(self, payload: str):
+        try:
+            message = json.loads(payload)
+            cache = self.caches[message["cache"]]
+            user_id = UUID(message["user_id"]) if message.get("user_id") else None
+        except (ValueError, KeyError, TypeError):
+            logger.warning(f"Ignoring malformed config notification: {payload}")
+            return
+        cache.invalidate(user_id)
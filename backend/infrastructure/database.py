@@ -1,6 +1,7 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
-from typing import Generator
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker, declarative_base, Session
+from typing import Callable, Generator, Iterator, AsyncGenerator, AsyncIterator, Optional
+from contextlib import contextmanager, asynccontextmanager
 import os
 
 # Prioritize DATABASE_URL if set
@@ -43,3 +44,144 @@ def get_db() -> Generator:
         yield db
     finally:
         db.close()
+
+# --- ASYNC DRIVER (asyncpg) ---
+# DB_DRIVER=async serves repository and ledger queries through an AsyncEngine so
+# slow pgvector queries no longer block the event loop. DB_DRIVER=sync keeps the
+# psycopg2 Session for everything.
+DB_DRIVER = os.getenv("DB_DRIVER", "sync")
+
+async_engine = None
+AsyncSessionLocal = None
+
+if DB_DRIVER == "async":
+    from sqlalchemy.engine import make_url
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+    from pgvector.asyncpg import register_vector
+
+    ASYNC_DATABASE_URL = make_url(DATABASE_URL).set(drivername="postgresql+asyncpg")
+
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        pool_size=10,
+        max_overflow=20,
+        pool_pre_ping=True,
+        pool_recycle=3600,
+    )
+
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def _register_vector(dbapi_connection, connection_record):
+        dbapi_connection.run_async(register_vector)
+
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+async def get_async_db() -> AsyncGenerator:
+    """Yields an AsyncSession when DB_DRIVER=async, otherwise None."""
+    if AsyncSessionLocal is None:
+        yield None
+        return
+    async with AsyncSessionLocal() as session:
+        yield session
+
+# --- UNIT OF WORK ---
+# Repositories and ledgers share the request-scoped Session. While a unit of work
+# is open on it, their writes are only flushed and the outermost block commits once.
+UNIT_OF_WORK_KEY = "unit_of_work_depth"
+ON_COMMIT_KEY = "on_commit_callbacks"
+
+def in_unit_of_work(db) -> bool:
+    return bool(db.info.get(UNIT_OF_WORK_KEY))
+
+def commit_or_flush(db: Session) -> None:
+    if in_unit_of_work(db):
+        db.flush()
+    else:
+        db.commit()
+
+def on_commit(db, callback: Callable[[], None]) -> None:
+    """
+    Runs callback once the writes made so far on db are committed: when the open unit
+    of work commits, or right away outside one (commit_or_flush already committed).
+    Callbacks registered in a block that rolls back, savepoint included, are dropped.
+    """
+    if in_unit_of_work(db):
+        db.info.setdefault(ON_COMMIT_KEY, []).append(callback)
+    else:
+        callback()
+
+def _run_on_commit(db) -> None:
+    callbacks = db.info.pop(ON_COMMIT_KEY, [])
+    for callback in callbacks:
+        callback()
+
+def _drop_on_commit(db, mark: int) -> None:
+    del db.info.get(ON_COMMIT_KEY, [])[mark:]
+
+@contextmanager
+def unit_of_work(db: Session) -> Iterator[Session]:
+    """
+    Outermost call opens a transaction committed on exit (rolled back on error).
+    Nested calls open a SAVEPOINT, so a failing inner block only discards its own writes.
+    """
+    depth = db.info.get(UNIT_OF_WORK_KEY, 0)
+    mark = len(db.info.get(ON_COMMIT_KEY, []))
+    committed = False
+    db.info[UNIT_OF_WORK_KEY] = depth + 1
+    try:
+        if depth:
+            try:
+                with db.begin_nested():
+                    yield db
+            except BaseException:
+                _drop_on_commit(db, mark)
+                raise
+        else:
+            try:
+                yield db
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            committed = True
+    finally:
+        db.info[UNIT_OF_WORK_KEY] = depth
+        if not depth and not committed:
+            db.info.pop(ON_COMMIT_KEY, None)
+    if committed:
+        _run_on_commit(db)
+
+async def async_commit_or_flush(db) -> None:
+    if db.info.get(UNIT_OF_WORK_KEY):
+        await db.flush()
+    else:
+        await db.commit()
+
+@asynccontextmanager
+async def async_unit_of_work(db) -> AsyncIterator:
+    """AsyncSession counterpart of unit_of_work (on_commit works on both)."""
+    depth = db.info.get(UNIT_OF_WORK_KEY, 0)
+    mark = len(db.info.get(ON_COMMIT_KEY, []))
+    committed = False
+    db.info[UNIT_OF_WORK_KEY] = depth + 1
+    try:
+        if depth:
+            try:
+                async with db.begin_nested():
+                    yield db
+            except BaseException:
+                _drop_on_commit(db, mark)
+                raise
+        else:
+            try:
+                yield db
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+            committed = True
+    finally:
+        db.info[UNIT_OF_WORK_KEY] = depth
+        if not depth and not committed:
+            db.info.pop(ON_COMMIT_KEY, None)
+    if committed:
+        _run_on_commit(db)
@@ -1,18 +1,26 @@
 from fastapi import Depends
 from sqlalchemy.orm import Session
-from infrastructure.database import get_db
+from infrastructure.database import get_db, get_async_db
 from ports.repository import RepositoryPort
 from ports.ai_provider import AIProviderPort
 from ports.decision_ledger import DecisionLedgerPort
+from ports.job_queue import JobQueuePort
 from adapters.postgres_repository import PostgresRepository
 from adapters.postgres_ledger import PostgresDecisionLedger
+from adapters.async_postgres_repository import AsyncPostgresRepository
+from adapters.async_postgres_ledger import AsyncPostgresDecisionLedger
+from adapters.buffered_ledger import BufferedDecisionLedger, get_decision_log_buffer, DECISION_LEDGER_MODE
+from adapters.postgres_job_queue import PostgresJobQueue
 from domain.engine import CognitiveEngine
 from domain.services.pipeline import CognitivePipeline
 from domain.services.ai_config_service import AIConfigService
 from domain.services.ui_config_service import UIConfigService
 from adapters.llm.composite_provider import CompositeAIProvider
 
-def get_repository(db: Session = Depends(get_db)) -> RepositoryPort:
+def get_repository(db: Session = Depends(get_db), async_db = Depends(get_async_db)) -> RepositoryPort:
+    # async_db is only set when the app was started with DB_DRIVER=async
+    if async_db is not None:
+        return AsyncPostgresRepository(db, async_db)
     return PostgresRepository(db)
 
 def get_ai_config_service(db: Session = Depends(get_db)) -> AIConfigService:
@@ -25,8 +33,16 @@ def get_ai_provider(config_service: AIConfigService = Depends(get_ai_config_serv
     # Standard request-scoped dependency injection
     return CompositeAIProvider(config_service)
 
-def get_ledger(db: Session = Depends(get_db)) -> DecisionLedgerPort:
-    return PostgresDecisionLedger(db)
+def get_ledger(db: Session = Depends(get_db), async_db = Depends(get_async_db)) -> DecisionLedgerPort:
+    ledger = AsyncPostgresDecisionLedger(async_db) if async_db is not None else PostgresDecisionLedger(db)
+    if DECISION_LEDGER_MODE in ("buffered", "strict"):
+        # Hooks onto the session the repository writes through
+        return BufferedDecisionLedger(async_db if async_db is not None else db, ledger, get_decision_log_buffer(),
+                                      strict=DECISION_LEDGER_MODE == "strict")
+    return ledger
+
+def get_job_queue(db: Session = Depends(get_db)) -> JobQueuePort:
+    return PostgresJobQueue(db)
 
 def get_cognitive_engine(ai: AIProviderPort = Depends(get_ai_provider)) -> CognitiveEngine:
     return CognitiveEngine(ai_provider=ai)
@@ -38,3 +54,8 @@ def get_pipeline(
     engine: CognitiveEngine = Depends(get_cognitive_engine)
 ) -> CognitivePipeline:
     return CognitivePipeline(repo, engine, ai, ledger)
+
+def build_pipeline(db: Session, async_db=None) -> CognitivePipeline:
+    """Wires a pipeline on the given sessions, for work that outlives a request."""
+    ai = get_ai_provider(get_ai_config_service(db))
+    return get_pipeline(get_repository(db, async_db), ai, get_ledger(db, async_db), get_cognitive_engine(ai))
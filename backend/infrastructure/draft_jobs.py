@@ -0,0 +1,65 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from contextlib import AsyncExitStack
+from typing import Dict, List, Optional, Set
+from uuid import UUID
+
+from domain.models import DraftJob, Product
+from domain.services.product_drafter import ProductDrafter, DRAFT_ALL_CONCURRENCY
+from infrastructure import database
+from infrastructure.dependencies import build_pipeline
+
+logger = logging.getLogger("draft.jobs")
+
+class DraftJobRegistry:
+    """
+    In-process draft-all jobs. Each job runs as an asyncio task on its own sessions,
+    so it outlives the request that started it; the most recent max_jobs are kept
+    for progress polling.
+    """
+
+    def __init__(self, max_jobs: int = 200, max_concurrency: int = DRAFT_ALL_CONCURRENCY):
+        self.max_jobs = max_jobs
+        self.max_concurrency = max_concurrency
+        self._jobs: "OrderedDict[UUID, DraftJob]" = OrderedDict()
+        self._tasks: Set[asyncio.Task] = set()
+
+    def get(self, job_id: UUID) -> Optional[DraftJob]:
+        return self._jobs.get(job_id)
+
+    def start(self, product: Product, sources: Optional[Dict[UUID, List[UUID]]] = None, overwrite: bool = False,
+              language: str = "en", concurrency: Optional[int] = None) -> DraftJob:
+        # Callers may lower the concurrency, never raise it past the configured limit
+        concurrency = min(concurrency or self.max_concurrency, self.max_concurrency)
+        job = DraftJob(product_id=product.id, concurrency=max(1, concurrency))
+        self._jobs[job.id] = job
+        while len(self._jobs) > self.max_jobs:
+            self._jobs.popitem(last=False)
+
+        task = asyncio.get_running_loop().create_task(self._run(job, product, sources, overwrite, language))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    async def _run(self, job: DraftJob, product: Product, sources, overwrite: bool, language: str):
+        async with AsyncExitStack() as stack:
+            db = stack.enter_context(database.SessionLocal())
+            async_db = None
+            if database.AsyncSessionLocal is not None:
+                async_db = await stack.enter_async_context(database.AsyncSessionLocal())
+            drafter = ProductDrafter(build_pipeline(db, async_db), concurrency=job.concurrency)
+            await drafter.run(job, product, sources, overwrite=overwrite, language=language)
+
+    async def cancel_all(self):
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+_registry: Optional[DraftJobRegistry] = None
+
+def get_draft_jobs() -> DraftJobRegistry:
+    global _registry
+    if _registry is None:
+        _registry = DraftJobRegistry()
+    return _registry
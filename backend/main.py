@@ -2,8 +2,12 @@ from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
-from infrastructure.database import engine, Base
-from adapters.api.routers import ingestion, pipeline, query, audit, trash, spaces, products, ai_config, ui_config, stats
+from infrastructure.database import engine, async_engine, DB_DRIVER, Base
+from adapters.llm.client_registry import close_provider_registry
+from infrastructure.config_cache import ConfigInvalidationListener
+from infrastructure.draft_jobs import get_draft_jobs
+from adapters.buffered_ledger import close_decision_log_buffer
+from adapters.api.routers import ingestion, pipeline, query, audit, trash, spaces, products, ai_config, ui_config, stats, jobs
 from domain.exceptions import DomainError, EmbeddingError, ModelError, DatabaseError, NetworkError
 
 import time
@@ -11,7 +15,9 @@ from sqlalchemy.exc import OperationalError
 
 # Robust DB Initialization
 def init_db(retries=10, delay=2):
+    from uuid import uuid4
     from sqlalchemy import text
+    from adapters.postgres_repository import backfill_idea_fragments_stmt, recount_idea_counters_stmt
     for i in range(retries):
         try:
             print(f"Attempting DB connection ({i+1}/{retries})...")
@@ -32,6 +38,51 @@ def init_db(retries=10, delay=2):
                 # Fix for spaces table missing columns
                 conn.execute(text("ALTER TABLE spaces ADD COLUMN IF NOT EXISTS icon VARCHAR DEFAULT 'folder';"))
                 conn.execute(text("ALTER TABLE spaces ADD COLUMN IF NOT EXISTS color VARCHAR DEFAULT '#cbd5e1';"))
+                # Vector index for fragment search (create_all skips indexes of existing tables)
+                conn.execute(text("CREATE INDEX IF NOT EXISTS idx_fragments_embedding ON fragments USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64);"))
+                conn.execute(text("CREATE INDEX IF NOT EXISTS idx_fragments_raw_text_fts ON fragments USING gin (to_tsvector('simple', raw_text));"))
+                conn.execute(text("CREATE INDEX IF NOT EXISTS idx_decision_logs_target_idea ON decision_logs (target_idea_id);"))
+                # Per-idea counters: filled from the rows they count when first added, maintained on write after that
+                counters_missing = conn.execute(text("SELECT 1 FROM information_schema.columns WHERE table_name = 'ideas' AND column_name = 'version_count';")).first() is None
+                conn.execute(text("ALTER TABLE ideas ADD COLUMN IF NOT EXISTS fragment_count INTEGER NOT NULL DEFAULT 0;"))
+                conn.execute(text("ALTER TABLE ideas ADD COLUMN IF NOT EXISTS version_count INTEGER NOT NULL DEFAULT 0;"))
+                conn.execute(text("ALTER TABLE ideas ADD COLUMN IF NOT EXISTS latest_version_number INTEGER NOT NULL DEFAULT 0;"))
+                # Version numbers are unique per idea: renumber duplicates left by the old read-then-insert, once
+                unique_missing = conn.execute(text("SELECT 1 FROM pg_indexes WHERE indexname = 'uq_idea_versions_idea_number';")).first() is None
+                if unique_missing:
+                    conn.execute(text("""
+                        UPDATE idea_versions v SET version_number = r.n
+                        FROM (SELECT id, row_number() OVER (PARTITION BY idea_id ORDER BY version_number, created_at, id) AS n FROM idea_versions) r
+                        WHERE v.id = r.id AND v.version_number <> r.n;
+                    """))
+                    conn.execute(text("CREATE UNIQUE INDEX IF NOT EXISTS uq_idea_versions_idea_number ON idea_versions (idea_id, version_number);"))
+                conn.execute(text("DROP INDEX IF EXISTS idx_idea_versions_idea;"))
+                conn.execute(text("DROP INDEX IF EXISTS idx_idea_versions_idea_number;"))
+                # Fragment provenance moved from the ledger to idea_fragments: link what was ingested
+                # before, once, and ahead of the recount so fragment_count sees those links
+                links_missing = conn.execute(text("""
+                    SELECT NOT EXISTS (SELECT 1 FROM pg_indexes WHERE indexname = 'idx_idea_fragments_fragment')
+                        OR (NOT EXISTS (SELECT 1 FROM idea_fragments)
+                            AND EXISTS (SELECT 1 FROM decision_logs WHERE action IN ('CREATE_NEW', 'ATTACH')));
+                """)).scalar()
+                if links_missing:
+                    conn.execute(backfill_idea_fragments_stmt())
+                conn.execute(text("CREATE INDEX IF NOT EXISTS idx_idea_fragments_fragment ON idea_fragments (fragment_id, idea_id);"))
+                if counters_missing or unique_missing or links_missing:
+                    conn.execute(recount_idea_counters_stmt())
+                # Profile centroids now live only in ideas.embedding: backfill it, then drop the JSON copy
+                conn.execute(text("UPDATE ideas SET embedding = (semantic_profile->'centroid')::text::vector WHERE embedding IS NULL AND semantic_profile ? 'centroid';"))
+                conn.execute(text("UPDATE ideas SET semantic_profile = semantic_profile - 'centroid' WHERE semantic_profile ? 'centroid';"))
+                conn.execute(text("CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs (run_at) WHERE status IN ('queued', 'running');"))
+                # Knowledge-graph edges of ideas stored before idea_edges existed: rebuilt by a worker
+                # (reads use the live kNN until then), queued once
+                conn.execute(text("""
+                    INSERT INTO jobs (id, kind, payload, status, attempts, max_attempts, run_at, cancel_requested)
+                    SELECT :id, 'rebuild_idea_edges', '{}'::jsonb, 'queued', 0, 3, now(), false
+                    WHERE NOT EXISTS (SELECT 1 FROM idea_edges)
+                      AND EXISTS (SELECT 1 FROM ideas WHERE is_deleted IS NOT TRUE)
+                      AND NOT EXISTS (SELECT 1 FROM jobs WHERE kind = 'rebuild_idea_edges' AND status IN ('queued', 'running'));
+                """), {"id": uuid4()})
                 conn.commit()
             
             print("DB Schema initialized successfully.")
@@ -45,9 +96,18 @@ def init_db(retries=10, delay=2):
 async def lifespan(app: FastAPI):
     # Startup: Connect to DB
     init_db()
+    print(f"DB driver: {DB_DRIVER}")
+    # Keeps cached AI/UI config coherent across workers (LISTEN/NOTIFY)
+    config_listener = ConfigInvalidationListener(engine)
+    config_listener.start()
     yield
-    # Shutdown: (Optional cleanup)
-    pass
+    # Shutdown: release pooled connections
+    config_listener.stop()
+    await get_draft_jobs().cancel_all()
+    close_decision_log_buffer()
+    await close_provider_registry()
+    if async_engine is not None:
+        await async_engine.dispose()
 
 app = FastAPI(
     title="Kolozus API",
@@ -123,6 +183,7 @@ app.include_router(trash.router)
 app.include_router(spaces.router)
 app.include_router(products.router)
 app.include_router(stats.router)
+app.include_router(jobs.router)
 app.include_router(ai_config.router, prefix="/api/ai", tags=["AI Configuration"])
 app.include_router(ui_config.router, prefix="/ui", tags=["UI Configuration"])
 
@@ -1,5 +1,6 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator
 
 class AIProviderPort(ABC):
     
@@ -8,6 +9,10 @@ class AIProviderPort(ABC):
         """Generates a vector embedding for the given text."""
         pass
 
+    async def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Generates one embedding per text, in input order (default: one call per text)."""
+        return list(await asyncio.gather(*(self.generate_embedding(text) for text in texts)))
+
     @abstractmethod
     async def classify_text(self, text: str, categories: List[str]) -> str:
         """Classifies text into one of the provided categories."""
@@ -18,6 +23,10 @@ class AIProviderPort(ABC):
         """Generates a text synthesis based on context and prompt."""
         pass
 
+    async def synthesize_stream(self, context: str, prompt: str, language: str = "en") -> AsyncIterator[str]:
+        """Streams synthesize() as text chunks (default: the whole text as one chunk)."""
+        yield await self.synthesize(context=context, prompt=prompt, language=language)
+
     @abstractmethod
     async def generate_json(self, context: str, prompt: str, language: str = "en") -> Dict[str, Any]:
         """Generates a structured JSON response based on context and prompt."""
@@ -0,0 +1,49 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+from uuid import UUID
+from domain.models import Job
+
+class JobQueuePort(ABC):
+
+    @abstractmethod
+    def enqueue(self, kind: str, payload: Dict[str, Any], max_attempts: int = 3) -> Job:
+        pass
+
+    @abstractmethod
+    def get(self, job_id: UUID) -> Optional[Job]:
+        pass
+
+    @abstractmethod
+    def cancel(self, job_id: UUID) -> Optional[Job]:
+        """
+        Queued jobs are cancelled at once; running jobs are flagged and stopped
+        by their worker. Finished jobs are returned unchanged.
+        """
+        pass
+
+    @abstractmethod
+    def claim(self, worker_id: str, lease_seconds: float) -> Optional[Job]:
+        """
+        Locks the oldest runnable job for worker_id and counts the attempt. A running
+        job whose lease expired (its worker died) is runnable again, unless its cancel
+        was requested: such jobs are marked cancelled instead.
+        """
+        pass
+
+    @abstractmethod
+    def heartbeat(self, job_id: UUID, worker_id: str) -> bool:
+        """Renews the lease. Returns False once cancellation was requested or the job was lost."""
+        pass
+
+    @abstractmethod
+    def complete(self, job_id: UUID, worker_id: str, result: Dict[str, Any]) -> None:
+        pass
+
+    @abstractmethod
+    def fail(self, job_id: UUID, worker_id: str, error: str, retry_in: Optional[float]) -> None:
+        """Requeues the job retry_in seconds from now, or marks it failed when retry_in is None."""
+        pass
+
+    @abstractmethod
+    def mark_cancelled(self, job_id: UUID, worker_id: str) -> None:
+        pass
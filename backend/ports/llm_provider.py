@@ -1,5 +1,6 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, AsyncIterator
 
 class LLMProvider(ABC):
     """
@@ -19,6 +20,13 @@ class LLMProvider(ABC):
         """
         pass
 
+    async def generate_text_stream(self, prompt: str, system_prompt: Optional[str] = None, **kwargs) -> AsyncIterator[str]:
+        """
+        Streams the completion as text chunks, in order; joined they equal generate_text.
+        Providers without streaming inherit this single-chunk default.
+        """
+        yield await self.generate_text(prompt, system_prompt=system_prompt, **kwargs)
+
     @abstractmethod
     async def generate_embedding(self, text: str) -> List[float]:
         """
@@ -26,6 +34,13 @@ class LLMProvider(ABC):
         """
         pass
 
+    async def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generates one embedding per text, in input order.
+        Providers with a batch endpoint override this; the default embeds one by one.
+        """
+        return list(await asyncio.gather(*(self.generate_embedding(text) for text in texts)))
+
     @abstractmethod
     async def generate_json(self, prompt: str, schema: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
         """
@@ -1,9 +1,17 @@
-from typing import List, Optional, Tuple, Any
+from typing import List, Optional, Tuple, Any, AsyncContextManager
 from uuid import UUID
 from abc import ABC, abstractmethod
-from domain.models import Fragment, Idea, IdeaVersion, Product, ProductSection
+from domain.models import Fragment, Idea, IdeaVersion, IdeaGraphNode, IdeaMaturityStats, IdeaSourceContent, RetrievalHit, Product, ProductSection
 
 class RepositoryPort(ABC):
+
+    @abstractmethod
+    def transaction(self) -> AsyncContextManager:
+        """
+        Groups writes into a single commit. Nested calls open a savepoint,
+        so a failure inside only discards the writes made in that block.
+        """
+        pass
     
     @abstractmethod
     async def save_fragment(self, fragment: Fragment) -> Fragment:
@@ -81,8 +89,50 @@ class RepositoryPort(ABC):
         pass
 
     @abstractmethod
-    async def list_fragments_by_idea(self, idea_id: UUID) -> List[Fragment]:
-        """Returns fragments associated with an idea via decision ledger."""
+    async def count_fragments(self, space_id: Optional[UUID] = None) -> int:
+        pass
+
+    @abstractmethod
+    async def list_idea_maturity_stats(self, space_id: Optional[UUID] = None, min_score: Optional[int] = None) -> List[IdeaMaturityStats]:
+        """
+        Fragment/version counts, created_at and domain of every idea, in one query.
+        With min_score, only ideas whose MaturityCalculator score is >= min_score.
+        """
+        pass
+
+    @abstractmethod
+    async def list_idea_sources(self, idea_ids: List[UUID]) -> List[IdeaSourceContent]:
+        """
+        Title and content of each idea in one query: the latest version's synthesized
+        text, or its fragments joined by newlines when it has none. Follows the order
+        of idea_ids; deleted or unknown ideas are left out.
+        """
+        pass
+
+    @abstractmethod
+    async def list_fragments_by_idea(self, idea_id: UUID, limit: Optional[int] = None) -> List[Fragment]:
+        """Returns the non-deleted fragments linked to an idea (idea_fragments), oldest first."""
+        pass
+
+    @abstractmethod
+    async def link_fragment(self, idea_id: UUID, fragment_id: UUID) -> None:
+        """Records that a fragment fed an idea (CREATE_NEW or ATTACH). Idempotent."""
+        pass
+
+    @abstractmethod
+    async def backfill_idea_fragments(self) -> int:
+        """
+        Links fragments to ideas from the decision ledger for decisions made before
+        links were recorded. Idempotent; returns the number of links added.
+        """
+        pass
+
+    @abstractmethod
+    async def recount_idea_counters(self) -> int:
+        """
+        Recomputes every idea's fragment_count, version_count and latest_version_number
+        from the rows they count. Writes keep them current; this is for backfills.
+        """
         pass
 
     @abstractmethod
@@ -93,8 +143,36 @@ class RepositoryPort(ABC):
     async def get_idea(self, idea_id: UUID) -> Optional[Idea]:
         pass
     
+    @abstractmethod
+    async def update_idea_profile(self, idea_id: UUID, vector: List[float]) -> Optional[Idea]:
+        """
+        Folds one vector into the idea's SemanticProfile as a single read-modify-write
+        under the idea's row lock, so parallel ATTACHes never overwrite each other's
+        update. Returns the updated idea, or None if it does not exist.
+        """
+        pass
+
+    @abstractmethod
+    async def update_idea_status(self, idea_id: UUID, status: str) -> bool:
+        """Changes only the status (and updated_at), leaving the profile to update_idea_profile."""
+        pass
+
     @abstractmethod
     async def save_idea_version(self, version: IdeaVersion) -> IdeaVersion:
+        """
+        Stores a version under the number it carries (imports, fixtures); the unique
+        (idea_id, version_number) index rejects a number already taken. Also advances
+        the idea's version_count and latest_version_number, atomically.
+        """
+        pass
+
+    @abstractmethod
+    async def append_idea_version(self, version: IdeaVersion) -> Optional[IdeaVersion]:
+        """
+        Stores the version under the idea's next version number, allocated atomically
+        so concurrent appends never share one. Returns the version with its number,
+        or None if the idea does not exist.
+        """
         pass
 
     @abstractmethod
@@ -114,6 +192,55 @@ class RepositoryPort(ABC):
         """Returns ideas and their similarity score (0-1)."""
         pass
 
+    @abstractmethod
+    async def search_fragments(self, vector: List[float], limit: int = 5, space_id: Optional[UUID] = None) -> List[Tuple[Fragment, float]]:
+        """Returns fragments and their cosine similarity (0-1) to the vector."""
+        pass
+
+    @abstractmethod
+    async def hybrid_search(self, query: str, vector: List[float], limit: int = 10, space_id: Optional[UUID] = None,
+                            lexical_weight: float = 1.0, semantic_weight: float = 1.0) -> List[RetrievalHit]:
+        """
+        Full-text and vector retrieval fused by reciprocal rank.
+        The weights scale each list's contribution; 0 disables that side.
+        """
+        pass
+
+    @abstractmethod
+    async def list_graph_nodes(self, space_id: Optional[UUID] = None, limit: int = 500, offset: int = 0) -> List[IdeaGraphNode]:
+        """Page of ideas for the knowledge graph, ordered by creation."""
+        pass
+
+    @abstractmethod
+    async def list_graph_edges(self, idea_ids: List[UUID], k: int = 5, min_similarity: float = 0.3) -> List[Tuple[UUID, UUID, float]]:
+        """
+        Stored knowledge-graph edges (idea_edges) of the given ideas: up to k
+        (source_id, target_id, similarity) per source with similarity >= min_similarity.
+        While idea_edges is still empty, the live kNN (compute_graph_edges) instead.
+        """
+        pass
+
+    @abstractmethod
+    async def compute_graph_edges(self, idea_ids: List[UUID], k: int = 5, min_similarity: float = 0.3, space_id: Optional[UUID] = None) -> List[Tuple[UUID, UUID, float]]:
+        """
+        Live k nearest neighbours of each given idea within its space (vector index),
+        as (source_id, target_id, similarity) with similarity >= min_similarity.
+        """
+        pass
+
+    @abstractmethod
+    async def refresh_idea_edges(self, idea_ids: List[UUID]) -> int:
+        """Recomputes the stored edges of the given ideas. Returns edges written."""
+        pass
+
+    @abstractmethod
+    async def update_idea_edges(self, idea_id: UUID) -> int:
+        """
+        Incremental maintenance after an idea is created or its centroid moves:
+        refreshes the idea and every idea linked to it before or after the change.
+        """
+        pass
+
     @abstractmethod
     async def soft_delete_fragment(self, fragment_id: UUID) -> bool:
         pass
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Maintenance for the materialized knowledge-graph edges (idea_edges).
+
+    python rebuild_idea_edges.py                 # backfill / rebuild every idea
+    python rebuild_idea_edges.py --space <uuid>  # only one space
+    python rebuild_idea_edges.py --check         # compare stored edges with a live kNN query
+    python rebuild_idea_edges.py --check --fix   # ...and refresh the ideas that drifted
+"""
+import argparse
+import asyncio
+import sys
+from uuid import UUID
+
+from infrastructure.database import SessionLocal
+from adapters.postgres_repository import PostgresRepository, IDEA_EDGES_K, IDEA_EDGES_MIN_SIMILARITY
+from domain.services.idea_maintenance import iter_idea_pages, rebuild_idea_edges
+
+SIMILARITY_TOLERANCE = 1e-3
+
+def group_by_source(edges):
+    grouped = {}
+    for source, target, similarity in edges:
+        grouped.setdefault(source, {})[target] = similarity
+    return grouped
+
+async def rebuild(repo, space_id, batch_size):
+    totals = await rebuild_idea_edges(repo, space_id, batch_size,
+                                      progress=lambda ideas, edges: print(f"   rebuilt {ideas} ideas ({edges} edges)"))
+    print(f"--- Rebuild done: {totals['ideas']} ideas, {totals['edges']} edges ---")
+
+async def check(repo, space_id, batch_size, fix):
+    checked = 0
+    inconsistent = []
+    async for idea_ids in iter_idea_pages(repo, space_id, batch_size):
+        stored = group_by_source(await repo.list_graph_edges(idea_ids, k=IDEA_EDGES_K, min_similarity=IDEA_EDGES_MIN_SIMILARITY))
+        live = group_by_source(await repo.compute_graph_edges(idea_ids, k=IDEA_EDGES_K, min_similarity=IDEA_EDGES_MIN_SIMILARITY))
+
+        for idea_id in idea_ids:
+            expected = live.get(idea_id, {})
+            actual = stored.get(idea_id, {})
+            missing = expected.keys() - actual.keys()
+            stale = actual.keys() - expected.keys()
+            drift = max((abs(expected[t] - actual[t]) for t in expected.keys() & actual.keys()), default=0.0)
+            if missing or stale or drift > SIMILARITY_TOLERANCE:
+                inconsistent.append(idea_id)
+                print(f"   {idea_id}: missing={len(missing)} stale={len(stale)} drift={drift:.4f}")
+        checked += len(idea_ids)
+
+    print(f"--- Check done: {checked} ideas, {len(inconsistent)} inconsistent ---")
+
+    if inconsistent and fix:
+        for start in range(0, len(inconsistent), batch_size):
+            async with repo.transaction():
+                await repo.refresh_idea_edges(inconsistent[start:start + batch_size])
+        print(f"--- Refreshed {len(inconsistent)} ideas ---")
+        return True
+
+    return not inconsistent
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--space", type=UUID, default=None)
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--check", action="store_true", help="Consistency check instead of rebuild")
+    parser.add_argument("--fix", action="store_true", help="With --check, refresh inconsistent ideas")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        repo = PostgresRepository(db)
+        if args.check:
+            ok = asyncio.run(check(repo, args.space, args.batch_size, args.fix))
+            sys.exit(0 if ok else 1)
+        asyncio.run(rebuild(repo, args.space, args.batch_size))
+    finally:
+        db.close()
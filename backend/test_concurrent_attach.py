@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Concurrency test for ATTACH writes: fires N parallel attaches at one idea, each on
+its own connection, and checks that no two got the same version number, that the
+idea's counters saw every one of them, that the stored centroid (and spread
+statistics) match the ones computed offline from all the vectors, and that the
+overlapping knowledge-graph edge refreshes all went through.
+
+    python test_concurrent_attach.py                  # 100 attaches
+    python test_concurrent_attach.py --attaches 500 --keep
+
+Each attach stores a fragment, links it, folds its vector into the profile,
+refreshes the idea's graph edges and appends a version, in one transaction, like
+CognitivePipeline does (the AI calls are left out). A few neighbour ideas are
+seeded so every attach refreshes the same edges. Needs a migrated database (start the API once).
+"""
+import argparse
+import asyncio
+import sys
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from uuid import uuid4
+
+import numpy as np
+from sqlalchemy import select, delete
+
+from infrastructure.database import SessionLocal
+from adapters.postgres_repository import PostgresRepository
+from adapters.orm import SpaceModel, IdeaModel, IdeaVersionModel, FragmentModel, IdeaFragmentModel, IdeaEdgeModel
+from domain.models import Fragment, Idea, IdeaVersion
+from domain.semantic import SemanticProfile
+
+DIMENSIONS = 1536
+NEIGHBOURS = 5
+# float32 incremental mean vs float64 batch mean
+CENTROID_TOLERANCE = 1e-4
+
+def log(msg):
+    print(f"[{datetime.now().strftime('%H:%M:%S')}] {msg}")
+
+def random_vector(rng):
+    return rng.normal(size=DIMENSIONS).astype(np.float32)
+
+async def attach(repo, idea_id, space_id, vector, i):
+    fragment = Fragment(id=uuid4(), raw_text=f"Concurrent attach {i}", source="test", created_at=datetime.utcnow(),
+                        embedding=vector.tolist(), space_id=space_id)
+    async with repo.transaction():
+        await repo.save_fragment(fragment)
+        await repo.link_fragment(idea_id, fragment.id)
+        await repo.update_idea_profile(idea_id, fragment.embedding)
+        await repo.update_idea_edges(idea_id)
+        version = await repo.append_idea_version(IdeaVersion(
+            id=uuid4(), idea_id=idea_id, stage="germinal", synthesized_text=f"Attached {i}", created_at=datetime.utcnow()
+        ))
+    return version.version_number
+
+def attach_on_own_session(idea_id, space_id, vector, i):
+    with SessionLocal() as db:
+        return asyncio.run(attach(PostgresRepository(db), idea_id, space_id, vector, i))
+
+def attach_or_error(idea_id, space_id, vector, i):
+    try:
+        return attach_on_own_session(idea_id, space_id, vector, i)
+    except Exception as e:
+        return e
+
+async def seed(repo, space_id, vector, neighbour_vectors):
+    idea = Idea(id=uuid4(), title_provisional="Concurrent attach target", status="germinal", created_at=datetime.utcnow(),
+                semantic_profile=SemanticProfile.from_vector(vector), space_id=space_id)
+    neighbours = [
+        Idea(id=uuid4(), title_provisional=f"Neighbour {i}", status="germinal", created_at=datetime.utcnow(),
+             semantic_profile=SemanticProfile.from_vector(v), space_id=space_id)
+        for i, v in enumerate(neighbour_vectors)
+    ]
+    async with repo.transaction():
+        for seeded in [idea] + neighbours:
+            await repo.save_idea(seeded)
+        await repo.append_idea_version(IdeaVersion(id=uuid4(), idea_id=idea.id, stage="germinal", created_at=datetime.utcnow()))
+        await repo.refresh_idea_edges([seeded.id for seeded in [idea] + neighbours])
+    return idea.id, [n.id for n in neighbours]
+
+def cleanup(db, space_id, idea_id):
+    db.execute(delete(IdeaFragmentModel).where(IdeaFragmentModel.idea_id == idea_id))
+    db.execute(delete(IdeaVersionModel).where(IdeaVersionModel.idea_id == idea_id))
+    db.execute(delete(FragmentModel).where(FragmentModel.space_id == space_id))
+    db.execute(delete(IdeaModel).where(IdeaModel.space_id == space_id))  # idea_edges cascade
+    db.execute(delete(SpaceModel).where(SpaceModel.id == space_id))
+    db.commit()
+
+def main(args):
+    rng = np.random.default_rng(args.seed)
+    vectors = [random_vector(rng) for _ in range(args.attaches + 1)]
+    # Close to the target's final centroid, so they end up among its stored neighbours
+    final_centroid = np.mean(vectors, axis=0)
+    spread = 0.5 * np.linalg.norm(final_centroid) / np.sqrt(DIMENSIONS)
+    neighbour_vectors = [final_centroid + spread * random_vector(rng) for _ in range(NEIGHBOURS)]
+
+    with SessionLocal() as db:
+        repo = PostgresRepository(db)
+        space_id = repo.create_space(f"ConcurrentAttach_{uuid4().hex[:8]}").id
+        idea_id, neighbour_ids = asyncio.run(seed(repo, space_id, vectors[0], neighbour_vectors))
+
+    log(f"Firing {args.attaches} attaches at idea {idea_id} with {args.workers} workers")
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        outcomes = list(pool.map(
+            lambda i: attach_or_error(idea_id, space_id, vectors[i], i),
+            range(1, args.attaches + 1)
+        ))
+    errors = [o for o in outcomes if isinstance(o, Exception)]
+    numbers = [o for o in outcomes if not isinstance(o, Exception)]
+
+    failures = []
+    with SessionLocal() as db:
+        stored = db.execute(select(IdeaVersionModel.version_number).where(IdeaVersionModel.idea_id == idea_id)).scalars().all()
+        idea = db.execute(select(IdeaModel).where(IdeaModel.id == idea_id)).scalar_one()
+        expected = list(range(1, args.attaches + 2))
+
+        if errors:
+            failures.append(f"{len(errors)} attaches failed, first: {errors[0]}")
+        duplicates = [n for n, count in Counter(numbers).items() if count > 1]
+        if duplicates:
+            failures.append(f"version numbers handed out twice: {sorted(duplicates)[:10]}")
+        if sorted(stored) != expected:
+            failures.append(f"stored version numbers are not 1..{args.attaches + 1}")
+        if (idea.version_count, idea.latest_version_number) != (args.attaches + 1, args.attaches + 1):
+            failures.append(f"version counters {idea.version_count}/{idea.latest_version_number}, expected {args.attaches + 1}")
+        if idea.fragment_count != args.attaches:
+            failures.append(f"fragment_count {idea.fragment_count}, expected {args.attaches}")
+
+        profile = asyncio.run(PostgresRepository(db).get_idea(idea_id)).semantic_profile
+        offline = SemanticProfile.from_vectors(vectors)
+        centroid_error = float(np.abs(profile.centroid - offline.centroid).max())
+        if profile.fragment_count != args.attaches + 1:
+            failures.append(f"profile fragment_count {profile.fragment_count}, expected {args.attaches + 1} (lost updates)")
+        if centroid_error > CENTROID_TOLERANCE:
+            failures.append(f"centroid differs from the offline mean by {centroid_error:.2e}")
+        if not np.isclose(profile.m2, offline.m2, rtol=1e-4):
+            failures.append(f"m2 {profile.m2:.4f}, offline {offline.m2:.4f}")
+        log(f"Centroid max abs error vs offline mean: {centroid_error:.2e}")
+
+        stored_edges = db.execute(select(IdeaEdgeModel.target_id).where(IdeaEdgeModel.source_id == idea_id)).scalars().all()
+        if set(stored_edges) != set(neighbour_ids):
+            failures.append(f"idea_edges of the target: {len(stored_edges)} neighbours, expected its {NEIGHBOURS} seeded ones")
+
+        if not args.keep:
+            cleanup(db, space_id, idea_id)
+
+    for failure in failures:
+        log(f"❌ {failure}")
+    if failures:
+        return 1
+    log(f"✅ {args.attaches} concurrent attaches: versions 1..{args.attaches + 1}, counters, centroid and edges consistent")
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--attaches", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=25, help="Parallel connections (stay under the pool size plus overflow)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--keep", action="store_true", help="Leave the test space and idea in the database")
+    sys.exit(main(parser.parse_args()))
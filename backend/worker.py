@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Job worker: runs queued LLM work (blueprints, section drafts, product drafts,
+batch ingestion) outside the API process, so API latency no longer depends on
+model latency. Start one or more next to the API:
+
+    python -m worker
+    WORKER_CONCURRENCY=4 python -m worker
+
+Jobs are claimed from the jobs table with FOR UPDATE SKIP LOCKED, so any number
+of workers can share the queue. A running job renews its lease every
+JOB_HEARTBEAT_SECONDS; if its worker dies, another one picks it up once the lease
+expires. Failures are retried with exponential backoff up to the job's
+max_attempts, and cancellation is picked up on the next lease renewal.
+With the sync DB driver each slot runs its handlers on an event loop of its own
+thread, so their blocking Session calls cannot hold up the lease renewals of the
+other slots, which run on the main loop.
+SIGINT/SIGTERM stop claiming and let running jobs finish; a second signal cancels them.
+"""
+import os
+import json
+import signal
+import socket
+import asyncio
+import logging
+import threading
+from contextlib import AsyncExitStack
+from typing import Any, Dict, Optional
+from uuid import uuid4
+
+from domain.exceptions import JobPayloadError
+from domain.models import Job
+from domain.services.job_handlers import JOB_HANDLERS
+from adapters.postgres_job_queue import PostgresJobQueue
+from adapters.llm.client_registry import close_provider_registry
+from adapters.buffered_ledger import close_decision_log_buffer
+from infrastructure import database
+from infrastructure.dependencies import build_pipeline
+
+logger = logging.getLogger("jobs.worker")
+
+WORKER_CONCURRENCY = int(os.getenv("WORKER_CONCURRENCY", "2"))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1"))
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "300"))
+JOB_HEARTBEAT_SECONDS = float(os.getenv("JOB_HEARTBEAT_SECONDS", "5"))
+JOB_RETRY_BASE_SECONDS = float(os.getenv("JOB_RETRY_BASE_SECONDS", "5"))
+JOB_RETRY_MAX_SECONDS = float(os.getenv("JOB_RETRY_MAX_SECONDS", "600"))
+
+def retry_delay(attempt: int) -> float:
+    """Exponential backoff: base, 2*base, 4*base... capped at JOB_RETRY_MAX_SECONDS."""
+    return min(JOB_RETRY_BASE_SECONDS * 2 ** max(attempt - 1, 0), JOB_RETRY_MAX_SECONDS)
+
+def queue_call(method: str, *args):
+    """One queue operation on its own short-lived session."""
+    with database.SessionLocal() as db:
+        return getattr(PostgresJobQueue(db), method)(*args)
+
+class HandlerLoop:
+    """An event loop on its own thread that job handlers are run on."""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._serve, name="job-handlers", daemon=True)
+        self._thread.start()
+
+    def _serve(self):
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_forever()
+        finally:
+            self.loop.close()
+
+    async def run(self, coro):
+        # Cancelling the caller cancels the handler task on the other loop
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, self.loop))
+
+    async def aclose(self):
+        try:
+            await self.run(self._shutdown())
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            await asyncio.to_thread(self._thread.join)
+
+    @staticmethod
+    async def _shutdown():
+        # Pooled LLM clients belong to this loop
+        await close_provider_registry()
+        await asyncio.get_running_loop().shutdown_default_executor()
+
+class Worker:
+    def __init__(self, concurrency: int = WORKER_CONCURRENCY, poll_interval: float = JOB_POLL_INTERVAL,
+                 lease_seconds: float = JOB_LEASE_SECONDS, heartbeat_seconds: float = JOB_HEARTBEAT_SECONDS):
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        self.concurrency = max(1, concurrency)
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.heartbeat_seconds = min(heartbeat_seconds, lease_seconds / 3)
+        self._stopping = asyncio.Event()
+        self._jobs: Dict[Any, asyncio.Task] = {}
+
+    def stop(self):
+        if self._stopping.is_set():
+            logger.warning("Second stop signal: cancelling running jobs")
+            for task in self._jobs.values():
+                task.cancel()
+            return
+        logger.info("Stopping: no new jobs will be claimed")
+        self._stopping.set()
+
+    async def run(self):
+        logger.info(f"Worker {self.worker_id} started ({self.concurrency} slots, handlers: {', '.join(JOB_HANDLERS)})")
+        await asyncio.gather(*[self._slot() for _ in range(self.concurrency)])
+        logger.info(f"Worker {self.worker_id} stopped")
+
+    async def _slot(self):
+        # The async engine's connections belong to the main loop, so only sync-driver handlers move off it
+        handler_loop = HandlerLoop() if database.AsyncSessionLocal is None else None
+        try:
+            await self._claim_loop(handler_loop)
+        finally:
+            if handler_loop is not None:
+                await handler_loop.aclose()
+
+    async def _claim_loop(self, handler_loop: Optional[HandlerLoop]):
+        while not self._stopping.is_set():
+            try:
+                job = await asyncio.to_thread(queue_call, "claim", self.worker_id, self.lease_seconds)
+            except Exception as e:
+                logger.warning(f"Claim failed: {e}")
+                job = None
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._execute(job, handler_loop)
+
+    async def _execute(self, job: Job, handler_loop: Optional[HandlerLoop] = None):
+        logger.info(f"Job {job.id} ({job.kind}) attempt {job.attempts}/{job.max_attempts}")
+        if job.attempts > job.max_attempts:
+            # Reclaimed after its worker died on the final attempt
+            await asyncio.to_thread(queue_call, "fail", job.id, self.worker_id, job.error or "Lease expired", None)
+            return
+        if job.cancel_requested:
+            logger.info(f"Job {job.id} cancelled before it started")
+            await asyncio.to_thread(queue_call, "mark_cancelled", job.id, self.worker_id)
+            return
+        handler = JOB_HANDLERS.get(job.kind)
+        if handler is None:
+            await asyncio.to_thread(queue_call, "fail", job.id, self.worker_id, f"Unknown job kind: {job.kind}", None)
+            return
+
+        run = self._run_handler(handler, job)
+        task = asyncio.create_task(handler_loop.run(run) if handler_loop is not None else run)
+        self._jobs[job.id] = task
+        cancel_requested = False
+        try:
+            while True:
+                done, _ = await asyncio.wait({task}, timeout=self.heartbeat_seconds)
+                if done:
+                    break
+                if not await asyncio.to_thread(queue_call, "heartbeat", job.id, self.worker_id):
+                    cancel_requested = True
+                    task.cancel()
+            result = task.result()
+        except asyncio.CancelledError:
+            if cancel_requested:
+                logger.info(f"Job {job.id} cancelled")
+                await asyncio.to_thread(queue_call, "mark_cancelled", job.id, self.worker_id)
+                return
+            # Interrupted by shutdown: hand the job back to the queue right away
+            logger.info(f"Job {job.id} interrupted; requeued")
+            task.cancel()
+            await asyncio.to_thread(queue_call, "fail", job.id, self.worker_id, "Interrupted by worker shutdown", 0)
+            if asyncio.current_task().cancelling():
+                raise
+            return
+        except JobPayloadError as e:
+            logger.warning(f"Job {job.id} rejected: {e}")
+            await asyncio.to_thread(queue_call, "fail", job.id, self.worker_id, str(e), None)
+            return
+        except Exception as e:
+            retry_in = retry_delay(job.attempts) if job.attempts < job.max_attempts else None
+            logger.warning(f"Job {job.id} failed: {e}" + (f"; retrying in {retry_in:.0f}s" if retry_in is not None else ""))
+            await asyncio.to_thread(queue_call, "fail", job.id, self.worker_id, f"{e.__class__.__name__}: {e}", retry_in)
+            return
+        finally:
+            self._jobs.pop(job.id, None)
+
+        await asyncio.to_thread(queue_call, "complete", job.id, self.worker_id, result)
+        logger.info(f"Job {job.id} succeeded")
+
+    async def _run_handler(self, handler, job: Job) -> Dict[str, Any]:
+        async with AsyncExitStack() as stack:
+            db = stack.enter_context(database.SessionLocal())
+            async_db = None
+            if database.AsyncSessionLocal is not None:
+                async_db = await stack.enter_async_context(database.AsyncSessionLocal())
+            result = await handler(build_pipeline(db, async_db), job.payload)
+        # Results are stored as JSONB
+        return json.loads(json.dumps(result, default=str))
+
+async def main(worker: Optional[Worker] = None):
+    worker = worker or Worker()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+    try:
+        await worker.run()
+    finally:
+        close_decision_log_buffer()
+        await close_provider_registry()
+        if database.async_engine is not None:
+            await database.async_engine.dispose()
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="[%(asctime)s] %(name)s %(levelname)s %(message)s")
+    asyncio.run(main())
@@ -55,6 +55,7 @@ interface KnowledgeGraphResponse {
         total_nodes: number
         total_edges: number
         space_id: string | null
+        next_offset?: number | null
     }
 }
 
@@ -76,15 +77,23 @@ export function KnowledgeGraph() {
     useEffect(() => {
         const fetchGraph = async () => {
             try {
-                // Fetch knowledge graph for all spaces
+                // Fetch knowledge graph for all spaces, page by page
                 const url = "/query/knowledge-graph"
-
-                // Fetch graph data with new format
-                const res = await api.get<KnowledgeGraphResponse>(url)
-                const graphData = res.data
+                const rawNodes: GraphNode[] = []
+                const rawEdges: GraphEdge[] = []
+                let graphMetadata: KnowledgeGraphResponse["metadata"] | null = null
+                let offset: number | null = 0
+
+                while (offset !== null) {
+                    const res: { data: KnowledgeGraphResponse } = await api.get<KnowledgeGraphResponse>(url, { params: { offset } })
+                    rawNodes.push(...res.data.nodes)
+                    rawEdges.push(...res.data.edges)
+                    graphMetadata = res.data.metadata
+                    offset = res.data.metadata.next_offset ?? null
+                }
 
                 // Transform nodes
-                const nodes = graphData.nodes.map(n => ({
+                const nodes = rawNodes.map(n => ({
                     id: n.id,
                     label: n.label || "Sin Título",
                     status: n.status,
@@ -93,14 +102,23 @@ export function KnowledgeGraph() {
                 }))
 
                 // Transform edges from backend (real similarity-based edges)
-                const links: GraphLink[] = graphData.edges.map(e => ({
-                    source: e.source,
-                    target: e.target,
-                    value: e.similarity // Use similarity as link strength
-                }))
+                // Pages are linked independently: drop repeated pairs and links to unknown nodes
+                const nodeIds = new Set(nodes.map(n => n.id))
+                const seenPairs = new Set<string>()
+                const links: GraphLink[] = []
+                for (const e of rawEdges) {
+                    const pair = [e.source, e.target].sort().join("|")
+                    if (seenPairs.has(pair) || !nodeIds.has(e.source) || !nodeIds.has(e.target)) continue
+                    seenPairs.add(pair)
+                    links.push({
+                        source: e.source,
+                        target: e.target,
+                        value: e.similarity // Use similarity as link strength
+                    })
+                }
 
                 setData({ nodes, links })
-                setMetadata(graphData.metadata)
+                setMetadata({ ...graphMetadata, total_nodes: nodes.length, total_edges: links.length })
             } catch (error) {
                 console.error("Error fetching graph", error)
             }